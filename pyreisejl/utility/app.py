@@ -5,6 +5,7 @@ from subprocess import PIPE, Popen
 
 from flask import Flask, jsonify, request
 
+from pyreisejl.utility import const
 from pyreisejl.utility.state import ApplicationState, SimulationState
 
 app = Flask(__name__)
@@ -16,6 +17,9 @@ Example requests:
 Launch using gurobi, 4 threads, auto extract
 curl -XPOST http://localhost:5000/launch/123?threads=4
 
+Launch on the warm workers started with worker.py, see const.WORKER_QUEUE_DIR
+curl -XPOST http://localhost:5000/launch/123?warm=1
+
 Launch using GLPK, extract manually
 curl -XPOST http://localhost:5000/launch/123?solver=glpk&extract-data=0
 curl -XPOST http://localhost:5000/extract/123
@@ -34,7 +38,7 @@ def get_script_path(filename):
     return str(path_to_script)
 
 
-def call_cmd(scenario_id, threads=None, solver=None, extract=True):
+def call_cmd(scenario_id, threads=None, solver=None, extract=True, warm=False):
     cmd = [
         sys.executable,
         "-u",
@@ -47,6 +51,8 @@ def call_cmd(scenario_id, threads=None, solver=None, extract=True):
         cmd.extend(["--threads", str(threads)])
     if solver is not None:
         cmd.extend(["--solver", solver])
+    if warm:
+        cmd.extend(["--worker-queue", const.WORKER_QUEUE_DIR])
     return cmd
 
 
@@ -66,11 +72,11 @@ def run_script(cmd, scenario_id):
     proc = Popen(cmd, stdout=PIPE, stderr=PIPE, start_new_session=True, env=new_env)
     entry = SimulationState(scenario_id, proc)
     state.add(entry)
-    return entry.as_dict()
+    return state.get(int(scenario_id))
 
 
-def launch_simulation(scenario_id, threads=None, solver=None, extract=True):
-    cmd = call_cmd(scenario_id, threads, solver, extract)
+def launch_simulation(scenario_id, threads=None, solver=None, extract=True, warm=False):
+    cmd = call_cmd(scenario_id, threads, solver, extract, warm)
     return run_script(cmd, scenario_id)
 
 
@@ -89,7 +95,9 @@ def handle_launch(scenario_id):
     solver = request.args.get("solver", None)
     extract_arg = request.args.get("extract-data", None)
     extract = extract_arg is not None and extract_arg not in ("0", "False")
-    entry = launch_simulation(scenario_id, threads, solver, extract)
+    warm_arg = request.args.get("warm", None)
+    warm = warm_arg is not None and warm_arg not in ("0", "False")
+    entry = launch_simulation(scenario_id, threads, solver, extract, warm)
     return jsonify(entry)
 
 
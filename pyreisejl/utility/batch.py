@@ -0,0 +1,190 @@
+import glob
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+import h5py
+
+from pyreisejl.utility import const, parser
+from pyreisejl.utility.extract_data import (
+    _read_result,
+    extract_scenario,
+    extraction_paths,
+    optional_extraction_paths,
+    result_num,
+    sparse_extraction_vars,
+)
+from pyreisejl.utility.helpers import get_scenario, insert_in_file
+from pyreisejl.utility.reducers import get_summaries
+
+
+def estimate_peak_memory(input_dir, workers=1, precision=None, keep_outputs=True):
+    """Estimates the peak memory used by the extraction of a scenario, from the
+    number of result files and the variables read from the first one.
+
+    The extracted variables take the size of the variables of the first file times
+    the number of files, dense variables at their precision and sparse variables as
+    the triplets of their non-zero values, copied once more when their data frames
+    are built. Each worker process holds in addition the float64 datasets of the
+    file it reads.
+
+    :param str input_dir: directory of the scenario, containing the result files in
+        its output folder.
+    :param int workers: number of worker processes reading the result files.
+    :param dict precision: precision of the variables, see
+        :func:`pyreisejl.utility.extract_data.get_precision`.
+    :param bool keep_outputs: whether the time series are built, see
+        :func:`pyreisejl.utility.extract_data.extract_data`.
+    :return: (*int*) -- estimated peak memory in bytes.
+    :raises FileNotFoundError: if there are no result files.
+    """
+    results = glob.glob(os.path.join(input_dir, "output", "result_*.mat"))
+    if not results:
+        raise FileNotFoundError(f"No result files in {input_dir}")
+    first = min(results, key=result_num)
+
+    paths = [*extraction_paths.values(), *optional_extraction_paths.values()]
+    with h5py.File(first, "r") as f:
+        file_bytes = sum(f[p].size * 8 for p in paths if p in f)
+    if not keep_outputs:
+        return max(1, workers) * file_bytes
+
+    _, _, _, temps, _ = _read_result(first, precision)
+    dense = sum(d.nbytes for v, d in temps.items() if v not in sparse_extraction_vars)
+    sparse = sum(
+        d.data.nbytes + d.row.nbytes + d.col.nbytes
+        for v, d in temps.items()
+        if v in sparse_extraction_vars
+    )
+    return len(results) * (dense + 2 * sparse) + max(1, workers) * file_bytes
+
+
+def _extract(scenario_id, kwargs):
+    """Extracts a scenario of the scenario list, in a child process.
+
+    :param str scenario_id: scenario id.
+    :param dict kwargs: optional arguments passed to
+        :func:`pyreisejl.utility.extract_data.extract_scenario`.
+    """
+    start_date, end_date, _, input_dir = get_scenario(scenario_id)
+    extract_scenario(
+        input_dir,
+        start_date,
+        end_date,
+        scenario_id=scenario_id,
+        output_dir=const.OUTPUT_DIR,
+        **kwargs,
+    )
+
+
+def extract_batch(scenario_ids, memory_budget=None, cpus=None, workers=1, **kwargs):
+    """Extracts several scenarios of the scenario list, each one in its own process,
+    running as many of them at the same time as the memory and CPU budgets allow.
+
+    The peak memory of each extraction is estimated with
+    :func:`estimate_peak_memory` before it starts, and scenarios are started in
+    order as soon as their estimate fits in the memory left by the running ones. A
+    scenario whose estimate exceeds the whole budget waits for the running ones to
+    finish, then runs alone with half of the budget as its own memory budget, so
+    that its largest variables are memory-mapped. The scenario and execute lists
+    are updated by each extraction as it finishes, or marked as failed.
+
+    :param list scenario_ids: scenario ids.
+    :param int memory_budget: maximum memory in bytes used by all the extractions.
+        None only limits the number of CPUs.
+    :param int cpus: number of CPUs used by all the extractions, each one using as
+        many CPUs as worker processes. None uses all the CPUs.
+    :param int workers: number of worker processes reading the result files of each
+        scenario.
+    :param \\*\\*kwargs: optional arguments passed to
+        :func:`pyreisejl.utility.extract_data.extract_scenario`.
+    :return: (*list*) -- for each scenario, a dictionary with its id, estimated
+        memory, start and end times and process exit code, or error if it could not
+        be started.
+    """
+    cpus = cpus or os.cpu_count()
+    workers = max(1, min(workers, cpus))
+    keep_outputs = not kwargs.get("summary_only", False)
+
+    records, pending = [], []
+    for scenario_id in scenario_ids:
+        record = {"scenario_id": scenario_id}
+        records.append(record)
+        try:
+            input_dir = get_scenario(scenario_id)[3]
+            record["memory"] = estimate_peak_memory(
+                input_dir, workers, kwargs.get("precision"), keep_outputs
+            )
+        except Exception as ex:
+            print(f"Cannot extract scenario {scenario_id}: {ex}")
+            record["error"] = str(ex)
+            insert_in_file(const.EXECUTE_LIST, scenario_id, "status", "failed")
+            continue
+        pending.append(record)
+
+    running = {}
+    used_memory = used_cpus = 0
+    while pending or running:
+        for record in list(pending):
+            if used_cpus + workers > cpus:
+                break
+            scenario_kwargs = {**kwargs, "workers": workers}
+            if memory_budget is not None and record["memory"] > memory_budget:
+                if running:
+                    break
+                scenario_kwargs["memory_budget"] = memory_budget // 2
+            elif memory_budget is not None:
+                if used_memory + record["memory"] > memory_budget:
+                    continue
+            process = multiprocessing.Process(
+                target=_extract, args=(record["scenario_id"], scenario_kwargs)
+            )
+            process.start()
+            record["start"] = time.time()
+            running[process.sentinel] = (process, record)
+            pending.remove(record)
+            used_memory += record["memory"]
+            used_cpus += workers
+
+        for sentinel in wait(list(running)):
+            process, record = running.pop(sentinel)
+            process.join()
+            record["end"] = time.time()
+            record["exitcode"] = process.exitcode
+            used_memory -= record["memory"]
+            used_cpus -= workers
+            if process.exitcode != 0:
+                print(f"Extraction of scenario {record['scenario_id']} failed")
+                insert_in_file(
+                    const.EXECUTE_LIST, record["scenario_id"], "status", "failed"
+                )
+
+    return records
+
+
+if __name__ == "__main__":
+    args = parser.parse_batch_args()
+
+    records = extract_batch(
+        args.scenario_ids,
+        args.memory_budget,
+        args.cpus,
+        args.workers,
+        keep_mat=args.keep_matlab,
+        output_format=args.output_format,
+        compression=args.compression,
+        partition=args.partition,
+        summaries=get_summaries(args.summaries),
+        summary_only=args.summary_only,
+        precision=args.precision,
+    )
+    for record in records:
+        if "error" in record:
+            print(f"{record['scenario_id']}: not extracted, {record['error']}")
+        else:
+            print(
+                f"{record['scenario_id']}: exit code {record['exitcode']}, "
+                f"{record['end'] - record['start']:.1f}s, "
+                f"estimated peak memory {record['memory'] / 2**30:.2f} GB"
+            )
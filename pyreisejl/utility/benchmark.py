@@ -0,0 +1,307 @@
+import json
+import os
+import pickle
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from pyreisejl.utility import parser
+from pyreisejl.utility.extract_data import (
+    cost_path,
+    extract_data,
+    extract_scenario,
+    extraction_paths,
+)
+from pyreisejl.utility.helpers import load_mat73, save_mat73
+from pyreisejl.utility.profiling import max_rss
+
+# Number of buses, branches and plants of the benchmarked grids
+grid_sizes = {
+    "small": {"n_bus": 100, "n_branch": 150, "n_plant": 50},
+    "medium": {"n_bus": 2000, "n_branch": 3000, "n_plant": 1000},
+    "large": {"n_bus": 20000, "n_branch": 30000, "n_plant": 6000},
+    "usa": {"n_bus": 82000, "n_branch": 104000, "n_plant": 13000},
+}
+
+
+def _sparse_values(rng, shape, density):
+    """Draws an array in which most values are zero.
+
+    :param numpy.random.Generator rng: random number generator.
+    :param tuple shape: shape of the array.
+    :param float density: fraction of non-zero values.
+    :return: (*numpy.ndarray*) -- the array.
+    """
+    values = rng.random(shape)
+    values[rng.random(shape) >= density] = 0
+    return values
+
+
+def write_result_file(
+    filename,
+    n_bus,
+    n_branch,
+    n_plant,
+    interval=24,
+    n_storage=0,
+    n_dcline=0,
+    load_shed=False,
+    flexible_demand=False,
+    trans_viol=False,
+    density=0.05,
+    compress=True,
+    seed=0,
+):
+    """Writes a synthetic result file with the layout of the files written by
+    save_results in REISE.jl, i.e. a MAT v7.3 (HDF5) file with a *mdo_save* struct.
+
+    :param str filename: path to the file.
+    :param int n_bus: number of buses.
+    :param int n_branch: number of AC branches.
+    :param int n_plant: number of plants.
+    :param int interval: number of hours in the file.
+    :param int n_storage: number of storage units, storage variables are written
+        if positive.
+    :param int n_dcline: number of DC lines, DC line variables are written if
+        positive.
+    :param bool load_shed: whether to write the load shed variable.
+    :param bool flexible_demand: whether to write the flexible demand variables.
+    :param bool trans_viol: whether to write the transmission violation variable.
+    :param float density: fraction of non-zero values of the congestion, load shed,
+        flexible demand and transmission violation variables.
+    :param bool compress: whether to compress the arrays, as MAT.jl does in
+        REISE.jl.
+    :param int seed: seed of the random number generator.
+    """
+    rng = np.random.default_rng(seed)
+    mpc = {
+        "bus": {"LAM_P": rng.random((n_bus, interval))},
+        "gen": {"PG": rng.random((n_plant, interval))},
+        "branch": {
+            "PF": rng.random((n_branch, interval)),
+            "MU_SF": _sparse_values(rng, (n_branch, interval), density),
+            "MU_ST": _sparse_values(rng, (n_branch, interval), density),
+        },
+    }
+    if n_dcline > 0:
+        mpc["dcline"] = {"PF_dcline": rng.random((n_dcline, interval))}
+    if n_storage > 0:
+        mpc["storage"] = {
+            "PG": rng.random((n_storage, interval)),
+            "Energy": rng.random((n_storage, interval)),
+        }
+    if load_shed:
+        mpc["load_shed"] = {
+            "load_shed": _sparse_values(rng, (n_bus, interval), density)
+        }
+    if flexible_demand:
+        mpc["flexible_demand"] = {
+            "load_shift_up": _sparse_values(rng, (n_bus, interval), density),
+            "load_shift_dn": _sparse_values(rng, (n_bus, interval), density),
+        }
+    if trans_viol:
+        mpc["trans_viol"] = {
+            "trans_viol": _sparse_values(rng, (n_branch + n_dcline, interval), density)
+        }
+    mdo_save = {
+        "results": {"f": rng.random() * 1e6},
+        "demand_scaling": 1.0,
+        "flow": {"mpc": mpc},
+    }
+
+    save_mat73(filename, {"mdo_save": mdo_save}, compress)
+
+
+def write_result_files(directory, n_files, **kwargs):
+    """Writes the synthetic result files of a simulation.
+
+    :param str directory: directory in which the files are written.
+    :param int n_files: number of files.
+    :param \\*\\*kwargs: arguments passed to :func:`write_result_file`.
+    :return: (*list*) -- paths to the result files, in order.
+    """
+    os.makedirs(directory, exist_ok=True)
+    seed = kwargs.pop("seed", 0)
+    results = []
+    for i in range(n_files):
+        filename = os.path.join(directory, f"result_{i}.mat")
+        write_result_file(filename, seed=seed + i, **kwargs)
+        results.append(filename)
+    return results
+
+
+def write_scenario(input_dir, n_files, start_date="2016-01-01", **kwargs):
+    """Writes a synthetic scenario which can be extracted by
+    :func:`pyreisejl.utility.extract_data.extract_scenario`: a grid.pkl file and
+    result files in the output folder.
+
+    :param str input_dir: directory of the scenario.
+    :param int n_files: number of result files.
+    :param str start_date: start date of the scenario.
+    :param \\*\\*kwargs: arguments passed to :func:`write_result_file`.
+    :return: (*tuple*) -- start and end dates of the scenario.
+    """
+    n_dcline = kwargs.get("n_dcline", 0)
+    n_storage = kwargs.get("n_storage", 0)
+    grid = SimpleNamespace(
+        bus=pd.DataFrame(index=pd.RangeIndex(1, kwargs["n_bus"] + 1)),
+        branch=pd.DataFrame(index=pd.RangeIndex(1, kwargs["n_branch"] + 1)),
+        plant=pd.DataFrame(index=pd.RangeIndex(1, kwargs["n_plant"] + 1)),
+    )
+    if n_dcline > 0:
+        grid.dcline = pd.DataFrame(index=pd.RangeIndex(1, n_dcline + 1))
+    if n_storage > 0:
+        grid.storage = {"StorageData": pd.DataFrame({"UnitIdx": np.arange(n_storage)})}
+    os.makedirs(input_dir, exist_ok=True)
+    with open(os.path.join(input_dir, "grid.pkl"), "wb") as f:
+        pickle.dump(grid, f)
+
+    write_result_files(os.path.join(input_dir, "output"), n_files, **kwargs)
+    n_hours = n_files * kwargs.get("interval", 24)
+    end_date = pd.Timestamp(start_date) + pd.Timedelta(hours=n_hours - 1)
+    return start_date, str(end_date)
+
+
+def _measure(func, args, kwargs):
+    """Runs a function and measures its duration and memory usage.
+
+    :param callable func: function to run.
+    :param tuple args: positional arguments of the function.
+    :param dict kwargs: keyword arguments of the function.
+    :return: (*dict*) -- wall and CPU time in seconds, peak resident set size of the
+        process before and after the call and of its child processes in bytes.
+    """
+    rss_before = max_rss()
+    wall, cpu = time.perf_counter(), time.process_time()
+    func(*args, **kwargs)
+    return {
+        "wall_time": time.perf_counter() - wall,
+        "cpu_time": time.process_time() - cpu,
+        "peak_rss": max_rss(),
+        "baseline_rss": rss_before,
+        "children_peak_rss": max_rss(resource.RUSAGE_CHILDREN),
+    }
+
+
+def profile(func, *args, **kwargs):
+    """Measures the duration and memory usage of a function call in a new process,
+    so that the peak memory usage of the call is not hidden by the one of previous
+    calls.
+
+    :param callable func: function to profile, importable from a module.
+    :param \\*args: positional arguments of the function.
+    :param \\*\\*kwargs: keyword arguments of the function.
+    :return: (*dict*) -- see :func:`_measure`.
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_measure, func, args, kwargs).result()
+
+
+def _load_result_variables(filename):
+    """Reads the datasets used by the extraction from a result file.
+
+    :param str filename: path to a result file.
+    """
+    load_mat73(filename, paths=[*extraction_paths.values(), cost_path])
+
+
+def run_benchmarks(sizes, n_files=10, interval=24, workers=1, directory=None, **kwargs):
+    """Benchmarks the extraction of synthetic scenarios of several sizes.
+
+    :param dict sizes: numbers of buses, branches and plants (*n_bus*, *n_branch*
+        and *n_plant*) keyed by size name, e.g. grid_sizes.
+    :param int n_files: number of result files of each scenario.
+    :param int interval: number of hours in each result file.
+    :param int workers: number of worker processes used by extract_data and
+        extract_scenario.
+    :param str directory: directory in which the scenarios are written. None uses a
+        temporary directory, deleted afterwards.
+    :param \\*\\*kwargs: other arguments passed to :func:`write_result_file`, e.g.
+        the number of storage units.
+    :return: (*list*) -- one dictionary per size and benchmark with the name of the
+        benchmark, the grid size, the size in bytes of the result files and the
+        measurements of :func:`profile`.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        records = []
+        for size, counts in sizes.items():
+            input_dir = os.path.join(tmp, size)
+            start_date, end_date = write_scenario(
+                input_dir, n_files, interval=interval, **counts, **kwargs
+            )
+            results = [
+                os.path.join(input_dir, "output", f"result_{i}.mat")
+                for i in range(n_files)
+            ]
+            benchmarks = {
+                "load_mat73": (load_mat73, (results[0],), {}),
+                "load_mat73_paths": (_load_result_variables, (results[0],), {}),
+                "extract_data": (extract_data, (results, workers), {}),
+                "extract_scenario": (
+                    extract_scenario,
+                    (input_dir, start_date, end_date),
+                    {
+                        "output_dir": os.path.join(input_dir, "extracted"),
+                        "workers": workers,
+                    },
+                ),
+            }
+            for name, (func, args, func_kwargs) in benchmarks.items():
+                read = results if name.startswith("extract") else results[:1]
+                records.append(
+                    {
+                        "benchmark": name,
+                        "size": size,
+                        "n_files": len(read),
+                        "file_bytes": sum(os.path.getsize(r) for r in read),
+                        **profile(func, *args, **func_kwargs),
+                    }
+                )
+                print(_format_record(records[-1]))
+        return records
+
+
+def _format_record(record):
+    """Formats a benchmark record on one line.
+
+    :param dict record: a record returned by :func:`run_benchmarks`.
+    :return: (*str*) -- the formatted record.
+    """
+    return (
+        f"{record['benchmark']:<18} {record['size']:<8} "
+        f"{record['file_bytes'] / 2**20:10.1f} MB read "
+        f"{record['wall_time']:9.3f} s wall {record['cpu_time']:9.3f} s CPU "
+        f"{record['peak_rss'] / 2**20:10.1f} MB peak RSS"
+    )
+
+
+if __name__ == "__main__":
+    args = parser.parse_benchmark_args()
+    sizes = {size: grid_sizes[size] for size in args.sizes}
+    if args.bus or args.branch or args.plant:
+        sizes["custom"] = {
+            "n_bus": args.bus or grid_sizes["small"]["n_bus"],
+            "n_branch": args.branch or grid_sizes["small"]["n_branch"],
+            "n_plant": args.plant or grid_sizes["small"]["n_plant"],
+        }
+    records = run_benchmarks(
+        sizes,
+        args.files,
+        args.interval,
+        args.workers,
+        args.directory,
+        n_storage=args.storage,
+        n_dcline=args.dcline,
+        load_shed=args.load_shed,
+        flexible_demand=args.flexible_demand,
+        trans_viol=args.trans_viol,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(records, f, indent=1)
@@ -1,13 +1,17 @@
+import sys
+
 from pyreisejl.utility import const, parser
 from pyreisejl.utility.converters import pkl_to_input_files
-from pyreisejl.utility.extract_data import extract_scenario
+from pyreisejl.utility.extract_data import StreamExtraction, extract_scenario
 from pyreisejl.utility.helpers import (
     WrongNumberOfArguments,
     get_scenario,
     insert_in_file,
     sec2hms,
 )
+from pyreisejl.utility.jobs import JobQueue
 from pyreisejl.utility.launchers import get_launcher
+from pyreisejl.utility.reducers import get_summaries
 
 
 def _record_scenario(scenario_id, runtime):
@@ -39,6 +43,22 @@ def _ensure_required_args(args):
         raise WrongNumberOfArguments(err_str)
 
 
+def run_on_worker(queue_dir, argv):
+    """Submits a simulation to the warm workers of a queue and waits for it to
+    finish, printing its output, see :mod:`pyreisejl.utility.worker`.
+
+    :param str queue_dir: directory of the queue.
+    :param list argv: command line arguments of the simulation.
+    :raises RuntimeError: if the simulation failed.
+    """
+    queue = JobQueue(queue_dir)
+    job_id = queue.submit(argv)
+    print(f"Job {job_id} submitted to the workers of {queue_dir}")
+    result = queue.wait(job_id)
+    if result["status"] != "finished":
+        raise RuntimeError(f"Job {job_id} failed: {result.get('error')}")
+
+
 def main(args):
     # If using PowerSimData, get scenario info, prepare grid data and update status
     if args.scenario_id:
@@ -48,9 +68,11 @@ def main(args):
         args.interval = scenario_args[2]
         args.input_dir = scenario_args[3]
         args.output_dir = const.OUTPUT_DIR
+        if args.conversion_cache is None:
+            args.conversion_cache = const.CONVERSION_CACHE_DIR
 
     _ensure_required_args(args)
-    pkl_to_input_files(args.input_dir)
+    pkl_to_input_files(args.input_dir, args.input_format, args.conversion_cache)
 
     if args.scenario_id:
         # Update status in ExecuteList.csv on server
@@ -64,14 +86,49 @@ def main(args):
         args.input_dir,
         threads=args.threads,
         julia_env=args.julia_env,
+        sysimage=args.sysimage,
+        chunks=args.chunks,
+        warmup=args.warmup,
+        reference_dir=args.reference_dir,
+        interconnections=args.interconnections,
     )
-    runtime = launcher.launch_scenario()
+
+    # Extract result files while the simulation is running if requested
+    extraction = None
+    if args.extract_data and args.stream_extraction:
+        extraction = StreamExtraction(
+            args.input_dir,
+            args.start_date,
+            args.end_date,
+            launcher.n_interval,
+            scenario_id=args.scenario_id,
+            output_dir=args.output_dir,
+            keep_mat=args.keep_matlab,
+            output_format=args.output_format,
+            compression=args.compression,
+            memory_budget=args.memory_budget,
+            partition=args.partition,
+            resume=args.resume,
+            summaries=get_summaries(args.summaries),
+            summary_only=args.summary_only,
+            precision=args.precision,
+        )
+        extraction.start()
+
+    try:
+        runtime = launcher.launch()
+    except Exception:
+        if extraction is not None:
+            extraction.cancel()
+        raise
 
     # If using PowerSimData, record the runtime
     if args.scenario_id:
         _record_scenario(args.scenario_id, runtime)
 
-    if args.extract_data:
+    if extraction is not None:
+        extraction.finish()
+    elif args.extract_data:
         extract_scenario(
             args.input_dir,
             args.start_date,
@@ -79,13 +136,25 @@ def main(args):
             scenario_id=args.scenario_id,
             output_dir=args.output_dir,
             keep_mat=args.keep_matlab,
+            workers=args.workers,
+            output_format=args.output_format,
+            compression=args.compression,
+            memory_budget=args.memory_budget,
+            partition=args.partition,
+            resume=args.resume,
+            summaries=get_summaries(args.summaries),
+            summary_only=args.summary_only,
+            precision=args.precision,
         )
 
 
 if __name__ == "__main__":
     args = parser.parse_call_args()
     try:
-        main(args)
+        if args.worker_queue is not None:
+            run_on_worker(args.worker_queue, sys.argv[1:])
+        else:
+            main(args)
     except Exception as ex:
         print(ex)  # sent to redirected stdout/stderr
         if args.scenario_id:
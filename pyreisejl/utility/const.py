@@ -11,3 +11,17 @@ EXECUTE_LIST = os.path.join(DATA_ROOT_DIR, "ExecuteList.csv")
 EXECUTE_DIR = os.path.join(DATA_ROOT_DIR, "tmp")
 INPUT_DIR = os.path.join(DATA_ROOT_DIR, "data", "input")
 OUTPUT_DIR = os.path.join(DATA_ROOT_DIR, "data", "output")
+
+# Input files converted from grid.pkl, shared by scenarios with the same grid, see
+# pyreisejl.utility.converters.pkl_to_input_files
+CONVERSION_CACHE_DIR = os.path.join(EXECUTE_DIR, "input_cache")
+
+# Queue of the scenario launches run by warm workers, see pyreisejl.utility.worker
+WORKER_QUEUE_DIR = os.path.join(EXECUTE_DIR, "worker_queue")
+
+# Store of the scenario and execute lists, see pyreisejl.utility.status
+STATUS_BACKEND = os.getenv("STATUS_BACKEND", "csv")
+STATUS_DB = os.path.join(DATA_ROOT_DIR, "status.db")
+
+# System image with which Julia is started, see pyreisejl.utility.sysimage
+SYSIMAGE = os.getenv("REISE_SYSIMAGE") or None
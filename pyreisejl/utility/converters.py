@@ -1,6 +1,13 @@
+import hashlib
 import json
 import os
 import pickle
+import shutil
+import tempfile
+
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+from pyarrow import feather
 
 cols = {
     "branch": "branch_id from_bus_id to_bus_id x rateA".split(),
@@ -13,26 +20,92 @@ cols = {
 drop_cols = {"gencost_before": "plant_id interconnect".split()}
 drop_cols["gencost_after"] = drop_cols["gencost_before"]
 
+profiles = [
+    "demand",
+    "hydro",
+    "wind",
+    "solar",
+    "demand_flexibility_parameters",
+    "demand_flexibility_up",
+    "demand_flexibility_dn",
+    "demand_flexibility_cost_up",
+    "demand_flexibility_cost_dn",
+]
+
+input_formats = ["csv", "arrow"]
+
+# Records the files converted from grid.pkl, see pkl_to_input_files
+manifest_name = "input_files.json"
+
+
+def _write_arrow(table, filename):
+    # Columns without missing values are marked as such, so that REISE.jl reads
+    # them as plain vectors rather than vectors of Union{Missing, T}
+    fields = [
+        field.with_nullable(column.null_count > 0)
+        for field, column in zip(table.schema, table.columns)
+    ]
+    table = table.cast(pa.schema(fields, metadata=table.schema.metadata))
+    # Uncompressed files are memory-mapped by REISE.jl rather than decoded
+    feather.write_feather(table, filename + ".tmp", compression="uncompressed")
+    os.replace(filename + ".tmp", filename)
+
+
+def _remove(filename):
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
 
-def _save(path, name, df):
+def _save(path, name, df, input_format="csv"):
     df = df.reset_index()
     df = df.loc[:, cols.get(name, df.columns)]
     df = df.drop(drop_cols.get(name, []), axis=1)
-    df.to_csv(os.path.join(path, f"{name}.csv"), index=False)
+    # Files are replaced rather than overwritten, since they may be hard links to
+    # the files of the conversion cache
+    filename = os.path.join(path, f"{name}.csv")
+    df.to_csv(filename + ".tmp", index=False)
+    os.replace(filename + ".tmp", filename)
+    if input_format == "arrow":
+        df.columns = df.columns.astype(str)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        _write_arrow(table, os.path.join(path, f"{name}.arrow"))
+        return [f"{name}.csv", f"{name}.arrow"]
+    # REISE.jl reads an Arrow file in place of the CSV file when both exist
+    _remove(os.path.join(path, f"{name}.arrow"))
+    return [f"{name}.csv"]
 
 
-def _pkl_to_csv(path, grid):
-    _save(path, "branch", grid.branch)
-    _save(path, "dcline", grid.dcline)
-    _save(path, "bus", grid.bus)
-    _save(path, "plant", grid.plant)
-    _save(path, "gencost_before", grid.gencost["before"])
-    _save(path, "gencost_after", grid.gencost["after"])
+def _pkl_to_tables(path, grid, input_format="csv"):
+    files = [
+        *_save(path, "branch", grid.branch, input_format),
+        *_save(path, "dcline", grid.dcline, input_format),
+        *_save(path, "bus", grid.bus, input_format),
+        *_save(path, "plant", grid.plant, input_format),
+        *_save(path, "gencost_before", grid.gencost["before"], input_format),
+        *_save(path, "gencost_after", grid.gencost["after"], input_format),
+    ]
 
     storage = grid.storage
     if not storage["gen"].empty:
-        _save(path, "StorageData", storage["StorageData"])
-        _save(path, "storage_gen", storage["gen"])
+        files += _save(path, "StorageData", storage["StorageData"], input_format)
+        files += _save(path, "storage_gen", storage["gen"], input_format)
+    return files
+
+
+def _profiles_to_arrow(path, input_format="csv"):
+    for name in profiles:
+        csv_file = os.path.join(path, f"{name}.csv")
+        arrow_file = os.path.join(path, f"{name}.arrow")
+        if input_format != "arrow" or not os.path.exists(csv_file):
+            _remove(arrow_file)
+            continue
+        # Profiles are only converted again when their CSV file changed
+        if os.path.exists(arrow_file):
+            if os.path.getmtime(arrow_file) >= os.path.getmtime(csv_file):
+                continue
+        _write_arrow(pa_csv.read_csv(csv_file), arrow_file)
 
 
 def _pkl_to_json(path, grid):
@@ -44,7 +117,8 @@ def _pkl_to_json(path, grid):
             return json.JSONEncoder.default(self, obj)
 
     # Save grid.model_immutables.plants as a .json file
-    with open(os.path.join(path, "plant_immutables.json"), "w", encoding="utf-8") as f:
+    filename = os.path.join(path, "plant_immutables.json")
+    with open(filename + ".tmp", "w", encoding="utf-8") as f:
         json.dump(
             grid.model_immutables.plants,
             f,
@@ -52,13 +126,128 @@ def _pkl_to_json(path, grid):
             indent=4,
             cls=SetEncoder,
         )
+    os.replace(filename + ".tmp", filename)
+    return ["plant_immutables.json"]
+
+
+def _hash_file(filename, chunk_size=2**20):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_manifest(path, key):
+    # The files converted from grid.pkl, if they were converted from the same
+    # grid.pkl and in the same format, and none of them is missing
+    try:
+        with open(os.path.join(path, manifest_name)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("key") != key:
+        return None
+    files = manifest.get("files", [])
+    if not all(os.path.exists(os.path.join(path, name)) for name in files):
+        return None
+    return files
+
+
+def _write_manifest(path, key, files):
+    filename = os.path.join(path, manifest_name)
+    with open(filename + ".tmp", "w") as f:
+        json.dump({"key": key, "files": files}, f, indent=4)
+    os.replace(filename + ".tmp", filename)
+
+
+def _link(source, destination):
+    # Hard links are replaced rather than overwritten by the conversion, copies are
+    # only made across file systems
+    _remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _link_files(source_dir, destination_dir, files):
+    for name in files:
+        _link(os.path.join(source_dir, name), os.path.join(destination_dir, name))
+
+
+def _remove_stale_arrow_files(path, files):
+    for name in files:
+        stem, extension = os.path.splitext(name)
+        if extension == ".csv" and f"{stem}.arrow" not in files:
+            _remove(os.path.join(path, f"{stem}.arrow"))
+
+
+def _add_to_cache(cache_dir, entry, path, key, files):
+    # The entry is filled in a temporary directory, then renamed, so that scenarios
+    # converted at the same time never link an incomplete entry
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix=".tmp")
+    try:
+        _link_files(path, tmp_dir, files)
+        _write_manifest(tmp_dir, key, files)
+        entry_dir = os.path.join(cache_dir, entry)
+        if os.path.isdir(entry_dir) and _read_manifest(entry_dir, key) is None:
+            # Incomplete entry, e.g. whose files were deleted
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        # Added by another scenario in the meantime
+        pass
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def pkl_to_input_files(path, input_format="csv", cache_dir=None):
+    """Converts the grid.pkl file of a scenario to the input files of REISE.jl.
+
+    The conversion is skipped when the files in the directory were converted from a
+    grid.pkl file with the same content, as given by its SHA-256 hash, in the same
+    format. With a cache directory, the converted files are also stored there, and
+    hard-linked into the directory of the next scenario with the same grid rather
+    than converted again. Profiles are converted to Arrow files whenever their CSV
+    file changed.
+
+    :param str path: directory of the scenario, containing grid.pkl.
+    :param str input_format: format of the input files, one of *input_formats*.
+    :param str cache_dir: directory of the conversion cache. None only skips the
+        conversion of the files already in the directory.
+    :raises ValueError: if the input format is unknown.
+    """
+    if input_format not in input_formats:
+        raise ValueError(f"input_format must be one of {', '.join(input_formats)}")
+
+    digest = _hash_file(os.path.join(path, "grid.pkl"))
+    key = {"grid": digest, "input_format": input_format}
+    entry = f"{digest}_{input_format}"
+
+    cached = None
+    if cache_dir is not None:
+        cached = _read_manifest(os.path.join(cache_dir, entry), key)
 
+    if _read_manifest(path, key) is not None:
+        print("Input files already converted from grid.pkl")
+    elif cached is not None:
+        print(f"Linking input files converted from grid.pkl from {cache_dir}")
+        files = cached
+        _link_files(os.path.join(cache_dir, entry), path, files)
+        _remove_stale_arrow_files(path, files)
+        _write_manifest(path, key, files)
+    else:
+        # Access the grid object from the .pkl file
+        with open(os.path.join(path, "grid.pkl"), "rb") as f:
+            grid = pickle.load(f)
 
-def pkl_to_input_files(path):
-    # Access the grid object from the .pkl file
-    with open(os.path.join(path, "grid.pkl"), "rb") as f:
-        grid = pickle.load(f)
+        # Create the necessary .csv and .json files, and the .arrow files if requested
+        _remove(os.path.join(path, manifest_name))
+        files = [*_pkl_to_tables(path, grid, input_format), *_pkl_to_json(path, grid)]
+        _write_manifest(path, key, files)
+        if cache_dir is not None:
+            _add_to_cache(cache_dir, entry, path, key, files)
 
-    # Create the necessary .csv and .json files
-    _pkl_to_csv(path, grid)
-    _pkl_to_json(path, grid)
+    _profiles_to_arrow(path, input_format)
@@ -0,0 +1,135 @@
+import json
+import os
+
+import numpy as np
+
+from pyreisejl.utility.helpers import load_mat73
+
+mpc_path = "mdo_save/flow/mpc"
+# Variables compared between the results of a chunk and of a reference run
+deviation_paths = {
+    "pg": f"{mpc_path}/gen/PG",
+    "pf": f"{mpc_path}/branch/PF",
+    "lmp": f"{mpc_path}/bus/LAM_P",
+    "storage_e": f"{mpc_path}/storage/Energy",
+}
+cost_path = "mdo_save/results/f"
+report_name = "decomposition.json"
+
+
+def split_intervals(n_interval, chunks, warmup=1):
+    """Splits the intervals of a simulation into contiguous chunks of similar
+    lengths. Every chunk but the first starts with warm-up intervals, which are
+    also solved by the previous chunk and whose results are discarded, so that the
+    initial conditions of its first kept interval (generation, storage state of
+    charge and shifted demand) approximate the ones of a sequential run.
+
+    :param int n_interval: number of intervals of the simulation.
+    :param int chunks: number of chunks, at most *n_interval*.
+    :param int warmup: number of warm-up intervals of each chunk but the first.
+    :return: (*list*) -- (first, start, end) indices of the intervals of each chunk,
+        starting at 0: the chunk solves the intervals from *first* to *end* - 1 and
+        keeps the results from *start* to *end* - 1.
+    :raises ValueError: if the number of chunks or of warm-up intervals is invalid.
+    """
+    if chunks < 1 or chunks > n_interval:
+        raise ValueError(f"Number of chunks must be between 1 and {n_interval}")
+    if warmup < 0:
+        raise ValueError("Number of warm-up intervals must be positive")
+    bounds = [n_interval * k // chunks for k in range(chunks + 1)]
+    return [
+        (max(start - warmup, 0), start, end) for start, end in zip(bounds, bounds[1:])
+    ]
+
+
+def stitch_chunk(chunk_dir, execute_dir, first, start, end):
+    """Moves the results kept from a chunk to the execute directory, numbered as
+    in a sequential run.
+
+    :param str chunk_dir: output folder of the chunk, whose result files are
+        numbered from 0.
+    :param str execute_dir: output folder of the simulation.
+    :param int first: index of the first interval solved by the chunk.
+    :param int start: index of the first interval kept from the chunk.
+    :param int end: index after the last interval of the chunk.
+    :raises FileNotFoundError: if a result file of the chunk is missing.
+    """
+    for i in range(start, end):
+        os.replace(
+            os.path.join(chunk_dir, f"result_{i - first}.mat"),
+            os.path.join(execute_dir, f"result_{i}.mat"),
+        )
+
+
+def result_deviation(filename, reference):
+    """Measures how far the results of an interval are from a reference.
+
+    :param str filename: path to a result file.
+    :param str reference: path to the result file of the same interval in the
+        reference run.
+    :return: (*dict*) -- relative deviation of the objective value (*'cost'*) and
+        maximum absolute deviation of each variable of *deviation_paths* found in
+        both files.
+    """
+    paths = [cost_path, *deviation_paths.values()]
+    output = load_mat73(filename, paths=paths)
+    expected = load_mat73(reference, paths=paths)
+
+    cost, expected_cost = output[cost_path][0][0], expected[cost_path][0][0]
+    deviation = {
+        "cost": float(abs(cost - expected_cost) / max(abs(expected_cost), 1e-9))
+    }
+    for v, p in deviation_paths.items():
+        if p in output and p in expected:
+            deviation[v] = float(np.max(np.abs(output[p] - expected[p]), initial=0))
+    return deviation
+
+
+def compare_to_reference(execute_dir, reference_dir):
+    """Measures how far the first interval kept from each chunk but the first
+    deviates from a sequential run of the same simulation, and records it in the
+    report of the decomposition.
+
+    :param str execute_dir: output folder of the simulation run in chunks, holding
+        its report.
+    :param str reference_dir: output folder of the sequential run.
+    :return: (*dict*) -- the report, see
+        :meth:`pyreisejl.utility.launchers.Launcher.launch_chunks`.
+    :raises FileNotFoundError: if the report or a result file is missing.
+    """
+    filename = os.path.join(execute_dir, report_name)
+    with open(filename) as f:
+        report = json.load(f)
+    for boundary in report["boundaries"]:
+        name = f"result_{boundary['interval']}.mat"
+        boundary["reference"] = result_deviation(
+            os.path.join(execute_dir, name), os.path.join(reference_dir, name)
+        )
+    report["reference_dir"] = reference_dir
+    write_report(execute_dir, report)
+    return report
+
+
+def write_report(execute_dir, report):
+    """Writes the report of a decomposition atomically.
+
+    :param str execute_dir: output folder of the simulation.
+    :param dict report: the report.
+    """
+    filename = os.path.join(execute_dir, report_name)
+    with open(filename + ".tmp", "w") as f:
+        json.dump(report, f, indent=4)
+    os.replace(filename + ".tmp", filename)
+
+
+def print_report(report):
+    """Prints the deviations at the boundaries between chunks.
+
+    :param dict report: the report of a decomposition.
+    """
+    for boundary in report["boundaries"]:
+        for kind in ["overlap", "reference"]:
+            if boundary.get(kind) is None:
+                continue
+            values = ", ".join(f"{v}={d:.3g}" for v, d in boundary[kind].items())
+            print(f"Interval {boundary['interval']}, {kind} deviation: {values}")
@@ -1,12 +1,19 @@
 import glob
+import hashlib
+import json
+import multiprocessing
 import os
 import pickle
 import re
 import shutil
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 import numpy as np
 import pandas as pd
+from scipy.sparse import coo_matrix
 from tqdm import tqdm
 
 from pyreisejl.utility import const, parser
@@ -17,6 +24,14 @@ from pyreisejl.utility.helpers import (
     load_mat73,
     validate_time_format,
 )
+from pyreisejl.utility.precision import Precision, parse_precision
+from pyreisejl.utility.profiling import Profiler, timed
+from pyreisejl.utility.reducers import AveragedCongestion, get_summaries
+from pyreisejl.utility.store import (
+    output_formats,
+    write_output,
+    write_partitioned_output,
+)
 
 
 def copy_input(input_dir, scenario_id=None):
@@ -45,97 +60,630 @@ def result_num(filename):
     return int(match.group("num"))
 
 
-def extract_data(results):
-    """Builds data frames of {PG, PF, LMP, CONGU, CONGL} from Julia simulation
-        output binary files produced by REISE.jl.
+sparse_extraction_vars = {"congu", "congl", "load_shed", "trans_viol"}
+mpc_path = "mdo_save/flow/mpc"
+extraction_paths = {
+    "pg": f"{mpc_path}/gen/PG",
+    "pf": f"{mpc_path}/branch/PF",
+    "lmp": f"{mpc_path}/bus/LAM_P",
+    "congu": f"{mpc_path}/branch/MU_SF",
+    "congl": f"{mpc_path}/branch/MU_ST",
+}
+# Optional variables (not present in all scenarios)
+optional_extraction_paths = {
+    "pf_dcline": f"{mpc_path}/dcline/PF_dcline",
+    "storage_pg": f"{mpc_path}/storage/PG",
+    "storage_e": f"{mpc_path}/storage/Energy",
+    "load_shed": f"{mpc_path}/load_shed/load_shed",
+    "load_shift_up": f"{mpc_path}/flexible_demand/load_shift_up",
+    "load_shift_dn": f"{mpc_path}/flexible_demand/load_shift_dn",
+    "trans_viol": f"{mpc_path}/trans_viol/trans_viol",
+}
+cost_path = "mdo_save/results/f"
+demand_scaling_path = "mdo_save/demand_scaling"
+
+
+def get_precision(precision=None):
+    """Completes a precision policy with the default precision of each variable:
+    float32 for dense variables and float64 rounded to 1e-6 for sparse variables.
+
+    :param dict precision: precision of some variables, keyed by variable name, as
+        :class:`pyreisejl.utility.precision.Precision` or as strings parsed by
+        :func:`pyreisejl.utility.precision.parse_precision`.
+    :return: (*dict*) -- precision of every variable, keyed by variable name.
+    :raises ValueError: if a variable is unknown or a precision is invalid.
+    """
+    policy = {v: Precision("float32") for v in extraction_paths}
+    policy.update({v: Precision("float32") for v in optional_extraction_paths})
+    policy.update({v: Precision("float64", 1e-6) for v in sparse_extraction_vars})
+    precision = precision or {}
+    unknown = precision.keys() - policy.keys()
+    if unknown:
+        raise ValueError(f"Unknown variables: {', '.join(sorted(unknown))}")
+    for v, p in precision.items():
+        policy[v] = p if isinstance(p, Precision) else parse_precision(p)
+    return policy
+
+
+def _sparsify(data, precision=None, name=None):
+    """Keeps the values of an array which are not zero once rounded.
+
+    :param numpy.ndarray data: array (time x element).
+    :param pyreisejl.utility.precision.Precision precision: precision of the
+        values. None rounds them to 1e-6.
+    :param str name: name of the variable, used in error messages.
+    :return: (*scipy.sparse.coo_matrix*) -- triplets of the rounded non-zero values.
+    """
+    if precision is None:
+        precision = Precision("float64", 1e-6)
+    data = precision.apply(data, name)
+    rows, cols = np.nonzero(data)
+    return coo_matrix((data[rows, cols], (rows, cols)), shape=data.shape)
+
+
+def _read_result(filename, precision=None):
+    """Reads the variables of interest from a single result file.
+
+    :param str filename: path to a result_*.mat file.
+    :param dict precision: precision of the variables, see :func:`get_precision`.
+        Variables are read from the file in the type of their precision, so that
+        they are converted while being decompressed.
+    :return: (*tuple*) -- first element is the result number, second is the cost
+        (None if not recorded), third is the demand scaling, fourth is a
+        dictionary of arrays (time x element) keyed by variable name and fifth is
+        a dictionary of measurements, see
+        :meth:`pyreisejl.utility.profiling.Profiler.add_file`. Dense variables are
+        already stored with their precision and sparse variables are reduced to the
+        triplets of their non-zero values, so that only compact arrays need to be
+        sent back from worker processes.
+    :raises KeyError: if a mandatory variable is missing from the file.
+    """
+    policy = get_precision(precision)
+    all_paths = {**extraction_paths, **optional_extraction_paths}
+    dtypes = {p: policy[v].read_dtype for v, p in all_paths.items()}
+    paths = [
+        *extraction_paths.values(),
+        *optional_extraction_paths.values(),
+        cost_path,
+        demand_scaling_path,
+    ]
+    stats = {"file": filename, "phases": {}}
+    output = load_mat73(filename, paths=paths, stats=stats, dtypes=dtypes)
 
-    :param list results: list of result files
-    :return: (*tuple*) -- first element is a dictionary of Pandas data frames of:
-        PG, PF, LMP, CONGU, CONGL, LOAD_SHED, second is a list of strings of infeasibilities,
-        and the third element is a list of numpy.float64 costs for each file in the input results list
+    # Record cost for this mat file
+    cost = output[cost_path][0][0] if cost_path in output else None
+
+    demand_scaling = output[demand_scaling_path][0][0]
+
+    temps = {v: output[p].T for v, p in extraction_paths.items()}
+    temps.update(
+        {v: output[p].T for v, p in optional_extraction_paths.items() if p in output}
+    )
+
+    for v in temps:
+        if v in sparse_extraction_vars:
+            with timed(stats["phases"], "sparsify"):
+                temps[v] = _sparsify(temps[v], policy[v], v)
+        else:
+            with timed(stats["phases"], "dtype_conversion"):
+                temps[v] = policy[v].apply(temps[v], v)
+
+    return result_num(filename), cost, demand_scaling, temps, stats
+
+
+def _file_hash(filename):
+    """Computes the hash of the content of a file.
+
+    :param str filename: path to the file.
+    :return: (*str*) -- hexadecimal SHA-256 digest.
     """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-    infeasibilities = []
-    cost = []
 
-    extraction_vars = {"pf", "pg", "lmp", "congu", "congl"}
-    sparse_extraction_vars = {"congu", "congl", "load_shed", "trans_viol"}
-    temps = {}
-    outputs = {}
-    optional_variables = [
-        {"name": "pf_dcline", "key1": "dcline", "key2": "PF_dcline"},
-        {"name": "storage_pg", "key1": "storage", "key2": "PG"},
-        {"name": "storage_e", "key1": "storage", "key2": "Energy"},
-        {"name": "load_shed", "key1": "load_shed", "key2": "load_shed"},
-        {"name": "load_shift_up", "key1": "flexible_demand", "key2": "load_shift_up"},
-        {"name": "load_shift_dn", "key1": "flexible_demand", "key2": "load_shift_dn"},
-        {"name": "trans_viol", "key1": "trans_viol", "key2": "trans_viol"},
-    ]
+def _save_state(path, result):
+    """Saves the output of :func:`_read_result`, but the measurements, to a .npz
+    file.
+
+    :param str path: path to the file, replaced atomically.
+    :param tuple result: output of :func:`_read_result`.
+    """
+    n, cost, demand_scaling, temps, _ = result
+    arrays = {"n": n, "demand_scaling": demand_scaling}
+    if cost is not None:
+        arrays["cost"] = cost
+    for v, data in temps.items():
+        if v in sparse_extraction_vars:
+            arrays.update(
+                {
+                    f"{v}/row": data.row,
+                    f"{v}/col": data.col,
+                    f"{v}/data": data.data,
+                    f"{v}/shape": data.shape,
+                }
+            )
+        else:
+            arrays[v] = data
+    with open(path + ".tmp", "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(path + ".tmp", path)
 
-    tic = time.process_time()
-    for i, filename in tqdm(enumerate(results)):
-        # For each result_#.mat file
-        output = load_mat73(filename)
 
-        # Record cost for this mat file
-        try:
-            cost.append(output["mdo_save"]["results"]["f"][0][0])
-        except KeyError:
-            pass
-
-        # Check for infeasibilities
-        demand_scaling = output["mdo_save"]["demand_scaling"][0][0]
-        if demand_scaling < 1:
-            demand_change = round(100 * (1 - demand_scaling))
-            infeasibilities.append(f"{i}:{demand_change}")
-
-        # Extract various variables
-        output_mpc = output["mdo_save"]["flow"]["mpc"]
-
-        temps["pg"] = output_mpc["gen"]["PG"].T
-        temps["pf"] = output_mpc["branch"]["PF"].T
-        temps["lmp"] = output_mpc["bus"]["LAM_P"].T
-        temps["congu"] = output_mpc["branch"]["MU_SF"].T
-        temps["congl"] = output_mpc["branch"]["MU_ST"].T
-
-        # Extract optional variables (not present in all scenarios)
-        for var in optional_variables:
+def _load_state(path):
+    """Loads the output of :func:`_read_result` saved by :func:`_save_state`.
+
+    :param str path: path to the .npz file.
+    :return: (*tuple*) -- see :func:`_read_result`, without the measurements.
+    """
+    with np.load(path) as state:
+        cost = state["cost"][()] if "cost" in state else None
+        temps = {}
+        for key in state.files:
+            v, _, part = key.partition("/")
+            if key in {"n", "cost", "demand_scaling"}:
+                continue
+            if not part:
+                temps[v] = state[key]
+            elif part == "shape":
+                temps[v] = coo_matrix(
+                    (state[f"{v}/data"], (state[f"{v}/row"], state[f"{v}/col"])),
+                    shape=tuple(state[key]),
+                )
+        return int(state["n"]), cost, state["demand_scaling"][()], temps
+
+
+def _read_checkpointed(filename, checkpoint_dir, entry, precision=None):
+    """Reads a result file, or the state saved when it was first read if it has not
+    changed since then and was read with the same precision.
+
+    :param str filename: path to a result_*.mat file.
+    :param str checkpoint_dir: directory in which the states are saved.
+    :param dict entry: manifest entry of the file, None if it has not been read.
+    :param dict precision: see :func:`_read_result`.
+    :return: (*tuple*) -- output of :func:`_read_result` and manifest entry of the
+        file.
+    """
+    stat = os.stat(filename)
+    policy = {v: p.to_dict() for v, p in get_precision(precision).items()}
+    if entry is not None and entry.get("precision") == policy:
+        unchanged = (entry["size"], entry["mtime"]) == (stat.st_size, stat.st_mtime_ns)
+        if not unchanged and entry["size"] == stat.st_size:
+            # The file may have been copied or touched without being modified
+            unchanged = _file_hash(filename) == entry["sha256"]
+        if unchanged:
+            path = os.path.join(checkpoint_dir, entry["state"])
+            tic = time.perf_counter()
             try:
-                temps[var["name"]] = output_mpc[var["key1"]][var["key2"]].T
-                extraction_vars.add(var["name"])
-            except KeyError:
+                result = _load_state(path)
+            except (OSError, KeyError, ValueError):
                 pass
+            else:
+                stats = {
+                    "file": filename,
+                    "read_time": time.perf_counter() - tic,
+                    "bytes_read": os.path.getsize(path),
+                }
+                return (*result, stats), {**entry, "mtime": stat.st_mtime_ns}
+
+    sha256 = _file_hash(filename)
+    result = _read_result(filename, precision)
+    state = os.path.splitext(os.path.basename(filename))[0] + ".npz"
+    _save_state(os.path.join(checkpoint_dir, state), result)
+    entry = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "sha256": sha256,
+        "state": state,
+        "precision": policy,
+    }
+    return result, entry
+
 
-        # Extract which number result currently being processed
-        i = result_num(filename)
+class _Checkpoint:
+    """Manifest of the result files already read, saved in a checkpoint directory
+    along with the variables extracted from each file, so that an interrupted
+    extraction can be resumed without reading these files again.
 
-        for v in extraction_vars:
-            # Determine start, end indices of the outputs where this iteration belongs
+    :param str directory: checkpoint directory, created if need be.
+    """
+
+    def __init__(self, directory):
+        """Constructor."""
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.manifest_path) as f:
+                self.files = json.load(f)["files"]
+        except (OSError, ValueError, KeyError):
+            self.files = {}
+
+    def entry(self, filename):
+        """Returns the manifest entry of a result file.
+
+        :param str filename: path to a result_*.mat file.
+        :return: (*dict*) -- size, mtime (ns), sha256, state file and precision of
+            the result file when it was read, None if it has not been read.
+        """
+        return self.files.get(os.path.basename(filename))
+
+    def update(self, filename, entry):
+        """Records that a result file has been read.
+
+        :param str filename: path to a result_*.mat file.
+        :param dict entry: manifest entry of the file.
+        """
+        if self.files.get(os.path.basename(filename)) == entry:
+            return
+        self.files[os.path.basename(filename)] = entry
+        with open(self.manifest_path + ".tmp", "w") as f:
+            json.dump({"files": self.files}, f, indent=1)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+
+def _read_results(results, workers=1, checkpoint=None, precision=None):
+    """Reads result files, optionally in parallel worker processes.
+
+    :param list results: list of result files.
+    :param int workers: number of worker processes. Files are read in the current
+        process if 1 or less.
+    :param _Checkpoint checkpoint: checkpoint of the extraction. Files which have
+        already been read and have not changed are loaded from it, others are
+        added to it. None reads all the files.
+    :param dict precision: see :func:`_read_result`.
+    :return: (*generator*) -- outputs of :func:`_read_result`, in the same order as
+        the input list whatever the order in which the workers complete.
+    """
+    if checkpoint is None:
+        read, args = _read_result, (results, repeat(precision))
+    else:
+        read = _read_checkpointed
+        entries = [checkpoint.entry(filename) for filename in results]
+        args = (results, repeat(checkpoint.directory), entries, repeat(precision))
+
+    def record(outputs):
+        for filename, output in zip(results, outputs):
+            if checkpoint is None:
+                yield output
+            else:
+                result, entry = output
+                checkpoint.update(filename, entry)
+                yield result
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from record(executor.map(read, *args))
+    else:
+        yield from record(map(read, *args))
+
+
+class _OutputBuffers:
+    """Preallocated arrays in which the variables of each result file are written.
+
+    Dense variables are stored as arrays of the type of their precision, sized from
+    the number of result files and the shape of the variable in the first file in
+    which it appears, then filled in place. If a memory budget is given, the arrays
+    that do not fit in it, largest first, are memory-mapped files in the scratch
+    directory instead. Sparse variables are kept in memory as the triplets of their
+    non-zero values in each file, so that their size depends on the number of
+    non-zero values only.
+
+    :param int n_results: number of result files.
+    :param int memory_budget: maximum size in bytes of the dense arrays kept in
+        memory. None keeps all of them in memory.
+    :param str scratch_dir: directory in which the memory-mapped files are created.
+        None uses the default temporary directory.
+    :param dict precision: see :func:`get_precision`.
+    """
+
+    def __init__(self, n_results, memory_budget=None, scratch_dir=None, precision=None):
+        """Constructor."""
+        self.n_results = n_results
+        self.memory_budget = memory_budget
+        self.scratch_dir = scratch_dir
+        self.precision = get_precision(precision)
+        self.in_memory = 0
+        self.buffers = {}
+        self.shapes = {}
+        self.triplets = {}
+
+    def _allocate(self, v, shape, dtype):
+        """Allocates a zero-filled array, in memory if it fits in the budget.
+
+        :param str v: variable name.
+        :param tuple shape: shape of the array.
+        :param numpy.dtype dtype: type of the array.
+        :return: (*numpy.ndarray*) -- the array, possibly a numpy.memmap.
+        """
+        nbytes = np.prod(shape) * np.dtype(dtype).itemsize
+        if self.memory_budget is None or self.in_memory + nbytes <= self.memory_budget:
+            self.in_memory += nbytes
+            return np.zeros(shape, dtype=dtype)
+        # The file is deleted as soon as the array is garbage collected
+        with tempfile.TemporaryFile(prefix=f"{v}_", dir=self.scratch_dir) as f:
+            return np.memmap(f, dtype=dtype, mode="w+", shape=shape)
+
+    def add(self, n, temps):
+        """Writes the variables of a result file in the buffers.
+
+        :param int n: result number of the file.
+        :param dict temps: dictionary of arrays (time x element) keyed by variable
+            name, numpy arrays for dense variables and numpy arrays or
+            scipy.sparse matrices for sparse variables.
+        """
+        for v in temps.keys() - self.shapes.keys():
             interval_length, n_columns = temps[v].shape
-            start_hour, end_hour = (i * interval_length), ((i + 1) * interval_length)
-            # If this extraction variables hasn't been seen yet, initialize all zeros
-            if v not in outputs:
-                total_length = len(results) * interval_length
-                outputs[v] = pd.DataFrame(np.zeros((total_length, n_columns)))
-            # Update the output variables for the time frame with the extracted data
-            outputs[v].iloc[start_hour:end_hour, :] = temps[v]
+            self.shapes[v] = (self.n_results * interval_length, n_columns)
+
+        # If some dense variables haven't been seen yet, initialize all zeros.
+        # Smallest first, so that the largest ones are stored on disk if need be.
+        new_dense = temps.keys() - self.buffers.keys() - sparse_extraction_vars
+        for v in sorted(new_dense, key=lambda v: temps[v].size):
+            dtype = self.precision[v].dtype
+            self.buffers[v] = self._allocate(v, self.shapes[v], dtype)
+
+        for v, data in temps.items():
+            if v in sparse_extraction_vars:
+                dtype = self.precision[v].dtype
+                self.triplets.setdefault(v, {})[n] = coo_matrix(data, dtype=dtype)
+                continue
+            # Determine start, end indices of the outputs where this file belongs
+            interval_length = data.shape[0]
+            start_hour, end_hour = (n * interval_length), ((n + 1) * interval_length)
+            self.buffers[v][start_hour:end_hour, :] = data
+
+    def _to_sparse(self, v):
+        """Builds a sparse data frame from the triplets of a variable.
+
+        :param str v: variable name.
+        :return: (*pandas.DataFrame*) -- data frame with sparse dtype.
+        """
+        rows, cols, values = [], [], []
+        for n, matrix in sorted(self.triplets[v].items()):
+            rows.append(matrix.row.astype(np.int64) + n * matrix.shape[0])
+            cols.append(matrix.col)
+            values.append(matrix.data)
+        matrix = coo_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=self.shapes[v],
+        )
+        return pd.DataFrame.sparse.from_spmatrix(matrix.tocsc())
+
+    def to_frames(self):
+        """Wraps the buffers in data frames without copying dense variables.
+
+        :return: (*dict*) -- dictionary of data frames keyed by variable name.
+            Variables with many zero or near-zero values, as identified in
+            sparse_extraction_vars, are converted to sparse dtype. The precision of
+            each variable is recorded in the *'precision'* attribute of its data
+            frame.
+        """
+        outputs = {v: pd.DataFrame(b, copy=False) for v, b in self.buffers.items()}
+        print("sparsifying", set(self.triplets))
+        for v in self.triplets:
+            outputs[v] = self._to_sparse(v)
+        for v, df in outputs.items():
+            df.attrs["precision"] = self.precision[v].to_dict()
+        return outputs
+
+
+def _collect_results(
+    file_results,
+    n_results,
+    memory_budget=None,
+    scratch_dir=None,
+    profiler=None,
+    reducers=(),
+    keep_outputs=True,
+    precision=None,
+):
+    """Accumulates the outputs of :func:`_read_result` for a scenario.
+
+    :param iterable file_results: outputs of :func:`_read_result`, in file order.
+    :param int n_results: number of result files of the scenario.
+    :param int memory_budget: see :class:`_OutputBuffers`.
+    :param str scratch_dir: see :class:`_OutputBuffers`.
+    :param pyreisejl.utility.profiling.Profiler profiler: see :func:`extract_data`.
+    :param iterable reducers: see :func:`extract_data`.
+    :param bool keep_outputs: see :func:`extract_data`.
+    :param dict precision: see :func:`extract_data`.
+    :return: (*tuple*) -- see :func:`extract_data`.
+    """
+    infeasibilities = []
+    cost = []
+    buffers = _OutputBuffers(n_results, memory_budget, scratch_dir, precision)
+    fixed_point = {v for v, p in buffers.precision.items() if p.dtype.kind == "i"}
+    if profiler is None:
+        profiler = Profiler()
+
+    tic = time.perf_counter()
+    with profiler.phase("read"):
+        for i, (n, file_cost, demand_scaling, temps, stats) in tqdm(
+            enumerate(file_results), total=n_results
+        ):
+            # Record cost for this mat file
+            if file_cost is not None:
+                cost.append(file_cost)
+
+            # Check for infeasibilities
+            if demand_scaling < 1:
+                demand_change = round(100 * (1 - demand_scaling))
+                infeasibilities.append(f"{i}:{demand_change}")
+
+            copy = time.perf_counter()
+            if keep_outputs:
+                buffers.add(n, temps)
+            stats["copy_time"] = time.perf_counter() - copy
+            profiler.add_file(stats)
+
+            with profiler.phase("reduce"):
+                if reducers:
+                    # Summaries are computed in the units of the variables
+                    for v in fixed_point & temps.keys():
+                        temps[v] = buffers.precision[v].to_units(temps[v])
+                        if v in sparse_extraction_vars:
+                            temps[v] = coo_matrix(temps[v])
+                for reducer in reducers:
+                    reducer.update(temps)
 
     # Record time to read all the data
-    toc = time.process_time()
+    toc = time.perf_counter()
     print("Reading time " + str((toc - tic)) + "s")
 
-    # Convert everything except sparse variables to float32
-    for v in extraction_vars - sparse_extraction_vars:
-        outputs[v] = outputs[v].astype(np.float32)
+    with profiler.phase("sparsify"):
+        outputs = buffers.to_frames()
+    return outputs, infeasibilities, cost
 
-    # Convert outputs with many zero or near-zero values to sparse dtype
-    # As identified in sparse_extraction_vars
-    to_sparsify = extraction_vars & sparse_extraction_vars
-    print("sparsifying", to_sparsify)
-    for v in to_sparsify:
-        outputs[v] = outputs[v].round(6).astype(pd.SparseDtype("float", 0))
 
-    return outputs, infeasibilities, cost
+def extract_data(
+    results,
+    workers=1,
+    memory_budget=None,
+    scratch_dir=None,
+    checkpoint_dir=None,
+    profiler=None,
+    reducers=(),
+    keep_outputs=True,
+    precision=None,
+):
+    """Builds data frames of {PG, PF, LMP, CONGU, CONGL} from Julia simulation
+        output binary files produced by REISE.jl.
+
+    :param list results: list of result files
+    :param int workers: number of worker processes used to read the result files.
+        Defaults to 1, i.e. files are read sequentially in the current process.
+    :param int memory_budget: maximum size in bytes of the data kept in memory. The
+        variables which do not fit are backed by memory-mapped files. Defaults to
+        None, i.e. everything is kept in memory.
+    :param str scratch_dir: directory in which the memory-mapped files are created.
+        Defaults to None, i.e. the default temporary directory.
+    :param str checkpoint_dir: directory in which the variables read from each
+        result file are saved, along with a manifest of the size, modification time
+        and hash of the files. Files already in the manifest which have not changed
+        are not read again. Defaults to None, i.e. all the files are read.
+    :param pyreisejl.utility.profiling.Profiler profiler: profiler in which the
+        measurements of each file and of the read, dtype_conversion and sparsify
+        phases are recorded. Defaults to None, i.e. the measurements are discarded.
+    :param iterable reducers: reducers, see :mod:`pyreisejl.utility.reducers`,
+        updated with the variables of each result file as soon as it is read.
+        Their summaries are available from their result method once this function
+        returns. Defaults to none.
+    :param bool keep_outputs: whether to build the data frames of the time series.
+        If False, an empty dictionary is returned and only the reducers are
+        updated, so that the time series are never held in memory. Defaults to
+        True.
+    :param dict precision: precision of some variables, keyed by variable name, see
+        :func:`get_precision`. Defaults to None, i.e. dense variables are float32
+        and sparse variables are float64 rounded to 1e-6.
+    :return: (*tuple*) -- first element is a dictionary of Pandas data frames of:
+        PG, PF, LMP, CONGU, CONGL, LOAD_SHED, second is a list of strings of infeasibilities,
+        and the third element is a list of numpy.float64 costs for each file in the input results list
+    """
+    checkpoint = None if checkpoint_dir is None else _Checkpoint(checkpoint_dir)
+    return _collect_results(
+        _read_results(results, workers, checkpoint, precision),
+        len(results),
+        memory_budget,
+        scratch_dir,
+        profiler,
+        reducers,
+        keep_outputs,
+        precision,
+    )
+
+
+def _watch_results(results_dir, n_results, stop, poll_interval):
+    """Waits for the result files written by a running simulation.
+
+    A result file is complete once the next one has been created, since REISE.jl
+    writes them one after the other, or once the simulation has finished. Files
+    left over by a previous run are ignored until they are overwritten.
+
+    :param str results_dir: directory in which the result files are written.
+    :param int n_results: number of result files expected.
+    :param threading.Event/multiprocessing.Event stop: event set once the
+        simulation has finished.
+    :param float poll_interval: time in seconds between two checks of the directory.
+    :return: (*generator*) -- paths of complete result files, in order. Stops early
+        if the simulation finishes without writing all the files.
+    """
+    stale = {
+        path: os.path.getmtime(path)
+        for path in glob.glob(os.path.join(results_dir, "result_*.mat"))
+    }
+
+    def written(path):
+        return os.path.exists(path) and os.path.getmtime(path) != stale.get(path)
+
+    for n in range(n_results):
+        filename = os.path.join(results_dir, f"result_{n}.mat")
+        following = os.path.join(results_dir, f"result_{n + 1}.mat")
+        while not written(following):
+            # Check the event before the file, to not miss a file written just before
+            finished = stop.is_set()
+            if finished and written(filename):
+                break
+            if finished:
+                return
+            stop.wait(poll_interval)
+        yield filename
+
+
+def stream_data(
+    results_dir,
+    n_results,
+    stop,
+    poll_interval=5,
+    memory_budget=None,
+    scratch_dir=None,
+    checkpoint_dir=None,
+    profiler=None,
+    reducers=(),
+    keep_outputs=True,
+    precision=None,
+):
+    """Builds the same data frames as :func:`extract_data`, reading each result file
+    as soon as it has been written by a running simulation.
+
+    :param str results_dir: directory in which the result files are written.
+    :param int n_results: number of result files expected.
+    :param threading.Event/multiprocessing.Event stop: event set once the
+        simulation has finished.
+    :param float poll_interval: time in seconds between two checks of the directory.
+    :param int memory_budget: see :func:`extract_data`.
+    :param str scratch_dir: see :func:`extract_data`.
+    :param str checkpoint_dir: see :func:`extract_data`.
+    :param pyreisejl.utility.profiling.Profiler profiler: see :func:`extract_data`.
+    :param iterable reducers: see :func:`extract_data`.
+    :param bool keep_outputs: see :func:`extract_data`.
+    :param dict precision: see :func:`extract_data`.
+    :return: (*tuple*) -- first element is the list of result files read, the
+        following elements are the ones returned by :func:`extract_data`.
+    """
+    mat_results = []
+    checkpoint = None if checkpoint_dir is None else _Checkpoint(checkpoint_dir)
+
+    def ingest():
+        for filename in _watch_results(results_dir, n_results, stop, poll_interval):
+            mat_results.append(filename)
+            yield from _read_results(
+                [filename], checkpoint=checkpoint, precision=precision
+            )
+
+    outputs, infeasibilities, cost = _collect_results(
+        ingest(),
+        n_results,
+        memory_budget,
+        scratch_dir,
+        profiler,
+        reducers,
+        keep_outputs,
+        precision,
+    )
+    return mat_results, outputs, infeasibilities, cost
 
 
 def calculate_averaged_congestion(congl, congu):
@@ -168,6 +716,31 @@ def calculate_averaged_congestion(congl, congu):
     return pd.merge(mean_congl, mean_congu, left_index=True, right_index=True)
 
 
+def _get_output_path(output_dir, scenario_id=None, output_format="pickle"):
+    """Generates a function to create the path for an output file given
+
+    :param str output_dir: the directory to save all the output files
+    :param str scenario_id: optional scenario ID number to prepend to each output file. Defaults to None.
+    :param str output_format: optional format of the output files, one of the keys of output_formats. Defaults to pickle.
+    :return: (*func*) -- a function that take a (*str*) attribute name
+        and returns a (*str*) path to the file where it should be saved
+    """
+    prepend = f"{scenario_id}_" if scenario_id else ""
+    extension = output_formats[output_format]
+    return lambda x: os.path.join(output_dir, prepend + x.upper() + extension)
+
+
+def _get_checkpoint_dir(output_dir, scenario_id=None):
+    """Gets the directory in which the extraction of a scenario is checkpointed.
+
+    :param str output_dir: the directory to save all the output files
+    :param str scenario_id: optional scenario ID number to prepend to the directory. Defaults to None.
+    :return: (*str*) -- path to the checkpoint directory.
+    """
+    prepend = f"{scenario_id}_" if scenario_id else ""
+    return os.path.join(output_dir, prepend + "checkpoint")
+
+
 def _get_pkl_path(output_dir, scenario_id=None):
     """Generates a function to create the path for a .pkl file given
 
@@ -176,8 +749,7 @@ def _get_pkl_path(output_dir, scenario_id=None):
     :return: (*func*) -- a function that take a (*str*) attribute name
         and returns a (*str*) path to the .pkl where it should be saved
     """
-    prepend = f"{scenario_id}_" if scenario_id else ""
-    return lambda x: os.path.join(output_dir, prepend + x.upper() + ".pkl")
+    return _get_output_path(output_dir, scenario_id)
 
 
 def build_log(mat_results, costs, output_dir, scenario_id=None):
@@ -286,6 +858,107 @@ def _update_outputs_labels(outputs, start_date, end_date, freq, grid_path):
         outputs[k].columns = outputs_id[k]
 
 
+def _save_outputs(
+    mat_results,
+    outputs,
+    infeasibilities,
+    cost,
+    input_dir,
+    start_date,
+    end_date,
+    scenario_id,
+    output_dir,
+    freq,
+    keep_mat,
+    output_format,
+    compression,
+    memory_budget,
+    partition,
+    profiler,
+    reducers,
+):
+    """Labels the extracted data, saves it to files and updates the status.
+
+    :param list mat_results: list of result files the data was extracted from.
+    :param dict outputs: dictionary of pandas.DataFrames outputted by extract_data.
+    :param list infeasibilities: list of infeasibilities outputted by extract_data.
+    :param list cost: list of costs outputted by extract_data.
+    :param str input_dir: tmp/scenario_*
+    :param str start_date: the start date of the simulation run
+    :param str end_date: the end date of the simulation run
+    :param str scenario_id: identifier for the scenario, used to label output files
+    :param str output_dir: directory in which to store the outputs
+    :param str freq: the frequency of timestamps in the input profiles as a pandas frequency alias
+    :param bool keep_mat: whether to keep the result*.mat files.
+    :param str output_format: format of the output files, one of the keys of output_formats.
+    :param str compression: compression codec of the output files, see :func:`pyreisejl.utility.store.write_output`.
+    :param int memory_budget: maximum size in bytes of the data kept in memory, used to write columnar files by chunks.
+    :param str partition: time partitioning of the output files, see :func:`pyreisejl.utility.store.write_partitioned_output`. None writes a single file per variable.
+    :param pyreisejl.utility.profiling.Profiler profiler: profiler of the extraction, in which the relabel, write and summaries phases are recorded before saving all the measurements next to the log file.
+    :param iterable reducers: reducers updated by extract_data, whose summaries are labelled with the element ids and saved.
+    """
+    grid_path = copy_input(input_dir, scenario_id)
+
+    # Write log file with costs for each result*.mat file
+    build_log(mat_results, cost, output_dir, scenario_id)
+
+    # Update outputs with date indices from the original grid.pkl
+    with profiler.phase("relabel"):
+        _update_outputs_labels(outputs, start_date, end_date, freq, grid_path)
+
+    output_path = _get_output_path(output_dir, scenario_id, output_format)
+    chunk_bytes = None if memory_budget is None else memory_budget // 4
+
+    with profiler.phase("write"):
+        for name, df in outputs.items():
+            if partition is None:
+                write_output(
+                    df, output_path(name), output_format, compression, chunk_bytes
+                )
+            else:
+                write_partitioned_output(
+                    df,
+                    os.path.splitext(output_path(name))[0],
+                    partition,
+                    output_format,
+                    compression,
+                    chunk_bytes,
+                    interval_length=len(df) // max(1, len(mat_results)),
+                )
+
+    # Save the summaries computed while reading, e.g. averaged congestion
+    with profiler.phase("summaries"):
+        outputs_id = _get_outputs_from_converted(grid_path)
+        for reducer in reducers:
+            summary = reducer.result()
+            if summary is None:
+                continue
+            summary.index = outputs_id[reducer.variables[0]]
+            write_output(summary, output_path(reducer.name), output_format, compression)
+
+    # Write the measurements of the extraction next to the log file
+    profile_filename = scenario_id + "_profile.json" if scenario_id else "profile.json"
+    profiler.save(os.path.join(output_dir, profile_filename))
+
+    if scenario_id:
+        # Record infeasibilities
+        insert_in_file(
+            const.SCENARIO_LIST,
+            scenario_id,
+            "infeasibilities",
+            "_".join(infeasibilities),
+        )
+
+        # Update execute and scenario list
+        insert_in_file(const.EXECUTE_LIST, scenario_id, "status", "extracted")
+        insert_in_file(const.SCENARIO_LIST, scenario_id, "state", "analyze")
+
+    if not keep_mat:
+        print("deleting matfiles")
+        for matfile in mat_results:
+            os.remove(matfile)
+
+
 def extract_scenario(
     input_dir,
     start_date,
@@ -294,8 +967,18 @@ def extract_scenario(
     output_dir=None,
     freq="H",
     keep_mat=True,
+    workers=1,
+    output_format="pickle",
+    compression=None,
+    memory_budget=None,
+    partition=None,
+    resume=False,
+    profile_hook=None,
+    summaries=None,
+    summary_only=False,
+    precision=None,
 ):
-    """Extracts data and save data as pickle files to the output directory
+    """Extracts data and save data as pickle (or columnar) files to the output directory
 
     :param str input_dir: tmp/scenario_*
     :param str start_date: the start date of the simulation run
@@ -304,52 +987,195 @@ def extract_scenario(
     :param str output_dir: optional directory in which to store the outputs
     :param str freq: the frequency of timestamps in the input profiles as a pandas frequency alias
     :param bool keep_mat: optional parameter to keep the large result*.mat files after the data has been extracted. Defaults to True.
+    :param int workers: optional number of worker processes used to read the result files. Defaults to 1.
+    :param str output_format: optional format of the output files, one of *'pickle'*, *'parquet'* or *'feather'*. Defaults to pickle.
+    :param str compression: optional compression codec of the output files, see :func:`pyreisejl.utility.store.write_output`. Defaults to the default of the format.
+    :param int memory_budget: optional maximum size in bytes of the data kept in memory. The variables which do not fit are backed by memory-mapped files in the output directory. Defaults to None, i.e. everything is kept in memory.
+    :param str partition: optional time partitioning of the output files, *'interval'* for one file per result file or a pandas period alias such as *'M'* for one file per calendar month. Each variable is then saved in a directory. Defaults to None, i.e. one file per variable.
+    :param bool resume: optional parameter to checkpoint the extraction in the output directory, so that if it is interrupted, running it again with resume set only reads the result files which were not read, or which changed, since. The checkpoint is deleted once the outputs are saved. Defaults to False.
+    :param callable profile_hook: optional function called with each timing and memory measurement of the extraction, see :class:`pyreisejl.utility.profiling.Profiler`. The measurements are saved to profile.json next to log.csv in any case. Defaults to None.
+    :param list summaries: optional reducers computing summaries of the variables while the result files are read, see :mod:`pyreisejl.utility.reducers`. Each summary is saved to a file named after the reducer. The averaged congestion is always computed. Defaults to None.
+    :param bool summary_only: optional parameter to only save the summaries, without building the time series of the variables. Defaults to False.
+    :param dict precision: optional precision of some variables, keyed by variable name, see :func:`get_precision`. The precision of each variable is recorded in the metadata of its output file. Defaults to None, i.e. dense variables are saved as float32 and sparse variables as float64 rounded to 1e-6.
     """
 
     if output_dir is None:
         output_dir = os.path.join(input_dir, "output")
 
-    grid_path = copy_input(input_dir, scenario_id)
-
     # Extract outputs, infeasibilities, cost
     mat_results = glob.glob(os.path.join(input_dir, "output", "result_*.mat"))
     mat_results = sorted(mat_results, key=result_num)
 
-    outputs, infeasibilities, cost = extract_data(mat_results)
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_dir = _get_checkpoint_dir(output_dir, scenario_id) if resume else None
+    profiler = Profiler(profile_hook)
+    reducers = [AveragedCongestion(), *(summaries or [])]
+    outputs, infeasibilities, cost = extract_data(
+        mat_results,
+        workers,
+        memory_budget,
+        output_dir,
+        checkpoint_dir,
+        profiler,
+        reducers,
+        not summary_only,
+        precision,
+    )
 
-    # Write log file with costs for each result*.mat file
-    build_log(mat_results, cost, output_dir, scenario_id)
+    _save_outputs(
+        mat_results,
+        outputs,
+        infeasibilities,
+        cost,
+        input_dir,
+        start_date,
+        end_date,
+        scenario_id,
+        output_dir,
+        freq,
+        keep_mat,
+        output_format,
+        compression,
+        memory_budget,
+        partition,
+        profiler,
+        reducers,
+    )
 
-    # Update outputs with date indices from the original grid.pkl
-    _update_outputs_labels(outputs, start_date, end_date, freq, grid_path)
+    if checkpoint_dir is not None:
+        shutil.rmtree(checkpoint_dir)
 
-    pkl_path = _get_pkl_path(output_dir, scenario_id)
 
-    for name, df in outputs.items():
-        df.to_pickle(pkl_path(name))
+def stream_scenario(
+    input_dir,
+    start_date,
+    end_date,
+    n_results,
+    stop,
+    scenario_id=None,
+    output_dir=None,
+    freq="H",
+    keep_mat=True,
+    poll_interval=5,
+    output_format="pickle",
+    compression=None,
+    memory_budget=None,
+    partition=None,
+    resume=False,
+    profile_hook=None,
+    summaries=None,
+    summary_only=False,
+    precision=None,
+):
+    """Extracts data while the simulation is running and save data as pickle (or
+    columnar) files to the output directory once it has finished.
 
-    # Calculate and save averaged congestion
-    calculate_averaged_congestion(outputs["congl"], outputs["congu"]).to_pickle(
-        pkl_path("AVERAGED_CONG")
+    :param str input_dir: tmp/scenario_*
+    :param str start_date: the start date of the simulation run
+    :param str end_date: the end date of the simulation run
+    :param int n_results: number of intervals of the simulation run
+    :param threading.Event/multiprocessing.Event stop: event set once the
+        simulation has finished.
+    :param str scenario_id: optional identifier for the scenario, used to label output files
+    :param str output_dir: optional directory in which to store the outputs
+    :param str freq: the frequency of timestamps in the input profiles as a pandas frequency alias
+    :param bool keep_mat: optional parameter to keep the large result*.mat files after the data has been extracted. Defaults to True.
+    :param float poll_interval: optional time in seconds between two checks for new result files. Defaults to 5.
+    :param str output_format: optional format of the output files, one of *'pickle'*, *'parquet'* or *'feather'*. Defaults to pickle.
+    :param str compression: optional compression codec of the output files, see :func:`pyreisejl.utility.store.write_output`. Defaults to the default of the format.
+    :param int memory_budget: optional maximum size in bytes of the data kept in memory. The variables which do not fit are backed by memory-mapped files in the output directory. Defaults to None, i.e. everything is kept in memory.
+    :param str partition: optional time partitioning of the output files, *'interval'* for one file per result file or a pandas period alias such as *'M'* for one file per calendar month. Each variable is then saved in a directory. Defaults to None, i.e. one file per variable.
+    :param bool resume: optional parameter to checkpoint the extraction in the output directory, so that if it is interrupted, running it again with resume set only reads the result files which were not read, or which changed, since. The checkpoint is deleted once the outputs are saved. Defaults to False.
+    :param callable profile_hook: optional function called with each timing and memory measurement of the extraction, see :class:`pyreisejl.utility.profiling.Profiler`. The measurements are saved to profile.json next to log.csv in any case. Defaults to None.
+    :param list summaries: optional reducers computing summaries of the variables while the result files are read, see :mod:`pyreisejl.utility.reducers`. Each summary is saved to a file named after the reducer. The averaged congestion is always computed. Defaults to None.
+    :param bool summary_only: optional parameter to only save the summaries, without building the time series of the variables. Defaults to False.
+    :param dict precision: optional precision of some variables, keyed by variable name, see :func:`get_precision`. The precision of each variable is recorded in the metadata of its output file. Defaults to None, i.e. dense variables are saved as float32 and sparse variables as float64 rounded to 1e-6.
+    """
+
+    if output_dir is None:
+        output_dir = os.path.join(input_dir, "output")
+
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint_dir = _get_checkpoint_dir(output_dir, scenario_id) if resume else None
+    profiler = Profiler(profile_hook)
+    reducers = [AveragedCongestion(), *(summaries or [])]
+    mat_results, outputs, infeasibilities, cost = stream_data(
+        os.path.join(input_dir, "output"),
+        n_results,
+        stop,
+        poll_interval,
+        memory_budget,
+        output_dir,
+        checkpoint_dir,
+        profiler,
+        reducers,
+        not summary_only,
+        precision,
     )
 
-    if scenario_id:
-        # Record infeasibilities
-        insert_in_file(
-            const.SCENARIO_LIST,
-            scenario_id,
-            "infeasibilities",
-            "_".join(infeasibilities),
+    _save_outputs(
+        mat_results,
+        outputs,
+        infeasibilities,
+        cost,
+        input_dir,
+        start_date,
+        end_date,
+        scenario_id,
+        output_dir,
+        freq,
+        keep_mat,
+        output_format,
+        compression,
+        memory_budget,
+        partition,
+        profiler,
+        reducers,
+    )
+
+    if checkpoint_dir is not None:
+        shutil.rmtree(checkpoint_dir)
+
+
+class StreamExtraction:
+    """Runs :func:`stream_scenario` in a background process, so that the data is
+    extracted while the simulation is running in the current process.
+
+    :param str input_dir: tmp/scenario_*
+    :param str start_date: the start date of the simulation run
+    :param str end_date: the end date of the simulation run
+    :param int n_results: number of intervals of the simulation run
+    :param \\*\\*kwargs: optional arguments passed to :func:`stream_scenario`.
+    """
+
+    def __init__(self, input_dir, start_date, end_date, n_results, **kwargs):
+        """Constructor."""
+        self.stop = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=stream_scenario,
+            args=(input_dir, start_date, end_date, n_results, self.stop),
+            kwargs=kwargs,
         )
 
-        # Update execute and scenario list
-        insert_in_file(const.EXECUTE_LIST, scenario_id, "status", "extracted")
-        insert_in_file(const.SCENARIO_LIST, scenario_id, "state", "analyze")
+    def start(self):
+        """Starts watching the result files."""
+        self.process.start()
 
-    if not keep_mat:
-        print("deleting matfiles")
-        for matfile in mat_results:
-            os.remove(matfile)
+    def finish(self):
+        """Signals that the simulation has finished and waits for the remaining
+        result files to be extracted and the outputs to be saved.
+
+        :raises RuntimeError: if the extraction failed.
+        """
+        self.stop.set()
+        self.process.join()
+        if self.process.exitcode != 0:
+            raise RuntimeError(f"Extraction failed, exit code {self.process.exitcode}")
+
+    def cancel(self):
+        """Stops the extraction without saving any output."""
+        self.process.terminate()
+        self.process.join()
 
 
 if __name__ == "__main__":
@@ -376,4 +1202,13 @@ if __name__ == "__main__":
         args.output_dir,
         args.frequency,
         args.keep_matlab,
+        args.workers,
+        args.output_format,
+        args.compression,
+        args.memory_budget,
+        args.partition,
+        args.resume,
+        summaries=get_summaries(args.summaries),
+        summary_only=args.summary_only,
+        precision=args.precision,
     )
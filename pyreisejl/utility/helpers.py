@@ -1,13 +1,16 @@
+import hashlib
+import json
 import os
 import re
-import shutil
-from collections import OrderedDict
+import time
+from pathlib import Path
 
 import h5py
 import numpy as np
 import pandas as pd
 
 from pyreisejl.utility import const
+from pyreisejl.utility.status import get_status_store
 
 
 class WrongNumberOfArguments(TypeError):
@@ -28,6 +31,12 @@ class InvalidInterval(TypeError):
     pass
 
 
+class StaleSysimage(ValueError):
+    """To be used when a Julia system image was not built for the current manifest."""
+
+    pass
+
+
 def sec2hms(seconds):
     """Converts seconds to hours, minutes, seconds
 
@@ -45,13 +54,70 @@ def sec2hms(seconds):
     return hours, minutes, seconds
 
 
-def load_mat73(filename):
+def load_mat73(filename, paths=None, stats=None, dtypes=None):
     """Load a HDF5 matfile, and convert to a nested dict of numpy arrays.
 
     :param str filename: path to file which will be loaded.
-    :return: (*dict*) -- A possibly nested dictionary of numpy arrays.
+    :param iterable paths: paths of the datasets to read, e.g.
+        'mdo_save/flow/mpc/gen/PG'. If None, the whole file is loaded.
+    :param dict stats: optional dictionary in which the time spent reading the
+        datasets from the file (*'read_time'*), the time spent converting them
+        (*'decode_time'*), in seconds, and the size in bytes of the datasets in the
+        file (*'bytes_read'*) are recorded.
+    :param dict dtypes: optional numpy types in which to read numeric datasets, keyed
+        by path. The values are converted by HDF5 while they are read, so that the
+        values in the original type are never held in a numpy array.
+    :return: (*dict*) -- A possibly nested dictionary of numpy arrays. If ``paths``
+        is given, a flat dictionary of numpy arrays keyed by path, where the paths
+        that are not present in the file are omitted.
     """
 
+    def read(v, dtype=None):
+        """Read a dataset and convert it to numpy indexing.
+
+        :param h5py._hl.dataset.Dataset v: dataset to read.
+        :param numpy.dtype dtype: type in which to read a numeric dataset. None
+            reads it in its own type.
+        :return: (*numpy.ndarray*) -- the data, with at least two dimensions.
+        """
+        tic = time.perf_counter()
+        if v.dtype.kind in {"b", "i", "u", "f"}:
+            # Fast path for plain numeric datasets, bypassing the selection logic
+            # of h5py_hl.dataset.Dataset which dominates for small datasets
+            data = np.empty(v.shape, dtype=v.dtype if dtype is None else dtype)
+            v.id.read(h5py.h5s.ALL, h5py.h5s.ALL, data)
+        else:
+            # Retrieve numpy array from h5py_hl.dataset.Dataset
+            data = v[()]
+        timings["read_time"] += time.perf_counter() - tic
+        timings["bytes_read"] += v.id.get_storage_size()
+        if data.dtype == "object":
+            # Extract values from HDF5 object references
+            original_dims = data.shape
+            data = np.array([f[r][()] for r in data.flat])
+            # For any entry that is a uint16 array object, convert to str
+            data = np.array(
+                [
+                    "".join([str(c[0]) for c in np.char.mod("%c", array)])
+                    if array.dtype == np.uint16
+                    else array
+                    for array in data
+                ]
+            )
+            # If data is all strs, set dtype to object to save a cell array
+            if data.dtype.kind in {"U", "S"}:
+                data = np.array(data, dtype=object)
+            # Un-flatten arrays which had been flattened
+            if len(original_dims) > 1:
+                data = data.reshape(original_dims)
+        if data.ndim >= 2:
+            # Convert multi-dimensional arrays into numpy indexing
+            data = data.swapaxes(-1, -2)
+        else:
+            # Convert single-dimension arrays to N x 1, avoid saving 1 x N
+            data = np.expand_dims(data, axis=1)
+        return data
+
     def convert(path="/"):
         """A recursive walk through the HDF5 structure.
 
@@ -64,49 +130,137 @@ def load_mat73(filename):
             if type(v).__name__ == "Group":
                 output[k] = convert("{path}/{k}".format(path=path, k=k))
                 continue
-            # Retrieve numpy array from h5py_hl.dataset.Dataset
-            data = v[()]
-            if data.dtype == "object":
-                # Extract values from HDF5 object references
-                original_dims = data.shape
-                data = np.array([f[r][()] for r in data.flat])
-                # For any entry that is a uint16 array object, convert to str
-                data = np.array(
-                    [
-                        "".join([str(c[0]) for c in np.char.mod("%c", array)])
-                        if array.dtype == np.uint16
-                        else array
-                        for array in data
-                    ]
-                )
-                # If data is all strs, set dtype to object to save a cell array
-                if data.dtype.kind in {"U", "S"}:
-                    data = np.array(data, dtype=np.object)
-                # Un-flatten arrays which had been flattened
-                if len(original_dims) > 1:
-                    data = data.reshape(original_dims)
-            if data.ndim >= 2:
-                # Convert multi-dimensional arrays into numpy indexing
-                data = data.swapaxes(-1, -2)
-            else:
-                # Convert single-dimension arrays to N x 1, avoid saving 1 x N
-                data = np.expand_dims(data, axis=1)
-            output[k] = data
+            output[k] = read(v)
+        return output
+
+    def select(paths):
+        """Read the requested datasets only.
+
+        :param iterable paths: paths of the datasets to read.
+        :return: (*dict*) -- A flat dictionary of numpy arrays keyed by path.
+        """
+        output = {}
+        for path in paths:
+            # A single link lookup, missing paths are skipped without raising
+            v = f.get(path)
+            if v is not None:
+                output[path] = read(v, dtypes.get(path))
         return output
 
     references = {}
+    dtypes = dtypes or {}
+    timings = {"read_time": 0.0, "bytes_read": 0}
+    tic = time.perf_counter()
     with h5py.File(filename, "r") as f:
-        return convert()
+        output = convert() if paths is None else select(paths)
+    if stats is not None:
+        stats.update(timings)
+        stats["decode_time"] = time.perf_counter() - tic - timings["read_time"]
+    return output
+
+
+_header_size = 512
+
+
+def _write_mat_header(filename):
+    """Writes the header of a MAT v7.3 file in the user block of an HDF5 file.
+
+    :param str filename: path to a file created with a 512 bytes user block.
+    """
+    text = (
+        "MATLAB 7.3 MAT-file, Platform: GLNXA64, "
+        f"Created on: {time.strftime('%a %b %d %H:%M:%S %Y')} HDF5 schema 1.00 ."
+    )
+    header = text.encode().ljust(116) + bytes(8) + b"\x00\x02IM"
+    with open(filename, "r+b") as f:
+        f.write(header.ljust(_header_size, b"\x00"))
+
+
+def _write_struct(group, name, values, compress):
+    """Writes a dictionary of arrays as a MATLAB struct, as MAT.jl does.
+
+    :param h5py.Group group: parent group.
+    :param str name: name of the struct.
+    :param dict values: arrays (element x time) or nested dictionaries keyed by
+        field name.
+    :param bool compress: whether to compress the arrays.
+    :return: (*h5py.Group*) -- the struct.
+    """
+    struct = group.create_group(name)
+    struct.attrs["MATLAB_class"] = np.bytes_("struct")
+    for field, value in values.items():
+        if isinstance(value, dict):
+            _write_struct(struct, field, value, compress)
+            continue
+        # Julia arrays are column-major, so their dimensions are reversed in HDF5
+        data = np.atleast_2d(value).T
+        kwargs = {}
+        if compress and data.size > 1:
+            kwargs = {
+                "compression": "gzip",
+                "compression_opts": 3,
+                "chunks": data.shape,
+            }
+        dataset = struct.create_dataset(field, data=data, **kwargs)
+        dataset.attrs["MATLAB_class"] = np.bytes_("double")
+    return struct
+
+
+def save_mat73(filename, values, compress=True):
+    """Save a nested dict of numpy arrays to a HDF5 matfile, with the layout of the
+    files written by MAT.jl, e.g. the result files written by REISE.jl.
+
+    :param str filename: path to file which will be written.
+    :param dict values: arrays (element x time) or nested dictionaries, saved as
+        structs, keyed by variable name.
+    :param bool compress: whether to compress the arrays, as MAT.jl does in
+        REISE.jl.
+    """
+    with h5py.File(filename, "w", userblock_size=_header_size) as f:
+        for name, value in values.items():
+            _write_struct(f, name, value, compress)
+    _write_mat_header(filename)
+
+
+def _probe_date_limits(profile_csv):
+    """Finds the first and last time stamp and the frequency of a profile csv from
+    its first column only, without parsing the values of the profile.
+
+    :param iterator profile_csv: iterator containing the data of a profile.csv
+    :return: (*tuple*) -- (min timestamp, max timestamp, timestamp frequency) as
+        pandas.Timestamp, None if the time stamps are not sorted and regularly
+        spaced, or cannot be parsed from the first column.
+    """
+    next(profile_csv)  # header
+    timestamps = [line.split(",", 1)[0] for line in profile_csv if line.strip()]
+    if not timestamps or any('"' in t for t in timestamps):
+        return None
+    try:
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps, infer_datetime_format=True))
+    except (ValueError, TypeError):
+        return None
+    freq = pd.infer_freq(index) if len(index) > 2 else None
+    if freq is None or not index.is_monotonic_increasing:
+        return None
+    return index[0], index[-1], freq
 
 
 def extract_date_limits(profile_csv):
     """Parses a profile csv to extract the first and last time stamp
     as well as the time
 
-    :param  iterator: iterator containing the data of a profile.csv
+    Only the first column is parsed if the time stamps are sorted and regularly
+    spaced, the whole file otherwise.
+
+    :param  iterator: iterator containing the data of a profile.csv, seekable to
+        fall back to the whole file.
     :return: (*tuple*) -- (min timestamp, max timestamp, timestamp frequency) as pandas.Timestamp
     """
+    limits = _probe_date_limits(profile_csv)
+    if limits is not None:
+        return limits
 
+    profile_csv.seek(0)
     profile = pd.read_csv(profile_csv, index_col=0, parse_dates=True)
     min_ts = profile.index.min()
     max_ts = profile.index.max()
@@ -168,12 +322,12 @@ def get_scenario(scenario_id):
 
     :param int/str scenario_id: scenario index.
     :return: (*tuple*) -- scenario start_date, end_date, interval, input_dir
+    :raises KeyError: if the scenario is not in the scenario list.
     """
     # Parses scenario info out of scenario list
-    scenario_list = pd.read_csv(const.SCENARIO_LIST, dtype=str)
-    scenario_list.fillna("", inplace=True)
-    scenario = scenario_list[scenario_list.id == str(scenario_id)]
-    scenario_info = scenario.to_dict("records", into=OrderedDict)[0]
+    scenario_info = get_status_store().get(const.SCENARIO_LIST, scenario_id)
+    if scenario_info is None:
+        raise KeyError(f"Scenario {scenario_id} is not in the scenario list")
 
     # Determine input directory for data
     input_dir = os.path.join(const.EXECUTE_DIR, f"scenario_{scenario_id}")
@@ -189,19 +343,17 @@ def get_scenario(scenario_id):
 
 
 def insert_in_file(filename, scenario_id, column_name, column_value):
-    """Updates status in execute list on server.
+    """Updates status in execute list on server, in the store selected by the
+    STATUS_BACKEND environment variable, see :mod:`pyreisejl.utility.status`.
+    Updates are locked, so that several processes, e.g. extractions running in
+    parallel, can update the lists at the same time.
 
     :param str filename: path to execute or scenario list.
     :param int/str scenario_id: scenario index.
     :param str column_name: name of column to modify.
     :param str column_value: value to insert.
     """
-    _ = shutil.copyfile(filename, filename + ".bak")
-
-    table = pd.read_csv(filename, dtype=str)
-    table.set_index("id", inplace=True)
-    table.loc[str(scenario_id), column_name] = column_value
-    table.to_csv(filename)
+    get_status_store().update(filename, scenario_id, column_name, column_value)
 
 
 def get_scenario_status(scenario_id):
@@ -211,10 +363,85 @@ def get_scenario_status(scenario_id):
     :return: (*str*) -- the status, e.g. running, finished, etc, or None
     """
     try:
-        table = pd.read_csv(const.EXECUTE_LIST, index_col="id")
-        return table.loc[scenario_id, "status"]
+        row = get_status_store().get(const.EXECUTE_LIST, scenario_id)
+        return None if row is None else row["status"]
     except KeyError:
         return None
     except Exception as ex:
         print("Failed to read execute list. It's likely the file does not exist.")
         print(f"Exception message: {ex}")
+
+
+def get_project_dir(julia_env=None):
+    """Gets the directory of the Julia project in which REISE.jl runs.
+
+    :param str julia_env: path to the julia environment. None uses the
+        JULIA_PROJECT environment variable if set, the REISE.jl repository otherwise.
+    :return: (*str*) -- path to the directory containing Project.toml.
+    """
+    if julia_env is not None:
+        return julia_env
+    if os.getenv("JULIA_PROJECT"):
+        return os.getenv("JULIA_PROJECT")
+    return str(Path(__file__).parent.parent.parent.absolute())
+
+
+def manifest_hash(project_dir):
+    """Hashes the Project.toml and Manifest.toml files of a Julia project, which
+    determine the versions of the packages compiled in a system image.
+
+    :param str project_dir: directory of the project.
+    :return: (*str*) -- SHA-256 hash of the files.
+    :raises FileNotFoundError: if there is no Project.toml file in the directory.
+    """
+    digest = hashlib.sha256()
+    for name in ["Project.toml", "Manifest.toml"]:
+        filename = os.path.join(project_dir, name)
+        if name == "Manifest.toml" and not os.path.exists(filename):
+            continue
+        with open(filename, "rb") as f:
+            digest.update(name.encode() + b"\0" + f.read() + b"\0")
+    return digest.hexdigest()
+
+
+def sysimage_metadata(sysimage):
+    """Gets the path of the file recording how a system image was built.
+
+    :param str sysimage: path to the system image.
+    :return: (*str*) -- path to the JSON file next to the system image.
+    """
+    return sysimage + ".json"
+
+
+def check_sysimage(sysimage, julia_env=None):
+    """Checks that a system image was built for the current manifest of the
+    project, so that a stale image, whose packages differ from the installed ones,
+    is never used.
+
+    :param str sysimage: path to the system image.
+    :param str julia_env: path to the julia environment, see
+        :func:`get_project_dir`.
+    :return: (*dict*) -- how the system image was built, see
+        :func:`pyreisejl.utility.sysimage.build_sysimage`.
+    :raises FileNotFoundError: if the system image does not exist.
+    :raises StaleSysimage: if the system image was not built for the current
+        manifest, or there is no record of how it was built.
+    """
+    if not os.path.exists(sysimage):
+        raise FileNotFoundError(f"System image {sysimage} not found")
+    try:
+        with open(sysimage_metadata(sysimage)) as f:
+            metadata = json.load(f)
+    except (FileNotFoundError, ValueError):
+        raise StaleSysimage(
+            f"No record of the manifest for which {sysimage} was built, "
+            "build it again with sysimage.py"
+        )
+    project_dir = get_project_dir(julia_env)
+    current = manifest_hash(project_dir)
+    if metadata.get("manifest_hash") != current:
+        raise StaleSysimage(
+            f"{sysimage} was built for another manifest than the one of "
+            f"{project_dir}, build it again with sysimage.py"
+        )
+    return metadata
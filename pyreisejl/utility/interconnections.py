@@ -0,0 +1,336 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from pyreisejl.utility.helpers import load_mat73, save_mat73
+
+schedule_name = "dcline_schedule.csv"
+report_name = "interconnections.json"
+
+# Result variables merged from the groups: struct, field and the kind of element of
+# their rows, *line* being the AC branches followed by the DC lines
+merged_variables = [
+    ("bus", "LAM_P", "bus"),
+    ("gen", "PG", "plant"),
+    ("branch", "PF", "branch"),
+    ("branch", "MU_SF", "branch"),
+    ("branch", "MU_ST", "branch"),
+    ("dcline", "PF_dcline", "dcline"),
+    ("storage", "PG", "storage"),
+    ("storage", "Energy", "storage"),
+    ("load_shed", "load_shed", "bus"),
+    ("trans_viol", "trans_viol", "line"),
+]
+
+
+def _columns_by_id(profile):
+    """Maps the ids of the elements of a profile to its columns.
+
+    :param pandas.DataFrame profile: profile, whose first column holds the time
+        stamps and whose other columns are named after element ids.
+    :return: (*dict*) -- column names keyed by integer id.
+    """
+    return {int(float(c)): c for c in profile.columns[1:]}
+
+
+def find_components(bus, branch, dcline=None, fixed=()):
+    """Finds the electrically independent parts of a grid: the connected components
+    of its AC network, joined by the DC lines whose flow is not fixed.
+
+    :param pandas.DataFrame bus: bus table.
+    :param pandas.DataFrame branch: AC branch table.
+    :param pandas.DataFrame dcline: DC line table. None if there are no DC lines.
+    :param iterable fixed: ids of the DC lines whose flow follows a fixed schedule,
+        which do not join the components of their buses.
+    :return: (*numpy.ndarray*) -- component of each bus, in the order of the bus
+        table, numbered from 0.
+    :raises ValueError: if a line is connected to an unknown bus.
+    """
+    lines = [branch[["from_bus_id", "to_bus_id"]]]
+    if dcline is not None:
+        coupling = dcline.loc[~dcline["dcline_id"].isin(list(fixed))]
+        lines.append(coupling[["from_bus_id", "to_bus_id"]])
+    lines = pd.concat(lines)
+    index = pd.Index(bus["bus_id"])
+    rows = index.get_indexer(lines["from_bus_id"])
+    cols = index.get_indexer(lines["to_bus_id"])
+    if (rows < 0).any() or (cols < 0).any():
+        raise ValueError("Some lines are connected to buses missing from bus.csv")
+    graph = coo_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(index), len(index))
+    )
+    _, labels = connected_components(graph, directed=False)
+    return labels
+
+
+def group_components(labels, n_groups):
+    """Groups the components of a grid into sets of similar numbers of buses, so
+    that each set is solved by a process. Components are assigned from the largest
+    to the set with the fewest buses.
+
+    :param numpy.ndarray labels: component of each bus, see
+        :func:`find_components`.
+    :param int n_groups: maximum number of sets.
+    :return: (*numpy.ndarray*) -- set of each bus, numbered from 0.
+    """
+    sizes = np.bincount(labels)
+    loads = np.zeros(min(n_groups, len(sizes)), dtype=int)
+    group_of = np.empty(len(sizes), dtype=int)
+    for c in np.argsort(-sizes, kind="stable"):
+        g = int(np.argmin(loads))
+        group_of[c] = g
+        loads[g] += sizes[c]
+    return group_of[labels]
+
+
+def read_dcline_schedule(input_dir, dcline, n_hours):
+    """Reads the fixed schedules of the DC lines: the flows given in
+    *dcline_schedule.csv*, with the layout of a profile whose columns are DC line
+    ids, and the flows of the DC lines whose minimum and maximum are equal.
+
+    :param str input_dir: directory with input data.
+    :param pandas.DataFrame dcline: DC line table.
+    :param int n_hours: number of hours of the profiles.
+    :return: (*dict*) -- flow of each DC line with a fixed schedule, from its from
+        bus to its to bus, for each hour, keyed by DC line id.
+    :raises ValueError: if the schedule does not cover the profiles, or a flow is
+        out of the limits of its DC line.
+    """
+    limits = dcline.set_index("dcline_id")[["Pmin", "Pmax"]]
+    schedule = {
+        i: np.full(n_hours, pmin)
+        for i, (pmin, pmax) in limits.iterrows()
+        if pmin == pmax
+    }
+    filename = os.path.join(input_dir, schedule_name)
+    if os.path.exists(filename):
+        profile = pd.read_csv(filename)
+        if len(profile) != n_hours:
+            raise ValueError(f"{schedule_name} does not have {n_hours} hours")
+        for i, column in _columns_by_id(profile).items():
+            schedule[i] = profile[column].to_numpy(dtype=float)
+    for i, flow in schedule.items():
+        if i not in limits.index:
+            raise ValueError(f"DC line {i} of {schedule_name} not found")
+        pmin, pmax = limits.loc[i]
+        if (flow < pmin - 1e-6).any() or (flow > pmax + 1e-6).any():
+            raise ValueError(f"Schedule of DC line {i} out of its limits")
+    return schedule
+
+
+def split_case(input_dir, output_dir, n_groups):
+    """Splits the input data of a scenario into the input data of sets of
+    electrically independent parts of its grid, see :func:`find_components` and
+    :func:`group_components`, which are solved separately.
+
+    The DC lines joining two sets follow their fixed schedule: in each set, the bus
+    at their other end is replaced by a bus of its own zone, whose demand is the
+    flow of the line. The demand of a zone spread over several sets is split between
+    them in proportion to the load of its buses, so that each bus gets the same
+    demand as in the whole grid.
+
+    :param str input_dir: directory with input data.
+    :param str output_dir: directory in which the input data of each set is written,
+        in a *group_{k}* folder.
+    :param int n_groups: maximum number of sets.
+    :return: (*dict*) -- number of elements of each kind in the grid (*'sizes'*),
+        and for each set (*'groups'*): its input directory, the positions in the
+        tables of the grid of its buses, plants, AC branches, DC lines and storage
+        units, its number of components and the ids of its DC lines following a
+        fixed schedule.
+    :raises ValueError: if the scenario has demand flexibility, which is not
+        supported, or the schedule of a DC line is invalid.
+    """
+    if any(f.startswith("demand_flexibility") for f in os.listdir(input_dir)):
+        raise ValueError("Demand flexibility is not supported by interconnections")
+
+    def read(name):
+        return pd.read_csv(os.path.join(input_dir, f"{name}.csv"))
+
+    bus, branch, dcline, plant = [read(n) for n in ["bus", "branch", "dcline", "plant"]]
+    gencost = {name: read(name) for name in ["gencost_before", "gencost_after"]}
+    storage = {}
+    if os.path.exists(os.path.join(input_dir, "storage_gen.csv")):
+        storage = {name: read(name) for name in ["storage_gen", "StorageData"]}
+    with open(os.path.join(input_dir, "plant_immutables.json")) as f:
+        profile_names = list(json.load(f)["group_profile_resources"])
+    demand = read("demand")
+
+    schedule = read_dcline_schedule(input_dir, dcline, len(demand))
+    labels = find_components(bus, branch, dcline, fixed=schedule)
+    group = group_components(labels, n_groups)
+    bus_group = pd.Series(group, index=bus["bus_id"])
+    from_group = bus_group[dcline["from_bus_id"]].to_numpy()
+    to_group = bus_group[dcline["to_bus_id"]].to_numpy()
+    zone_load = bus.groupby("zone_id")["Pd"].sum()
+    zone_columns = _columns_by_id(demand)
+
+    plan = {
+        "sizes": {
+            "bus": len(bus),
+            "plant": len(plant),
+            "branch": len(branch),
+            "dcline": len(dcline),
+            "storage": len(storage["storage_gen"]) if storage else 0,
+        },
+        "groups": [],
+    }
+    next_bus, next_zone = bus["bus_id"].max() + 1, bus["zone_id"].max() + 1
+    for g in range(group.max() + 1):
+        group_dir = os.path.join(output_dir, f"group_{g}")
+        os.makedirs(group_dir, exist_ok=True)
+
+        def save(name, df):
+            df.to_csv(os.path.join(group_dir, f"{name}.csv"), index=False)
+
+        positions = {
+            "bus": np.flatnonzero(group == g),
+            "plant": np.flatnonzero(plant["bus_id"].map(bus_group) == g),
+            "branch": np.flatnonzero(bus_group[branch["from_bus_id"]] == g),
+            "dcline": np.flatnonzero((from_group == g) | (to_group == g)),
+        }
+        if storage:
+            storage_gen = storage["storage_gen"]
+            positions["storage"] = np.flatnonzero(
+                storage_gen["bus_id"].map(bus_group) == g
+            )
+            for name, table in storage.items():
+                save(name, table.iloc[positions["storage"]])
+
+        group_bus = bus.iloc[positions["bus"]]
+        group_dcline = dcline.iloc[positions["dcline"]].copy()
+        zones = sorted(group_bus["zone_id"].unique())
+        group_load = group_bus.groupby("zone_id")["Pd"].sum()
+        group_demand = demand[[demand.columns[0]]].copy()
+        for z in zones:
+            share = 1 if zone_load[z] == 0 else group_load[z] / zone_load[z]
+            group_demand[zone_columns[z]] = demand[zone_columns[z]] * share
+
+        # DC lines joining sets are cut at their bus in the other set
+        fixed, dummy_buses = [], []
+        for j in positions["dcline"]:
+            if from_group[j] == to_group[j]:
+                continue
+            line = dcline.iloc[j]
+            flow = schedule[line["dcline_id"]]
+            end, near, withdrawal = "to_bus_id", "from_bus_id", flow
+            if to_group[j] == g:
+                end, near, withdrawal = "from_bus_id", "to_bus_id", -flow
+            dummy = bus.loc[bus["bus_id"] == line[near]].copy()
+            dummy["bus_id"], dummy["zone_id"] = next_bus, next_zone
+            # A negative load keeps the bus out of the load buses, whose demand may
+            # be shed, while its zone demand is all allocated to it
+            dummy["Pd"] = -1.0
+            dummy_buses.append(dummy)
+            group_dcline.loc[line.name, end] = next_bus
+            group_demand[str(next_zone)] = withdrawal
+            fixed.append(line["dcline_id"])
+            next_bus, next_zone = next_bus + 1, next_zone + 1
+
+        save("bus", pd.concat([group_bus, *dummy_buses]))
+        save("branch", branch.iloc[positions["branch"]])
+        save("dcline", group_dcline)
+        save("plant", plant.iloc[positions["plant"]])
+        for name, table in gencost.items():
+            save(name, table.iloc[positions["plant"]])
+        save("demand", group_demand)
+        plant_ids = set(plant["plant_id"].iloc[positions["plant"]])
+        for name in profile_names:
+            profile = read(name)
+            columns = [c for i, c in _columns_by_id(profile).items() if i in plant_ids]
+            save(name, profile[[profile.columns[0], *columns]])
+        shutil.copy(os.path.join(input_dir, "plant_immutables.json"), group_dir)
+
+        plan["groups"].append(
+            {
+                "dir": group_dir,
+                **{kind: p.tolist() for kind, p in positions.items()},
+                "components": len(np.unique(labels[positions["bus"]])),
+                "fixed_dclines": [int(i) for i in fixed],
+            }
+        )
+    return plan
+
+
+def merge_result(plan, outputs):
+    """Merges the results of an interval solved separately for each set of the
+    grid into the results of the whole grid.
+
+    :param dict plan: the split of the grid, see :func:`split_case`.
+    :param list outputs: *mdo_save* struct of the result file of each set, see
+        :func:`pyreisejl.utility.helpers.load_mat73`.
+    :return: (*dict*) -- *mdo_save* struct of the result file of the whole grid,
+        whose cost is the sum of the costs of the sets.
+    """
+    sizes = {**plan["sizes"], "line": plan["sizes"]["branch"] + plan["sizes"]["dcline"]}
+    n_hour = outputs[0]["flow"]["mpc"]["gen"]["PG"].shape[1]
+    mpc = {}
+    for struct, field, kind in merged_variables:
+        values = [o["flow"]["mpc"].get(struct, {}).get(field) for o in outputs]
+        if all(v is None for v in values):
+            continue
+        merged = np.zeros((sizes[kind], n_hour))
+        for group, value in zip(plan["groups"], values):
+            if kind == "line":
+                rows = group["branch"] + [sizes["branch"] + j for j in group["dcline"]]
+            else:
+                rows = group.get(kind, [])
+            if value is not None and rows:
+                # Buses added at the end of the DC lines joining sets are dropped
+                merged[rows] = value[: len(rows)]
+        mpc.setdefault(struct, {})[field] = merged
+    return {
+        "results": {"f": sum(float(o["results"]["f"].sum()) for o in outputs)},
+        "demand_scaling": min(float(o["demand_scaling"].min()) for o in outputs),
+        "flow": {"mpc": mpc},
+    }
+
+
+def merge_results(plan, execute_dirs, execute_dir, n_interval):
+    """Merges the result files of the sets of the grid into the result files of the
+    whole grid.
+
+    :param dict plan: the split of the grid, see :func:`split_case`.
+    :param list execute_dirs: output folder of each set.
+    :param str execute_dir: output folder of the simulation.
+    :param int n_interval: number of intervals of the simulation.
+    :raises FileNotFoundError: if a result file of a set is missing.
+    """
+    for i in range(n_interval):
+        outputs = [
+            load_mat73(os.path.join(d, f"result_{i}.mat"))["mdo_save"]
+            for d in execute_dirs
+        ]
+        save_mat73(
+            os.path.join(execute_dir, f"result_{i}.mat"),
+            {"mdo_save": merge_result(plan, outputs)},
+        )
+
+
+def write_summary(execute_dir, plan):
+    """Records how the grid was split in *interconnections.json*.
+
+    :param str execute_dir: output folder of the simulation.
+    :param dict plan: the split of the grid, see :func:`split_case`.
+    :return: (*list*) -- number of components, buses, plants and AC branches, and
+        ids of the DC lines following a fixed schedule, of each set.
+    """
+    summary = [
+        {
+            "components": group["components"],
+            **{
+                kind: len(group.get(kind, []))
+                for kind in ["bus", "plant", "branch", "dcline", "storage"]
+            },
+            "fixed_dclines": group["fixed_dclines"],
+        }
+        for group in plan["groups"]
+    ]
+    with open(os.path.join(execute_dir, report_name), "w") as f:
+        json.dump(summary, f, indent=4)
+    return summary
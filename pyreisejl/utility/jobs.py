@@ -0,0 +1,198 @@
+import json
+import os
+import sys
+import time
+import uuid
+
+
+class JobQueue:
+    """Queue of scenario launches run by the warm workers of
+    :mod:`pyreisejl.utility.worker`, stored in a local directory.
+
+    A job is a JSON file holding the command line arguments of call.py. It is
+    written to the *pending* folder, moved to the *running* folder by the worker
+    which claims it, the move being atomic so that each job is run once, and its
+    result is written to the *done* folder. The output of the job is written to a
+    log file in the *logs* folder while it runs.
+
+    :param str path: directory of the queue, created if need be.
+    """
+
+    folders = ["pending", "running", "done", "logs"]
+
+    def __init__(self, path):
+        """Constructor."""
+        self.path = path
+        for folder in self.folders:
+            os.makedirs(os.path.join(path, folder), exist_ok=True)
+
+    def _file(self, folder, job_id, extension=".json"):
+        """Gets the path of a file of a job.
+
+        :param str folder: one of *folders*.
+        :param str job_id: job id.
+        :param str extension: extension of the file.
+        :return: (*str*) -- path to the file.
+        """
+        return os.path.join(self.path, folder, job_id + extension)
+
+    def _write(self, folder, job_id, content):
+        """Writes a file of a job atomically.
+
+        :param str folder: one of *folders*.
+        :param str job_id: job id.
+        :param dict content: content of the file.
+        """
+        filename = self._file(folder, job_id)
+        with open(filename + ".tmp", "w") as f:
+            json.dump(content, f, indent=4)
+        os.replace(filename + ".tmp", filename)
+
+    def log_file(self, job_id):
+        """Gets the path of the log file of a job.
+
+        :param str job_id: job id.
+        :return: (*str*) -- path to the log file.
+        """
+        return self._file("logs", job_id, ".log")
+
+    def submit(self, argv):
+        """Adds a job to the queue.
+
+        :param list argv: command line arguments of call.py.
+        :return: (*str*) -- job id. Jobs are claimed in the order of their ids.
+        """
+        job_id = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}"
+        job = {"id": job_id, "argv": [str(a) for a in argv], "submitted": time.time()}
+        # Written outside of the pending folder first, so that it is never claimed
+        # before it is complete
+        self._write("logs", job_id, job)
+        os.replace(self._file("logs", job_id), self._file("pending", job_id))
+        return job_id
+
+    def claim(self, worker):
+        """Claims the oldest pending job.
+
+        :param int worker: process id of the worker claiming the job.
+        :return: (*dict*) -- the job, None if there are no pending jobs.
+        """
+        pending = sorted(os.listdir(os.path.join(self.path, "pending")))
+        for name in pending:
+            job_id, extension = os.path.splitext(name)
+            if extension != ".json":
+                continue
+            try:
+                os.rename(self._file("pending", job_id), self._file("running", job_id))
+            except FileNotFoundError:
+                # Claimed by another worker
+                continue
+            with open(self._file("running", job_id)) as f:
+                job = json.load(f)
+            job["worker"] = worker
+            job["start"] = time.time()
+            self._write("running", job_id, job)
+            return job
+        return None
+
+    def finish(self, job, **result):
+        """Records the result of a job claimed by a worker.
+
+        :param dict job: the job, as returned by :meth:`claim`.
+        :param \\*\\*result: result of the job, e.g. its status.
+        """
+        self._write("done", job["id"], {**job, **result, "end": time.time()})
+        os.remove(self._file("running", job["id"]))
+
+    def result(self, job_id):
+        """Gets the result of a job.
+
+        :param str job_id: job id.
+        :return: (*dict*) -- the job and its result, None if it has not finished.
+        """
+        try:
+            with open(self._file("done", job_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def wait(self, job_id, stream=None, poll_interval=1, timeout=None):
+        """Waits for a job to finish, copying its output as it is written.
+
+        :param str job_id: job id.
+        :param io.TextIOBase stream: stream to which the output of the job is
+            copied. None uses the standard output.
+        :param float poll_interval: time in seconds between checks.
+        :param float timeout: maximum time in seconds to wait. None waits until the
+            job finishes.
+        :return: (*dict*) -- the job and its result.
+        :raises TimeoutError: if the job has not finished before the timeout.
+        """
+        stream = sys.stdout if stream is None else stream
+        deadline = None if timeout is None else time.time() + timeout
+        position = 0
+        while True:
+            # The result is checked before the log is read, so that all the output
+            # is copied once the job has finished
+            result = self.result(job_id)
+            try:
+                with open(self.log_file(job_id), errors="replace") as f:
+                    f.seek(position)
+                    output = f.read()
+                    position = f.tell()
+            except FileNotFoundError:
+                output = ""
+            if output:
+                stream.write(output)
+                stream.flush()
+            if result is not None:
+                return result
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError(f"Job {job_id} has not finished")
+            time.sleep(poll_interval)
+
+    def requeue_orphans(self):
+        """Moves the running jobs whose worker is no longer alive back to the
+        pending folder, e.g. after a worker was killed.
+
+        :return: (*list*) -- ids of the jobs put back in the queue.
+        """
+        requeued = []
+        for name in sorted(os.listdir(os.path.join(self.path, "running"))):
+            job_id, extension = os.path.splitext(name)
+            if extension != ".json":
+                continue
+            try:
+                with open(self._file("running", job_id)) as f:
+                    job = json.load(f)
+            except (FileNotFoundError, ValueError):
+                continue
+            # Jobs being claimed do not have a worker yet
+            if "worker" not in job or _is_alive(job["worker"]):
+                continue
+            # Moved aside first, so that the job is requeued by a single worker
+            claimed = self._file("running", job_id, f".{os.getpid()}.requeue")
+            try:
+                os.rename(self._file("running", job_id), claimed)
+            except FileNotFoundError:
+                continue
+            job.pop("worker")
+            job.pop("start", None)
+            self._write("pending", job_id, job)
+            os.remove(claimed)
+            requeued.append(job_id)
+        return requeued
+
+
+def _is_alive(pid):
+    """Checks whether a process is running on this host.
+
+    :param int pid: process id.
+    :return: (*bool*) -- whether the process exists.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
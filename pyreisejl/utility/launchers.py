@@ -1,22 +1,44 @@
+import copy
+import glob
 import importlib
+import multiprocessing
 import os
+import shutil
 from time import time
 
 import pandas as pd
 from julia.api import LibJulia
 
+from pyreisejl.utility.decomposition import (
+    compare_to_reference,
+    print_report,
+    result_deviation,
+    split_intervals,
+    stitch_chunk,
+    write_report,
+)
 from pyreisejl.utility.helpers import (
     InvalidDateArgument,
     InvalidInterval,
+    check_sysimage,
     extract_date_limits,
     sec2hms,
     validate_time_format,
     validate_time_range,
 )
+from pyreisejl.utility.interconnections import (
+    merge_results,
+    split_case,
+    write_summary,
+)
+
+# Command line options with which Julia was initialized in this process
+_julia_options = None
 
 
 class Launcher:
-    """Parent class for solver-specific scenario launchers.
+    """Parent class for solver-specific scenario launchers, whose *package* is the
+    Julia package of their solver.
 
     :param str start_date: start date of simulation as 'YYYY-MM-DD HH:MM:SS',
         where HH, MM, and SS are optional.
@@ -28,6 +50,19 @@ class Launcher:
         decide.
     :param dict solver_kwargs: keyword arguments to pass to solver (if any).
     :param str julia_env: path to the julia environment to be used to run simulation.
+    :param str sysimage: path to a system image built by
+        :func:`pyreisejl.utility.sysimage.build_sysimage` with which to start Julia.
+        None starts Julia with its default image.
+    :param int chunks: number of chunks of contiguous intervals solved in
+        parallel, each one in its own Julia process, see :meth:`launch_chunks`.
+        None solves all the intervals in sequence in this process.
+    :param int warmup: number of warm-up intervals of each chunk but the first.
+    :param str reference_dir: output folder of a sequential run of the simulation,
+        to which the results of the chunks are compared. None only compares the
+        warm-up intervals to the previous chunk.
+    :param int interconnections: number of processes across which the electrically
+        independent parts of the grid are solved, see
+        :meth:`launch_interconnections`. None solves the whole grid in this process.
     :raises InvalidDateArgument: if start_date is posterior to end_date
     :raises InvalidInterval: if the interval doesn't evently divide the given date range
     """
@@ -41,6 +76,11 @@ class Launcher:
         threads=None,
         solver_kwargs=None,
         julia_env=None,
+        sysimage=None,
+        chunks=None,
+        warmup=1,
+        reference_dir=None,
+        interconnections=None,
     ):
         """Constructor."""
         # extract time limits from 'demand.csv'
@@ -80,6 +120,11 @@ class Launcher:
         self.threads = threads
         self.solver_kwargs = solver_kwargs
         self.julia_env = julia_env
+        self.sysimage = sysimage
+        self.chunks = chunks
+        self.warmup = warmup
+        self.reference_dir = reference_dir
+        self.interconnections = interconnections
         self.execute_dir = os.path.join(self.input_dir, "output")
 
     def _print_settings(self):
@@ -92,6 +137,9 @@ class Launcher:
                 "input_dir": self.input_dir,
                 "threads": self.threads,
                 "julia_env": self.julia_env,
+                "sysimage": self.sysimage,
+                "chunks": self.chunks,
+                "interconnections": self.interconnections,
                 "solver_kwargs": self.solver_kwargs,
             }
         )
@@ -101,12 +149,21 @@ class Launcher:
 
         :param list imports: julia packages to import.
         :return: (*tuple*) -- imported names.
+        :raises ValueError: if Julia was already initialized in another environment.
+        :raises pyreisejl.utility.helpers.StaleSysimage: if the system image was
+            not built for the current manifest of the environment.
         """
-        api = LibJulia.load()
-        julia_command_line_options = ["--compiled-modules=no"]
-        if self.julia_env is not None:
-            julia_command_line_options += [f"--project={self.julia_env}"]
-        api.init_julia(julia_command_line_options)
+        # Julia is initialized once per process, warm workers running several
+        # scenarios reuse it, see pyreisejl.utility.worker
+        init_julia_session(self.julia_env, self.sysimage)
+
+        # REISE.jl reads the Arrow input files written by the converter only once
+        # Arrow.jl is loaded, and falls back to the CSV files otherwise
+        if glob.glob(os.path.join(self.input_dir, "*.arrow")):
+            try:
+                importlib.import_module("julia.Arrow")
+            except ImportError:
+                print("Arrow.jl is not installed, reading the CSV input files")
 
         return tuple([importlib.import_module(f"julia.{i}") for i in imports])
 
@@ -120,8 +177,159 @@ class Launcher:
         # This should be defined in sub-classes
         raise NotImplementedError
 
+    def launch(self):
+        """Launches the scenario, in chunks or interconnections solved in parallel
+        if requested.
+
+        :return: (*int*) runtime of scenario in seconds
+        :raises ValueError: if both chunks and interconnections are requested.
+        """
+        chunks = self.chunks is not None and self.chunks > 1
+        interconnections = self.interconnections is not None
+        if chunks and interconnections:
+            raise ValueError("Chunks and interconnections cannot be combined")
+        if chunks:
+            return self.launch_chunks()
+        if interconnections:
+            return self.launch_interconnections()
+        return self.launch_scenario()
+
+    def _start_parts(self, parts):
+        """Starts solving parts of the scenario, each one in its own Julia process.
+
+        :param list parts: attributes of the launcher of each part, e.g. its
+            execute directory.
+        :return: (*list*) -- process of each part.
+        """
+        # Julia cannot be forked once initialized, e.g. in a warm worker
+        context = multiprocessing.get_context("spawn")
+        processes = []
+        for attributes in parts:
+            launcher = copy.copy(self)
+            launcher.chunks = None
+            launcher.interconnections = None
+            for name, value in attributes.items():
+                setattr(launcher, name, value)
+            process = context.Process(target=_launch_part, args=(launcher,))
+            process.start()
+            processes.append(process)
+        return processes
+
+    def launch_chunks(self):
+        """Launches the scenario in chunks of contiguous intervals, see
+        :func:`pyreisejl.utility.decomposition.split_intervals`, each one solved in
+        its own Julia process, and stitches their results into the result files of
+        a sequential run.
+
+        The initial conditions of the first interval kept from each chunk are only
+        approximated by its warm-up intervals, so a report of the deviation at the
+        boundaries between chunks is written to *decomposition.json* in the execute
+        directory: the deviation of the last warm-up interval of each chunk from
+        the same interval solved by the previous chunk and, if a reference run is
+        given, the deviation of the first interval kept from each chunk from the
+        reference.
+
+        :return: (*int*) runtime of scenario in seconds
+        :raises RuntimeError: if a chunk failed.
+        """
+        chunks = split_intervals(
+            self.n_interval, min(self.chunks, self.n_interval), self.warmup
+        )
+        print(f"Launching scenario in {len(chunks)} chunks: {chunks}")
+        os.makedirs(self.execute_dir, exist_ok=True)
+
+        start = time()
+        chunk_dirs = [
+            os.path.join(self.execute_dir, f"chunk_{k}") for k in range(len(chunks))
+        ]
+        processes = self._start_parts(
+            {
+                "start_index": self.start_index + first * self.interval,
+                "n_interval": stop - first,
+                "execute_dir": chunk_dir,
+            }
+            for (first, _, stop), chunk_dir in zip(chunks, chunk_dirs)
+        )
+
+        report = {"warmup": self.warmup, "chunks": chunks, "boundaries": []}
+        try:
+            # Chunks are stitched in order, so that the warm-up intervals of a chunk
+            # are compared to the results of the previous one
+            for k, (process, chunk_dir, (first, begin, stop)) in enumerate(
+                zip(processes, chunk_dirs, chunks)
+            ):
+                process.join()
+                if process.exitcode != 0:
+                    raise RuntimeError(f"Chunk {k} failed, see {chunk_dir}")
+                if k > 0:
+                    overlap = None
+                    if begin > first:
+                        overlap = result_deviation(
+                            os.path.join(chunk_dir, f"result_{begin - 1 - first}.mat"),
+                            os.path.join(self.execute_dir, f"result_{begin - 1}.mat"),
+                        )
+                    report["boundaries"].append({"interval": begin, "overlap": overlap})
+                stitch_chunk(chunk_dir, self.execute_dir, first, begin, stop)
+                _move_logs(chunk_dir, self.execute_dir, k)
+                shutil.rmtree(chunk_dir)
+        finally:
+            _stop(processes)
+        end = time()
+
+        write_report(self.execute_dir, report)
+        if self.reference_dir is not None:
+            report = compare_to_reference(self.execute_dir, self.reference_dir)
+        print_report(report)
+
+        return self.parse_runtime(start, end)
+
+    def launch_interconnections(self):
+        """Launches the scenario in sets of electrically independent parts of the
+        grid, see :func:`pyreisejl.utility.interconnections.split_case`, each one
+        solved in its own Julia process, and merges their results into the result
+        files of the whole grid. How the grid was split is recorded in
+        *interconnections.json* in the execute directory.
+
+        :return: (*int*) runtime of scenario in seconds
+        :raises RuntimeError: if the simulation of a set failed.
+        """
+        start = time()
+        split_dir = os.path.join(self.execute_dir, "interconnections")
+        plan = split_case(self.input_dir, split_dir, self.interconnections)
+        groups = plan["groups"]
+        if len(groups) == 1:
+            print("The grid cannot be split, launching scenario in sequence")
+            shutil.rmtree(split_dir)
+            return self.launch_scenario()
+
+        print(f"Launching scenario in {len(groups)} sets of interconnections")
+        group_dirs = [os.path.join(group["dir"], "output") for group in groups]
+        processes = self._start_parts(
+            {"input_dir": group["dir"], "execute_dir": group_dir}
+            for group, group_dir in zip(groups, group_dirs)
+        )
+        try:
+            for k, (process, group_dir) in enumerate(zip(processes, group_dirs)):
+                process.join()
+                if process.exitcode != 0:
+                    raise RuntimeError(f"Set {k} failed, see {group_dir}")
+        finally:
+            _stop(processes)
+
+        merge_results(plan, group_dirs, self.execute_dir, self.n_interval)
+        for k, group_dir in enumerate(group_dirs):
+            _move_logs(group_dir, self.execute_dir, k)
+        for k, group in enumerate(write_summary(self.execute_dir, plan)):
+            print(f"Set {k}: {group}")
+        shutil.rmtree(split_dir)
+        end = time()
+
+        return self.parse_runtime(start, end)
+
 
 class ClpLauncher(Launcher):
+    package = "Clp"
+
     def launch_scenario(self):
         """Launches the scenario.
 
@@ -149,6 +357,8 @@ class ClpLauncher(Launcher):
 
 
 class GLPKLauncher(Launcher):
+    package = "GLPK"
+
     def launch_scenario(self):
         """Launches the scenario.
 
@@ -175,6 +385,8 @@ class GLPKLauncher(Launcher):
 
 
 class GurobiLauncher(Launcher):
+    package = "Gurobi"
+
     def launch_scenario(self):
         """Launches the scenario.
 
@@ -200,6 +412,70 @@ class GurobiLauncher(Launcher):
         return self.parse_runtime(start, end)
 
 
+def init_julia_session(julia_env=None, sysimage=None):
+    """Initializes Julia in the current process, unless it was already.
+
+    :param str julia_env: path to the julia environment. None uses the default
+        environment.
+    :param str sysimage: path to a system image with which to start Julia, checked
+        against the manifest of the environment. None uses the default image.
+    :raises ValueError: if Julia was already initialized in another environment or
+        with another image.
+    :raises pyreisejl.utility.helpers.StaleSysimage: if the system image was not
+        built for the current manifest of the environment.
+    """
+    global _julia_options
+    julia_command_line_options = ["--compiled-modules=no"]
+    if julia_env is not None:
+        julia_command_line_options += [f"--project={julia_env}"]
+    if sysimage is not None:
+        julia_command_line_options += [f"--sysimage={os.path.abspath(sysimage)}"]
+    if _julia_options is None:
+        if sysimage is not None:
+            metadata = check_sysimage(sysimage, julia_env)
+            print(f"Using system image {sysimage} built for {metadata['project']}")
+        api = LibJulia.load()
+        api.init_julia(julia_command_line_options)
+        _julia_options = julia_command_line_options
+    elif _julia_options != julia_command_line_options:
+        raise ValueError(f"Julia was already initialized with options {_julia_options}")
+
+
+def _launch_part(launcher):
+    """Solves a part of a scenario in a child process.
+
+    :param Launcher launcher: launcher of the part.
+    """
+    launcher.launch_scenario()
+
+
+def _stop(processes):
+    """Stops the processes solving parts of a scenario which are still running.
+
+    :param list processes: the processes.
+    """
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+
+def _move_logs(part_dir, execute_dir, k):
+    """Moves the Julia logs of a part of a scenario to the execute directory.
+
+    :param str part_dir: output folder of the part.
+    :param str execute_dir: output folder of the simulation.
+    :param int k: index of the part, appended to the names of the logs.
+    """
+    for log in ["stdout.log", "stderr.err"]:
+        name, extension = os.path.splitext(log)
+        if os.path.exists(os.path.join(part_dir, log)):
+            os.replace(
+                os.path.join(part_dir, log),
+                os.path.join(execute_dir, f"{name}_{k}{extension}"),
+            )
+
+
 _launch_map = {"clp": ClpLauncher, "glpk": GLPKLauncher, "gurobi": GurobiLauncher}
 
 
@@ -1,9 +1,65 @@
 import argparse
 
+from pyreisejl.utility import const
+from pyreisejl.utility.converters import input_formats
 from pyreisejl.utility.launchers import get_available_solvers
+from pyreisejl.utility.precision import parse_precision
+from pyreisejl.utility.reducers import summaries
+from pyreisejl.utility.store import output_formats
 
 
-def parse_call_args():
+def _gigabytes(value):
+    """Converts a command line value in gigabytes to bytes.
+
+    :param str value: value in gigabytes.
+    :return: (*int*) -- value in bytes.
+    """
+    return int(float(value) * 2**30)
+
+
+def _variable_precision(value):
+    """Parses the precision of a variable given on the command line.
+
+    :param str value: *variable=dtype[:tolerance]*, e.g. *lmp=int32:0.01*.
+    :return: (*tuple*) -- variable name and precision.
+    :raises ValueError: if the value is invalid.
+    """
+    variable, sep, spec = value.partition("=")
+    if not sep:
+        raise ValueError(f"Expected variable=dtype[:tolerance], got {value}")
+    return variable, parse_precision(spec)
+
+
+def _variable_precisions(value):
+    """Parses the comma-separated precisions of variables given on the command line.
+
+    :param str value: *variable=dtype[:tolerance]* items separated by commas, e.g.
+        *pg=float16,lmp=int32:0.01*.
+    :return: (*list*) -- variable names and precisions.
+    :raises ValueError: if an item is invalid.
+    """
+    return [_variable_precision(v) for v in value.split(",") if v]
+
+
+def _summary_names(value):
+    """Parses the comma-separated names of summaries given on the command line.
+
+    :param str value: names separated by commas, e.g. *lmp_stats,pg_total*.
+    :return: (*list*) -- names of summaries.
+    :raises argparse.ArgumentTypeError: if a name is not one of the keys of
+        summaries.
+    """
+    names = [v for v in value.split(",") if v]
+    unknown = set(names) - summaries.keys()
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown summaries {', '.join(sorted(unknown))}, "
+            f"choose from {', '.join(summaries)}"
+        )
+    return names
+
+
+def parse_call_args(argv=None):
     parser = argparse.ArgumentParser(description="Run REISE.jl simulation.")
 
     # Arguments needed to run REISE.jl
@@ -30,6 +86,24 @@ def parse_call_args():
         "Required files are 'grid.pkl', 'demand.csv', "
         "'hydro.csv', 'solar.csv', and 'wind.csv'.",
     )
+    parser.add_argument(
+        "--input-format",
+        choices=input_formats,
+        default="csv",
+        help="The format of the input data files read by the engine. With arrow, "
+        "the grid tables and the profiles are also written to Arrow IPC files, "
+        "which are memory-mapped instead of parsed when Arrow.jl is installed, "
+        "the CSV files being read otherwise. This is optional and defaults to csv.",
+    )
+    parser.add_argument(
+        "--conversion-cache",
+        help="The directory in which the input data files converted from grid.pkl "
+        "are cached, keyed by the content of grid.pkl, to be hard-linked into the "
+        "input directory of the scenarios with the same grid. This is optional and "
+        "defaults to a folder in the execute directory if a scenario id is given, "
+        "and to no cache otherwise. Files already converted from the same grid.pkl "
+        "in the input directory are never converted again.",
+    )
     parser.add_argument(
         "-t",
         "--threads",
@@ -37,6 +111,41 @@ def parse_call_args():
         help="The number of threads to run the simulation with. "
         "This is optional and defaults to Auto.",
     )
+    parser.add_argument(
+        "--chunks",
+        type=int,
+        help="The number of chunks of contiguous intervals solved in parallel, each "
+        "one in its own Julia process. The initial conditions of each chunk but the "
+        "first are approximated by warm-up intervals, and the deviation at the "
+        "boundaries between chunks is reported in decomposition.json in the execute "
+        "directory. This is optional and defaults to solving all the intervals in "
+        "sequence.",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=1,
+        help="The number of warm-up intervals of each chunk but the first, also "
+        "solved by the previous chunk. This is optional and defaults to 1. This "
+        "flag is only used if the chunks flag is set.",
+    )
+    parser.add_argument(
+        "--reference-dir",
+        help="The output folder of a sequential run of the same simulation, to "
+        "which the first interval of each chunk is compared. This is optional. "
+        "This flag is only used if the chunks flag is set.",
+    )
+    parser.add_argument(
+        "--interconnections",
+        type=int,
+        help="The number of processes across which the electrically independent "
+        "parts of the grid, joined by no AC branch, are solved, each one in its own "
+        "Julia process. DC lines joining parts solved by different processes follow "
+        "a fixed schedule, given in dcline_schedule.csv in the input directory or by "
+        "their equal minimum and maximum, and the other DC lines join the parts of "
+        "their buses. This is optional and defaults to solving the whole grid in a "
+        "single process. It cannot be combined with the chunks flag.",
+    )
     parser.add_argument(
         "-d",
         "--extract-data",
@@ -61,6 +170,93 @@ def parse_call_args():
         "instead of deleted after extraction. "
         "This flag is only used if the extract-data flag is set.",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="The number of worker processes used to read the result.mat files in "
+        "parallel during extraction. This is optional and defaults to 1. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--stream-extraction",
+        action="store_true",
+        help="If this flag is used, the result.mat files are extracted one by one "
+        "while the simulation is running instead of after it has finished. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=list(output_formats),
+        default="pickle",
+        help="The format of the extracted data files. Columnar formats (parquet, "
+        "feather) allow reading a subset of the columns or of the time range. "
+        "This is optional and defaults to pickle. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--compression",
+        help="The compression codec of the extracted data files, e.g. gzip for "
+        "pickle, snappy or zstd for parquet, lz4, zstd or uncompressed for feather. "
+        "This is optional and defaults to the default of the output format. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=_gigabytes,
+        help="The maximum amount of memory, in GB, used to hold extracted data. "
+        "Variables which do not fit are written to memory-mapped files in the output "
+        "directory. This is optional and defaults to no limit. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--partition",
+        help="Save each extracted variable in a directory with one file per time "
+        "partition: 'interval' for one file per result file, or a pandas period "
+        "alias such as 'M' for one file per calendar month. "
+        "This is optional and defaults to one file per variable. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="If this flag is used, the extraction is checkpointed in the output "
+        "directory and a previous extraction interrupted before completion is "
+        "resumed, only reading the result.mat files which were not read, or which "
+        "changed, since. This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--summaries",
+        action="extend",
+        type=_summary_names,
+        default=[],
+        help="The summaries of the extracted data computed while the result.mat "
+        "files are read, in addition to the averaged congestion, separated by "
+        f"commas, among {', '.join(summaries)}. This is optional. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="If this flag is used, only the summaries are saved, without keeping "
+        "the time series of the extracted data in memory. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--precision",
+        action="extend",
+        type=_variable_precisions,
+        default=[],
+        help="The precision with which extracted variables are saved, separated by "
+        "commas, as variable=dtype or variable=dtype:tolerance, e.g. "
+        "pg=float16,lmp=int32:0.01 for prices in cents. Floats are rounded to a "
+        "multiple of the tolerance and integers store multiples of it. The flag can "
+        "be repeated. This is optional and "
+        "defaults to float32 for dense variables and float64 rounded to 1e-6 for "
+        "sparse variables. "
+        "This flag is only used if the extract-data flag is set.",
+    )
 
     solvers = ",".join(get_available_solvers())
     parser.add_argument(
@@ -74,6 +270,21 @@ def parse_call_args():
         help="The path to the julia environment within which to run REISE.jl. "
         "This is optional and defaults to the default julia environment.",
     )
+    parser.add_argument(
+        "--sysimage",
+        default=const.SYSIMAGE,
+        help="The path to a Julia system image built by sysimage.py, with which "
+        "Julia is started. The image must have been built for the current manifest "
+        "of the julia environment. This is optional and defaults to the "
+        "REISE_SYSIMAGE environment variable, or the default image if it is unset.",
+    )
+    parser.add_argument(
+        "--worker-queue",
+        help="The queue directory of warm workers started with worker.py. If given, "
+        "the simulation is run by one of these workers, which have already loaded "
+        "Julia and REISE.jl, and its output is copied here. This is optional and "
+        "defaults to running the simulation in this process.",
+    )
 
     # For backwards compatability with PowerSimData
     parser.add_argument(
@@ -82,7 +293,9 @@ def parse_call_args():
         default=None,
         help="Scenario ID only if using PowerSimData. ",
     )
-    return parser.parse_args()
+    args = parser.parse_args(argv)
+    args.precision = dict(args.precision)
+    return args
 
 
 def parse_extract_args():
@@ -131,6 +344,78 @@ def parse_extract_args():
         help="If this flag is used, the result.mat files found in the "
         "execute directory will be kept instead of deleted.",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="The number of worker processes used to read the result.mat files in "
+        "parallel. This is optional and defaults to 1.",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=list(output_formats),
+        default="pickle",
+        help="The format of the extracted data files. Columnar formats (parquet, "
+        "feather) allow reading a subset of the columns or of the time range. "
+        "This is optional and defaults to pickle.",
+    )
+    parser.add_argument(
+        "--compression",
+        help="The compression codec of the extracted data files, e.g. gzip for "
+        "pickle, snappy or zstd for parquet, lz4, zstd or uncompressed for feather. "
+        "This is optional and defaults to the default of the output format.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=_gigabytes,
+        help="The maximum amount of memory, in GB, used to hold extracted data. "
+        "Variables which do not fit are written to memory-mapped files in the output "
+        "directory. This is optional and defaults to no limit.",
+    )
+    parser.add_argument(
+        "--partition",
+        help="Save each extracted variable in a directory with one file per time "
+        "partition: 'interval' for one file per result file, or a pandas period "
+        "alias such as 'M' for one file per calendar month. "
+        "This is optional and defaults to one file per variable.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="If this flag is used, the extraction is checkpointed in the output "
+        "directory and a previous extraction interrupted before completion is "
+        "resumed, only reading the result.mat files which were not read, or which "
+        "changed, since.",
+    )
+    parser.add_argument(
+        "--summaries",
+        action="extend",
+        type=_summary_names,
+        default=[],
+        help="The summaries of the extracted data computed while the result.mat "
+        "files are read, in addition to the averaged congestion, separated by "
+        f"commas, among {', '.join(summaries)}. This is optional.",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="If this flag is used, only the summaries are saved, without keeping "
+        "the time series of the extracted data in memory.",
+    )
+    parser.add_argument(
+        "--precision",
+        action="extend",
+        type=_variable_precisions,
+        default=[],
+        help="The precision with which extracted variables are saved, separated by "
+        "commas, as variable=dtype or variable=dtype:tolerance, e.g. "
+        "pg=float16,lmp=int32:0.01 for prices in cents. Floats are rounded to a "
+        "multiple of the tolerance and integers store multiples of it. The flag can "
+        "be repeated. This is optional and "
+        "defaults to float32 for dense variables and float64 rounded to 1e-6 for "
+        "sparse variables.",
+    )
 
     # For backwards compatability with PowerSimData
     parser.add_argument(
@@ -139,4 +424,429 @@ def parse_extract_args():
         default=None,
         help="Scenario ID only if using PowerSimData.",
     )
+    args = parser.parse_args()
+    args.precision = dict(args.precision)
+    return args
+
+
+def parse_benchmark_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the extraction of synthetic REISE.jl results."
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="*",
+        choices=["small", "medium", "large", "usa"],
+        default=["small", "medium"],
+        help="The predefined grid sizes to benchmark. "
+        "This is optional and defaults to small and medium.",
+    )
+    parser.add_argument(
+        "--bus",
+        type=int,
+        help="The number of buses of an additional custom grid size. This is "
+        "optional, missing counts of the custom size default to the small size.",
+    )
+    parser.add_argument(
+        "--branch",
+        type=int,
+        help="The number of AC branches of an additional custom grid size.",
+    )
+    parser.add_argument(
+        "--plant",
+        type=int,
+        help="The number of plants of an additional custom grid size.",
+    )
+    parser.add_argument(
+        "--storage",
+        type=int,
+        default=0,
+        help="The number of storage units. This is optional and defaults to 0.",
+    )
+    parser.add_argument(
+        "--dcline",
+        type=int,
+        default=0,
+        help="The number of DC lines. This is optional and defaults to 0.",
+    )
+    parser.add_argument(
+        "--load-shed",
+        action="store_true",
+        help="If this flag is used, the result files contain load shed.",
+    )
+    parser.add_argument(
+        "--flexible-demand",
+        action="store_true",
+        help="If this flag is used, the result files contain flexible demand.",
+    )
+    parser.add_argument(
+        "--trans-viol",
+        action="store_true",
+        help="If this flag is used, the result files contain transmission "
+        "violations.",
+    )
+    parser.add_argument(
+        "-n",
+        "--files",
+        type=int,
+        default=10,
+        help="The number of result files of each scenario. "
+        "This is optional and defaults to 10.",
+    )
+    parser.add_argument(
+        "-int",
+        "--interval",
+        type=int,
+        default=24,
+        help="The number of hours in each result file. "
+        "This is optional and defaults to 24.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="The number of worker processes used to read the result files. "
+        "This is optional and defaults to 1.",
+    )
+    parser.add_argument(
+        "-d",
+        "--directory",
+        help="The directory in which the synthetic scenarios are temporarily "
+        "written. This is optional and defaults to the system temporary directory.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="The path to a JSON file in which to save the measurements. "
+        "This is optional.",
+    )
+    return parser.parse_args()
+
+
+def parse_batch_args():
+    parser = argparse.ArgumentParser(
+        description="Extract data from the results of several scenarios in parallel."
+    )
+    parser.add_argument(
+        "scenario_ids",
+        nargs="+",
+        help="The ids of the scenarios to extract, from the scenario list.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=_gigabytes,
+        help="The maximum amount of memory, in GB, used by all the extractions. "
+        "Scenarios are started as long as their estimated peak memory fits in it. "
+        "This is optional and defaults to no limit.",
+    )
+    parser.add_argument(
+        "--cpus",
+        type=int,
+        help="The number of CPUs used by all the extractions, each one using as many "
+        "CPUs as workers. This is optional and defaults to all the CPUs.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="The number of worker processes used to read the result.mat files of "
+        "each scenario. This is optional and defaults to 1.",
+    )
+    parser.add_argument(
+        "-k",
+        "--keep-matlab",
+        action="store_true",
+        help="If this flag is used, the result.mat files found in the "
+        "execute directory will be kept instead of deleted.",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=list(output_formats),
+        default="pickle",
+        help="The format of the extracted data files. "
+        "This is optional and defaults to pickle.",
+    )
+    parser.add_argument(
+        "--compression",
+        help="The compression codec of the extracted data files. "
+        "This is optional and defaults to the default of the output format.",
+    )
+    parser.add_argument(
+        "--partition",
+        help="Save each extracted variable in a directory with one file per time "
+        "partition, see extract_data.py. This is optional and defaults to one file "
+        "per variable.",
+    )
+    parser.add_argument(
+        "--summaries",
+        action="extend",
+        type=_summary_names,
+        default=[],
+        help="The summaries of the extracted data computed while the result.mat "
+        "files are read, in addition to the averaged congestion, separated by "
+        f"commas, among {', '.join(summaries)}. This is optional.",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="If this flag is used, only the summaries are saved, without keeping "
+        "the time series of the extracted data in memory.",
+    )
+    parser.add_argument(
+        "--precision",
+        action="extend",
+        type=_variable_precisions,
+        default=[],
+        help="The precision with which extracted variables are saved, separated by "
+        "commas, see extract_data.py. This is optional.",
+    )
+    args = parser.parse_args()
+    args.precision = dict(args.precision)
+    return args
+
+
+def parse_sweep_args():
+    parser = argparse.ArgumentParser(
+        description="Run REISE.jl simulations of several scenarios in parallel."
+    )
+    parser.add_argument(
+        "jobs",
+        nargs="+",
+        help="The ids of the scenarios to run, from the scenario list, or input "
+        "directories with a grid.pkl file.",
+    )
+    parser.add_argument(
+        "-s",
+        "--start-date",
+        help="The start date for the simulations of input directories, see call.py.",
+    )
+    parser.add_argument(
+        "-e",
+        "--end-date",
+        help="The end date for the simulations of input directories, see call.py.",
+    )
+    parser.add_argument(
+        "-int",
+        "--interval",
+        type=int,
+        help="The length of each interval in hours, for input directories.",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=input_formats,
+        default="csv",
+        help="The format of the input files converted from grid.pkl. "
+        "This is optional and defaults to csv.",
+    )
+    parser.add_argument(
+        "--conversion-cache",
+        help="The directory of the conversion cache, see call.py. This is optional "
+        "and defaults to the default cache for scenario ids and to no cache for "
+        "input directories.",
+    )
+    parser.add_argument(
+        "--cores",
+        type=int,
+        help="The number of cores used by the sweep, shared by the solver threads of "
+        "the simulations and the workers of the extractions. This is optional and "
+        "defaults to all the CPUs.",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=_gigabytes,
+        help="The maximum amount of memory, in GB, used by the sweep. Simulations "
+        "are started as long as their estimated memory fits in it. This is optional "
+        "and defaults to no limit.",
+    )
+    parser.add_argument(
+        "--max-threads",
+        type=int,
+        help="The maximum number of solver threads of a simulation, whose number of "
+        "threads is otherwise chosen from the size of its grid. This is optional "
+        "and defaults to the number of cores.",
+    )
+    solvers = ",".join(get_available_solvers())
+    parser.add_argument(
+        "--solver",
+        help="Specify the solver to run the optimization. Will default to gurobi. "
+        f"Current solvers available are {solvers}.",
+    )
+    parser.add_argument(
+        "-j",
+        "--julia-env",
+        help="The path to the julia environment within which to run REISE.jl. "
+        "This is optional and defaults to the default julia environment.",
+    )
+    parser.add_argument(
+        "--sysimage",
+        default=const.SYSIMAGE,
+        help="The path to a Julia system image built by sysimage.py, see call.py. "
+        "This is optional and defaults to the REISE_SYSIMAGE environment variable.",
+    )
+    parser.add_argument(
+        "-d",
+        "--extract-data",
+        action="store_true",
+        help="If this flag is used, the data generated by each simulation is "
+        "extracted as soon as it finishes, while the following simulations run.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="The number of worker processes used to read the result.mat files of "
+        "each scenario. This is optional and defaults to 1. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "-k",
+        "--keep-matlab",
+        action="store_true",
+        help="If this flag is used, the result.mat files found in the "
+        "execute directory will be kept instead of deleted. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=list(output_formats),
+        default="pickle",
+        help="The format of the extracted data files. This is optional and "
+        "defaults to pickle. This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--compression",
+        help="The compression codec of the extracted data files. This is optional "
+        "and defaults to the default of the output format. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--partition",
+        help="Save each extracted variable in a directory with one file per time "
+        "partition, see extract_data.py. This is optional and defaults to one file "
+        "per variable. This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--summaries",
+        action="extend",
+        type=_summary_names,
+        default=[],
+        help="The summaries of the extracted data computed while the result.mat "
+        "files are read, in addition to the averaged congestion, separated by "
+        f"commas, among {', '.join(summaries)}. This is optional. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="If this flag is used, only the summaries are saved, without keeping "
+        "the time series of the extracted data in memory. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--precision",
+        action="extend",
+        type=_variable_precisions,
+        default=[],
+        help="The precision with which extracted variables are saved, separated by "
+        "commas, see extract_data.py. This is optional. "
+        "This flag is only used if the extract-data flag is set.",
+    )
+    parser.add_argument(
+        "--output",
+        help="The path of a JSON file where the throughput of the sweep and the "
+        "runtime of each job are written. This is optional.",
+    )
+    args = parser.parse_args()
+    args.precision = dict(args.precision)
+    return args
+
+
+def parse_worker_args():
+    parser = argparse.ArgumentParser(
+        description="Run REISE.jl simulations submitted to a queue by call.py, "
+        "with Julia and REISE.jl loaded once."
+    )
+    parser.add_argument(
+        "-q",
+        "--queue",
+        default=const.WORKER_QUEUE_DIR,
+        help="The queue directory, given to call.py as --worker-queue. This is "
+        "optional and defaults to a folder in the execute directory.",
+    )
+    parser.add_argument(
+        "-n",
+        "--processes",
+        type=int,
+        default=1,
+        help="The number of worker processes, each one running one simulation at a "
+        "time in its own Julia session. This is optional and defaults to 1.",
+    )
+    solvers = ",".join(get_available_solvers())
+    parser.add_argument(
+        "--solver",
+        help="The solver whose Julia package is loaded when the workers start, "
+        "others being loaded by the first simulation using them. This is optional "
+        f"and defaults to gurobi. Current solvers available are {solvers}.",
+    )
+    parser.add_argument(
+        "-j",
+        "--julia-env",
+        help="The path to the julia environment within which to run REISE.jl. "
+        "Simulations requesting another environment fail. This is optional and "
+        "defaults to the default julia environment.",
+    )
+    parser.add_argument(
+        "--sysimage",
+        default=const.SYSIMAGE,
+        help="The path to a Julia system image built by sysimage.py, with which "
+        "the workers start Julia. This is optional and defaults to the "
+        "REISE_SYSIMAGE environment variable, or the default image if it is unset.",
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        help="The number of simulations after which each worker exits. This is "
+        "optional and defaults to no limit.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1,
+        help="The time in seconds between checks of the queue. This is optional "
+        "and defaults to 1.",
+    )
+    return parser.parse_args()
+
+
+def parse_sysimage_args():
+    parser = argparse.ArgumentParser(
+        description="Build a Julia system image with REISE.jl and its dependencies "
+        "compiled in."
+    )
+    parser.add_argument(
+        "sysimage",
+        help="The path to the system image to build, e.g. reise.so.",
+    )
+    parser.add_argument(
+        "-j",
+        "--julia-env",
+        help="The path to the julia environment whose packages are compiled in the "
+        "image. This is optional and defaults to the JULIA_PROJECT environment "
+        "variable, or the REISE.jl project if it is unset.",
+    )
+    solvers = ",".join(get_available_solvers())
+    parser.add_argument(
+        "--solver",
+        help="The solver running the small scenario which records the code "
+        "compiled in the image. This is optional and defaults to glpk or clp, "
+        f"whichever is in the environment. Current solvers available are {solvers}.",
+    )
+    parser.add_argument(
+        "--julia",
+        default="julia",
+        help="The julia executable. This is optional and defaults to julia.",
+    )
     return parser.parse_args()
@@ -0,0 +1,131 @@
+import math
+
+import numpy as np
+
+
+class Precision:
+    """Precision with which the values of a variable are stored.
+
+    Floating point values are optionally rounded to a multiple of a tolerance.
+    Integer values are fixed-point: they are the values divided by the tolerance,
+    which is then required, and rounded, e.g. *Precision('int32', 0.01)* stores
+    prices in cents.
+
+    :param str dtype: numpy type, e.g. *'float64'*, *'float32'*, *'float16'*,
+        *'int32'* or *'int16'*.
+    :param float tolerance: step of the stored values, in the units of the variable.
+        None does not round floating point values.
+    :raises ValueError: if dtype is not a floating point or integer type, or if
+        dtype is an integer type and tolerance is None.
+    """
+
+    def __init__(self, dtype, tolerance=None):
+        """Constructor."""
+        self.dtype = np.dtype(dtype)
+        self.tolerance = tolerance
+        if self.dtype.kind not in {"f", "i"}:
+            raise ValueError(f"dtype must be a float or integer type, got {dtype}")
+        if self.dtype.kind == "i" and tolerance is None:
+            raise ValueError("tolerance is required for integer types")
+        # Round to decimals when possible, as numpy.round does
+        self.decimals = None
+        if tolerance is not None:
+            decimals = round(-math.log10(tolerance))
+            if math.isclose(10.0**-decimals, tolerance):
+                self.decimals = decimals
+
+    @property
+    def read_dtype(self):
+        """Type in which the values are read from the result files, HDF5 converting
+        the float64 values while reading.
+
+        :return: (*numpy.dtype*) -- the type. Fixed-point values are computed from
+            float32 values, exact up to 2**24 times the tolerance, if the integer
+            type does not hold larger values, and from float64 values otherwise.
+        """
+        if self.dtype.kind == "f":
+            return self.dtype
+        if np.iinfo(self.dtype).max <= 2**24:
+            return np.dtype(np.float32)
+        return np.dtype(np.float64)
+
+    def apply(self, data, name=None):
+        """Rounds or scales values read in :attr:`read_dtype`.
+
+        :param numpy.ndarray data: values.
+        :param str name: name of the variable, used in error messages.
+        :return: (*numpy.ndarray*) -- values stored with this precision.
+        :raises ValueError: if fixed-point values are not finite or do not fit in
+            the integer type.
+        """
+        if self.dtype.kind == "i":
+            scaled = np.rint(data / self.tolerance)
+            if scaled.size > 0:
+                info = np.iinfo(self.dtype)
+                if not np.isfinite(scaled).all():
+                    raise ValueError(
+                        f"{name or 'Variable'} has values which are not finite, "
+                        f"which {self!r} cannot store"
+                    )
+                if scaled.min() < info.min or scaled.max() > info.max:
+                    raise ValueError(
+                        f"{name or 'Variable'} has values from "
+                        f"{scaled.min() * self.tolerance} to "
+                        f"{scaled.max() * self.tolerance}, outside of the range of "
+                        f"{self!r}: use a larger integer type, a larger tolerance "
+                        "or a float type"
+                    )
+            return scaled.astype(self.dtype)
+        if self.tolerance is None:
+            return data.astype(self.dtype, copy=False)
+        if self.decimals is not None:
+            return data.round(self.decimals)
+        return np.rint(data / self.tolerance) * self.tolerance
+
+    def to_units(self, data):
+        """Converts stored values back to the units of the variable.
+
+        :param numpy.ndarray/pandas.DataFrame data: stored values.
+        :return: (*numpy.ndarray/pandas.DataFrame*) -- values in the units of the
+            variable, as float64 if they were stored as integers.
+        """
+        if self.dtype.kind == "i":
+            return data * self.tolerance
+        return data
+
+    def to_dict(self):
+        """Describes the precision, e.g. for the metadata of output files.
+
+        :return: (*dict*) -- dtype and tolerance.
+        """
+        return {"dtype": self.dtype.name, "tolerance": self.tolerance}
+
+    def __eq__(self, other):
+        return isinstance(other, Precision) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Precision({self.dtype.name!r}, {self.tolerance!r})"
+
+
+def parse_precision(spec):
+    """Parses a precision given as *dtype* or *dtype:tolerance*, e.g. *'float16'* or
+    *'int32:0.01'*.
+
+    :param str spec: the precision.
+    :return: (*Precision*) -- the precision.
+    :raises ValueError: if the precision is invalid.
+    """
+    dtype, _, tolerance = spec.partition(":")
+    return Precision(dtype, float(tolerance) if tolerance else None)
+
+
+def to_units(df):
+    """Converts an extracted output saved with a fixed-point precision back to the
+    units of the variable, using the precision recorded in its attributes.
+
+    :param pandas.DataFrame df: an extracted output, as read from a file.
+    :return: (*pandas.DataFrame*) -- the output in the units of the variable.
+    """
+    if "precision" not in df.attrs:
+        return df
+    return Precision(**df.attrs["precision"]).to_units(df)
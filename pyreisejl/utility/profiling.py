@@ -0,0 +1,137 @@
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+# Measurements of each file read by the extraction
+file_measurements = ["read_time", "decode_time", "copy_time", "bytes_read"]
+
+
+def max_rss(who=resource.RUSAGE_SELF):
+    """Gets the peak resident set size of the current process or of its children.
+
+    :param int who: resource.RUSAGE_SELF or resource.RUSAGE_CHILDREN.
+    :return: (*int*) -- peak resident set size in bytes.
+    """
+    rss = resource.getrusage(who).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes on Linux
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+@contextmanager
+def timed(totals, name):
+    """Adds the wall and CPU time spent in a block to running totals, along with
+    the growth of the peak resident set size of the process during the block.
+
+    :param dict totals: dictionary in which the totals are accumulated.
+    :param str name: key of the totals, a *[wall time, CPU time, RSS growth]* list,
+        the RSS growth being the largest one of all the blocks.
+    """
+    wall, cpu, rss = time.perf_counter(), time.process_time(), max_rss()
+    try:
+        yield
+    finally:
+        total = totals.setdefault(name, [0.0, 0.0, 0])
+        total[0] += time.perf_counter() - wall
+        total[1] += time.process_time() - cpu
+        total[2] = max(total[2], max_rss() - rss)
+
+
+class Profiler:
+    """Collects the timing and memory measurements of an extraction.
+
+    Phases are identified by name, e.g. *'read'* or *'relabel'*, and accumulate
+    their wall time, CPU time and number of calls. The RSS growth of a phase is how
+    much it raised the peak resident set size of the process running it, a worker
+    process for the phases run in them, the largest one of all its calls: a phase
+    which uses less memory than an earlier phase has no growth.
+
+    :param callable hook: optional function called with a dictionary for each
+        measurement as soon as it is made: *{'event': 'file', 'file': ...,
+        'read_time': ..., ...}* for a result file, *{'event': 'phase', 'phase': ...,
+        'wall_time': ..., 'cpu_time': ..., 'rss_growth': ...}* for a phase.
+    """
+
+    def __init__(self, hook=None):
+        """Constructor."""
+        self.hook = hook
+        self.files = []
+        self.phases = {}
+
+    def _emit(self, event):
+        """Passes a measurement to the hook, if any.
+
+        :param dict event: the measurement.
+        """
+        if self.hook is not None:
+            self.hook(event)
+
+    def add_phase(self, name, wall_time, cpu_time, rss_growth):
+        """Records a measurement of a phase.
+
+        :param str name: name of the phase.
+        :param float wall_time: wall time in seconds.
+        :param float cpu_time: CPU time in seconds.
+        :param int rss_growth: growth of the peak resident set size in bytes.
+        """
+        phase = self.phases.setdefault(
+            name, {"wall_time": 0.0, "cpu_time": 0.0, "rss_growth": 0, "calls": 0}
+        )
+        phase["wall_time"] += wall_time
+        phase["cpu_time"] += cpu_time
+        phase["rss_growth"] = max(phase["rss_growth"], rss_growth)
+        phase["calls"] += 1
+        self._emit(
+            {
+                "event": "phase",
+                "phase": name,
+                "wall_time": wall_time,
+                "cpu_time": cpu_time,
+                "rss_growth": rss_growth,
+            }
+        )
+
+    @contextmanager
+    def phase(self, name):
+        """Measures a block of code as a phase.
+
+        :param str name: name of the phase.
+        """
+        totals = {}
+        try:
+            with timed(totals, name):
+                yield
+        finally:
+            self.add_phase(name, *totals[name])
+
+    def add_file(self, stats):
+        """Records the measurements of a result file.
+
+        :param dict stats: measurements of the file, with its path (*'file'*), the
+            keys of file_measurements and the *[wall time, CPU time, RSS growth]*
+            of the phases run for this file, keyed by phase name, in a *'phases'*
+            dictionary, see :func:`timed`.
+        """
+        record = {"file": stats["file"]}
+        record.update({k: stats.get(k, 0) for k in file_measurements})
+        self.files.append(record)
+        self._emit({"event": "file", **record})
+        for name, (wall_time, cpu_time, rss_growth) in stats.get("phases", {}).items():
+            self.add_phase(name, wall_time, cpu_time, rss_growth)
+
+    def to_dict(self):
+        """Gets all the measurements.
+
+        :return: (*dict*) -- measurements of the result files (*'files'*), in the
+            order in which they were read, and of the phases (*'phases'*).
+        """
+        return {"files": self.files, "phases": self.phases}
+
+    def save(self, path):
+        """Saves all the measurements to a JSON file.
+
+        :param str path: path to the file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
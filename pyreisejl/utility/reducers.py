@@ -0,0 +1,258 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import issparse
+
+
+def _dense(data):
+    """Gets the values of a variable as a dense array.
+
+    :param numpy.ndarray/scipy.sparse.coo_matrix data: values (time x element).
+    :return: (*numpy.ndarray*) -- dense values.
+    """
+    return data.toarray() if issparse(data) else data
+
+
+def _column_sums(data):
+    """Sums the values of a variable over time.
+
+    :param numpy.ndarray/scipy.sparse.coo_matrix data: values (time x element).
+    :return: (*numpy.ndarray*) -- float64 sum for each element.
+    """
+    if issparse(data):
+        return np.bincount(data.col, weights=data.data, minlength=data.shape[1])
+    return data.sum(axis=0, dtype=np.float64)
+
+
+def _column_counts_above(data, threshold):
+    """Counts the hours in which the absolute value of a variable is above a
+    threshold.
+
+    :param numpy.ndarray/scipy.sparse.coo_matrix data: values (time x element).
+    :param float threshold: threshold.
+    :return: (*numpy.ndarray*) -- number of hours for each element.
+    """
+    if issparse(data):
+        above = data.col[np.abs(data.data) > threshold]
+        return np.bincount(above, minlength=data.shape[1])
+    return (np.abs(data) > threshold).sum(axis=0)
+
+
+class Reducer:
+    """Base class of the reducers, which compute summaries of variables from the
+    values of each result file as it is read, without keeping the time series.
+
+    Subclasses define the name of the output file, the variables they need (the
+    element ids of the first one label the summary) and implement
+    :meth:`_update` and :meth:`result`.
+    """
+
+    name = None
+    variables = ()
+
+    def __init__(self):
+        """Constructor."""
+        self.n_hours = 0
+
+    def update(self, temps):
+        """Updates the summary with the values of a result file. Files in which one
+        of the variables is missing are skipped.
+
+        :param dict temps: values (time x element) keyed by variable name, numpy
+            arrays for dense variables and scipy.sparse.coo_matrix for sparse
+            variables.
+        """
+        if all(v in temps for v in self.variables):
+            self._update(*(temps[v] for v in self.variables))
+            self.n_hours += temps[self.variables[0]].shape[0]
+
+    def _update(self, *arrays):
+        """Updates the running aggregates.
+
+        :param \\*arrays: values (time x element) of each variable.
+        """
+        raise NotImplementedError
+
+    def result(self):
+        """Gets the summary.
+
+        :return: (*pandas.DataFrame*) -- summary indexed by element position, None
+            if no file contained the variables.
+        """
+        raise NotImplementedError
+
+
+class AveragedCongestion(Reducer):
+    """Time averaged congestion of the lower and upper power flow limits, as
+    computed by :func:`pyreisejl.utility.extract_data.calculate_averaged_congestion`.
+    """
+
+    name = "AVERAGED_CONG"
+    variables = ("congl", "congu")
+
+    def __init__(self):
+        """Constructor."""
+        super().__init__()
+        self.sums = None
+
+    def _update(self, congl, congu):
+        sums = np.vstack([_column_sums(congl), _column_sums(congu)])
+        self.sums = sums if self.sums is None else self.sums + sums
+
+    def result(self):
+        if self.sums is None:
+            return None
+        return pd.DataFrame(self.sums.T / self.n_hours, columns=["CONGL", "CONGU"])
+
+
+class HoursAbove(Reducer):
+    """Number of hours in which the absolute value of a variable is above a
+    threshold, e.g. binding hours of branches or load shed hours of buses.
+
+    :param str variable: variable name.
+    :param float threshold: threshold. Defaults to 0.
+    """
+
+    def __init__(self, variable, threshold=0):
+        """Constructor."""
+        super().__init__()
+        self.name = f"{variable.upper()}_HOURS"
+        self.variables = (variable,)
+        self.threshold = threshold
+        self.counts = None
+
+    def _update(self, data):
+        counts = _column_counts_above(data, self.threshold)
+        self.counts = counts if self.counts is None else self.counts + counts
+
+    def result(self):
+        if self.counts is None:
+            return None
+        return pd.DataFrame({"hours": self.counts})
+
+
+class Totals(Reducer):
+    """Sum of a variable over time, e.g. energy generated by plants or load shed at
+    buses.
+
+    :param str variable: variable name.
+    """
+
+    def __init__(self, variable):
+        """Constructor."""
+        super().__init__()
+        self.name = f"{variable.upper()}_TOTAL"
+        self.variables = (variable,)
+        self.sums = None
+
+    def _update(self, data):
+        sums = _column_sums(data)
+        self.sums = sums if self.sums is None else self.sums + sums
+
+    def result(self):
+        if self.sums is None:
+            return None
+        return pd.DataFrame({"total": self.sums})
+
+
+class Statistics(Reducer):
+    """Minimum, maximum and mean of a variable over time.
+
+    :param str variable: variable name.
+    """
+
+    def __init__(self, variable):
+        """Constructor."""
+        super().__init__()
+        self.name = f"{variable.upper()}_STATS"
+        self.variables = (variable,)
+        self.min = self.max = self.sums = None
+
+    def _update(self, data):
+        dense = _dense(data)
+        if self.sums is None:
+            self.min, self.max = dense.min(axis=0), dense.max(axis=0)
+            self.sums = _column_sums(data)
+        else:
+            self.min = np.minimum(self.min, dense.min(axis=0))
+            self.max = np.maximum(self.max, dense.max(axis=0))
+            self.sums += _column_sums(data)
+
+    def result(self):
+        if self.sums is None:
+            return None
+        return pd.DataFrame(
+            {"min": self.min, "max": self.max, "mean": self.sums / self.n_hours}
+        )
+
+
+class Quantiles(Reducer):
+    """Approximate quantiles of a variable over time, computed from a uniform random
+    sample of the hours (reservoir sampling). Quantiles are exact if the number of
+    hours is at most the sample size.
+
+    :param str variable: variable name.
+    :param iterable quantiles: quantiles to compute, between 0 and 1.
+    :param int sample_size: maximum number of hours kept in memory.
+    :param int seed: seed of the random number generator.
+    """
+
+    def __init__(
+        self,
+        variable,
+        quantiles=(0.05, 0.25, 0.5, 0.75, 0.95),
+        sample_size=1000,
+        seed=0,
+    ):
+        """Constructor."""
+        super().__init__()
+        self.name = f"{variable.upper()}_QUANTILES"
+        self.variables = (variable,)
+        self.quantiles = list(quantiles)
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.sample = None
+        self.filled = 0
+
+    def _update(self, data):
+        dense = _dense(data)
+        if self.sample is None:
+            self.sample = np.empty((self.sample_size, dense.shape[1]), dense.dtype)
+        for i, row in enumerate(dense):
+            if self.filled < self.sample_size:
+                self.sample[self.filled] = row
+                self.filled += 1
+                continue
+            # Keep the hour with probability sample_size / hours seen so far
+            j = self.rng.integers(0, self.n_hours + i + 1)
+            if j < self.sample_size:
+                self.sample[j] = row
+
+    def result(self):
+        if self.sample is None:
+            return None
+        filled = self.filled
+        values = np.quantile(self.sample[:filled], self.quantiles, axis=0)
+        return pd.DataFrame(values.T, columns=self.quantiles)
+
+
+# Built-in summaries, which can be requested by name
+summaries = {
+    "binding_hours": lambda: [HoursAbove("congu"), HoursAbove("congl")],
+    "lmp_stats": lambda: [Statistics("lmp")],
+    "lmp_quantiles": lambda: [Quantiles("lmp")],
+    "pg_total": lambda: [Totals("pg")],
+    "load_shed_hours": lambda: [HoursAbove("load_shed"), Totals("load_shed")],
+}
+
+
+def get_summaries(names):
+    """Creates the reducers of built-in summaries.
+
+    :param iterable names: keys of summaries.
+    :return: (*list*) -- reducers.
+    :raises ValueError: if a name is not one of the keys of summaries.
+    """
+    unknown = set(names) - summaries.keys()
+    if unknown:
+        raise ValueError(f"Unknown summaries: {', '.join(sorted(unknown))}")
+    return [reducer for name in names for reducer in summaries[name]()]
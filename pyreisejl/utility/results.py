@@ -0,0 +1,259 @@
+import glob
+import os
+from collections import OrderedDict
+
+import h5py
+import numpy as np
+import pandas as pd
+
+from pyreisejl.utility.extract_data import (
+    _get_outputs_from_converted,
+    extraction_paths,
+    get_precision,
+    optional_extraction_paths,
+    result_num,
+)
+from pyreisejl.utility.helpers import load_mat73, validate_time_format
+
+
+class _ByteLRUCache:
+    """Least recently used cache of numpy arrays, bounded by their total size.
+
+    :param int max_bytes: maximum total size in bytes of the cached arrays.
+    """
+
+    def __init__(self, max_bytes):
+        """Constructor."""
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.items = OrderedDict()
+
+    def get(self, key):
+        """Gets an array, marking it as the most recently used.
+
+        :param tuple key: key of the array.
+        :return: (*numpy.ndarray*) -- the array, None if it is not cached.
+        """
+        if key not in self.items:
+            return None
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def put(self, key, value):
+        """Adds an array, evicting the least recently used ones if need be. Arrays
+        larger than the cache are not cached.
+
+        :param tuple key: key of the array.
+        :param numpy.ndarray value: the array.
+        """
+        if value.nbytes > self.max_bytes:
+            return
+        if key in self.items:
+            self.nbytes -= self.items.pop(key).nbytes
+        self.items[key] = value
+        self.nbytes += value.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.items.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+
+class ScenarioResults:
+    """Lazy access to the variables of a simulation, read from the result files on
+    demand instead of extracting the whole scenario.
+
+    Variables are accessed by name, then indexed by element ids (plants, branches,
+    buses, ...) and time: ``results["pg"][[101, 102], 0:48]`` reads the generation
+    of two plants during the first 48 hours from the result files covering these
+    hours only. Time is indexed by position or, if the start date is given, by
+    timestamp. The arrays read from each file are kept in a cache bounded in size.
+
+    :param str input_dir: directory of the scenario, containing grid.pkl and the
+        result files in its output folder.
+    :param str start_date: optional start date of the simulation, used to index time
+        by timestamp. Defaults to None, i.e. time is indexed by hour.
+    :param str freq: frequency of the timestamps as a pandas frequency alias.
+        Defaults to hourly.
+    :param int cache_bytes: maximum size in bytes of the cached arrays. Defaults to
+        1 GB.
+    :param str grid_path: optional path to the grid.pkl of the scenario. Defaults to
+        grid.pkl in the input directory.
+    :param dict precision: optional precision of some variables, see
+        :func:`pyreisejl.utility.extract_data.get_precision`. Defaults to None,
+        i.e. the precision of the extracted outputs.
+    :raises FileNotFoundError: if there are no result files.
+    """
+
+    def __init__(
+        self,
+        input_dir,
+        start_date=None,
+        freq="H",
+        cache_bytes=2**30,
+        grid_path=None,
+        precision=None,
+    ):
+        """Constructor."""
+        results = glob.glob(os.path.join(input_dir, "output", "result_*.mat"))
+        if not results:
+            raise FileNotFoundError(f"No result files in {input_dir}")
+        self.results = sorted(results, key=result_num)
+        if grid_path is None:
+            grid_path = os.path.join(input_dir, "grid.pkl")
+        self.ids = _get_outputs_from_converted(grid_path)
+        self.cache = _ByteLRUCache(cache_bytes)
+        self.precision = get_precision(precision)
+
+        paths = {**extraction_paths, **optional_extraction_paths}
+        with h5py.File(self.results[0], "r") as f:
+            # Datasets are stored with reversed dimensions: time x element
+            self.shapes = {v: f[p].shape for v, p in paths.items() if p in f}
+        self.paths = {v: paths[v] for v in self.shapes}
+        self.interval_length = self.shapes["pg"][0]
+        self.n_hours = self.interval_length * len(self.results)
+
+        # Time index of the variables, timestamps if the start date is known
+        if start_date is None:
+            self.index = pd.RangeIndex(self.n_hours)
+        else:
+            start_ts = validate_time_format(start_date)
+            self.index = pd.date_range(start_ts, periods=self.n_hours, freq=freq)
+            self.index.name = "UTC"
+
+    def keys(self):
+        """Gets the names of the variables of the scenario.
+
+        :return: (*list*) -- variable names.
+        """
+        return list(self.paths)
+
+    def __contains__(self, name):
+        return name in self.paths
+
+    def __getitem__(self, name):
+        if name not in self.paths:
+            raise KeyError(f"{name} is not in the results, available: {self.keys()}")
+        return LazyVariable(self, name)
+
+    def read_file(self, n, name):
+        """Reads a variable from a result file, or gets it from the cache. Values are
+        stored with the precision of the variable, as by
+        :func:`pyreisejl.utility.extract_data.extract_data`.
+
+        :param int n: result number of the file.
+        :param str name: variable name.
+        :return: (*numpy.ndarray*) -- the values, time x element.
+        """
+        data = self.cache.get((n, name))
+        if data is None:
+            path, precision = self.paths[name], self.precision[name]
+            data = load_mat73(
+                self.results[n], paths=[path], dtypes={path: precision.read_dtype}
+            )
+            data = precision.apply(data[path].T, name)
+            self.cache.put((n, name), data)
+        return data
+
+
+class LazyVariable:
+    """A variable of a :class:`ScenarioResults`, read when indexed.
+
+    :param ScenarioResults results: the scenario results.
+    :param str name: variable name.
+    """
+
+    def __init__(self, results, name):
+        """Constructor."""
+        self.results = results
+        self.name = name
+        n_columns = results.shapes[name][1]
+        ids = results.ids.get(name, [])
+        self.columns = pd.Index(ids if len(ids) == n_columns else range(n_columns))
+
+    @property
+    def shape(self):
+        """Shape of the variable.
+
+        :return: (*tuple*) -- number of hours and of elements.
+        """
+        return self.results.n_hours, len(self.columns)
+
+    def _column_positions(self, key):
+        """Gets the positions of the requested elements.
+
+        :param int/list/slice key: element id(s), or slice(None) for all elements.
+        :return: (*numpy.ndarray*) -- positions of the elements.
+        :raises KeyError: if an element id is unknown.
+        """
+        if isinstance(key, slice):
+            return np.arange(len(self.columns))[
+                self.columns.slice_indexer(key.start, key.stop, key.step)
+            ]
+        ids = [key] if np.isscalar(key) else list(key)
+        positions = self.columns.get_indexer(ids)
+        if (positions < 0).any():
+            missing = [i for i, p in zip(ids, positions) if p < 0]
+            raise KeyError(f"Unknown {self.name} ids: {missing}")
+        return positions
+
+    def _time_positions(self, key):
+        """Gets the range of the requested hours.
+
+        :param int/slice key: hour position, or slice of positions or of
+            timestamps (inclusive of the end, as pandas.DataFrame.loc).
+        :return: (*range*) -- positions of the hours.
+        """
+        n_hours = self.results.n_hours
+        if isinstance(key, slice):
+            if all(
+                k is None or isinstance(k, (int, np.integer))
+                for k in (key.start, key.stop)
+            ):
+                return range(*key.indices(n_hours))
+            return range(n_hours)[
+                self.results.index.slice_indexer(key.start, key.stop, key.step)
+            ]
+        if isinstance(key, (int, np.integer)):
+            position = range(n_hours)[key]
+            return range(position, position + 1)
+        position = self.results.index.get_loc(pd.Timestamp(key))
+        return range(position, position + 1)
+
+    def __getitem__(self, key):
+        """Reads part of the variable.
+
+        :param int/list/slice/tuple key: element id(s), optionally followed by an
+            hour position, a slice of positions or a slice of timestamps.
+        :return: (*pandas.DataFrame*) -- values indexed by time, with element ids as
+            columns.
+        """
+        column_key, time_key = key if isinstance(key, tuple) else (key, slice(None))
+        columns = self._column_positions(column_key)
+        hours = self._time_positions(time_key)
+
+        length = self.results.interval_length
+        pieces = []
+        if len(hours) > 0:
+            first, last = min(hours[0], hours[-1]), max(hours[0], hours[-1])
+            for n in range(first // length, last // length + 1):
+                data = self.results.read_file(n, self.name)
+                pieces.append(data[:, columns])
+        dtype = self.results.precision[self.name].dtype
+        values = (
+            np.concatenate(pieces) if pieces else np.empty((0, len(columns)), dtype)
+        )
+        if len(hours) > 0:
+            offset = (min(hours[0], hours[-1]) // length) * length
+            values = values[np.asarray(hours) - offset]
+        return pd.DataFrame(
+            values,
+            index=self.results.index[list(hours)],
+            columns=self.columns[columns],
+        )
+
+    def to_frame(self):
+        """Reads the whole variable.
+
+        :return: (*pandas.DataFrame*) -- values indexed by time, with element ids as
+            columns.
+        """
+        return self[:, :]
@@ -3,7 +3,9 @@ from queue import Empty, Queue
 from threading import Thread
 from typing import Any, Dict, List
 
+from pyreisejl.utility import const
 from pyreisejl.utility.helpers import get_scenario_status
+from pyreisejl.utility.status import StatusCache
 
 
 class Listener:
@@ -58,29 +60,44 @@ class SimulationState:
         self.out_listener = Listener(self.proc.stdout)
         self.err_listener = Listener(self.proc.stderr)
 
-    def _refresh(self):
+    def _refresh(self, statuses=None):
         """Set the latest status and append the latest output from standard
         streams.
+
+        :param pyreisejl.utility.status.StatusCache statuses: cache of the execute
+            list, already refreshed, from which the status is read. None reads the
+            status from the execute list.
         """
-        self.status = get_scenario_status(self.scenario_id)
+        if statuses is None:
+            self.status = get_scenario_status(self.scenario_id)
+        else:
+            self.status = statuses.get(self.scenario_id, refresh=False)
         self.output += self.out_listener.poll()
         self.errors += self.err_listener.poll()
 
-    def as_dict(self):
+    def as_dict(self, statuses=None):
         """Return custom dict which omits the process attribute which is not
         serializable.
 
+        :param pyreisejl.utility.status.StatusCache statuses: see :meth:`_refresh`.
         :return: (*dict*) -- dict of the instance attributes
         """
-        self._refresh()
+        self._refresh(statuses)
         return {k: v for k, v in self.__dict__.items() if k not in self._EXCLUDE}
 
 
 @dataclass
 class ApplicationState:
-    """Tracks all simulations during the lifetime of the application"""
+    """Tracks all simulations during the lifetime of the application. Their
+    statuses are read from a cache of the execute list, which is only read again
+    when it changes."""
 
     ongoing: Dict[int, SimulationState] = field(default_factory=dict)
+    statuses: StatusCache = field(
+        default_factory=lambda: StatusCache(const.EXECUTE_LIST),
+        repr=False,
+        compare=False,
+    )
 
     def add(self, entry):
         """Add entry for scenario to current state
@@ -97,12 +114,14 @@ class ApplicationState:
         """
         if scenario_id not in self.ongoing:
             return None
-        return self.ongoing[scenario_id].as_dict()
+        self.statuses.refresh()
+        return self.ongoing[scenario_id].as_dict(self.statuses)
 
     def as_dict(self):
         """Custom dict implementation which utilizes the similar method from
-        SimulationState
+        SimulationState, checking the execute list once for all the simulations
 
         :return: (*dict*) -- dict of the instance attributes
         """
-        return {k: v.as_dict() for k, v in self.ongoing.items()}
+        self.statuses.refresh()
+        return {k: v.as_dict(self.statuses) for k, v in self.ongoing.items()}
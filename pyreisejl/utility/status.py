@@ -0,0 +1,486 @@
+import fcntl
+import json
+import os
+import shutil
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from pyreisejl.utility import const
+
+
+@contextmanager
+def file_lock(filename):
+    """Holds an exclusive lock on a file while the block runs, so that processes
+    updating it concurrently do not overwrite each other's changes. The lock is
+    taken on a separate *.lock* file, so that the file itself can be replaced.
+
+    :param str filename: path to the file to lock.
+    """
+    with open(filename + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class StatusStore:
+    """Base class of the stores of the scenario and execute lists.
+
+    Lists are identified by the path of their CSV file, e.g. const.SCENARIO_LIST,
+    and rows by scenario id. All values are strings.
+    """
+
+    def get(self, filename, scenario_id):
+        """Gets the row of a scenario.
+
+        :param str filename: path to execute or scenario list.
+        :param int/str scenario_id: scenario index.
+        :return: (*dict*) -- values of the row keyed by column name, None if the
+            scenario is not in the list.
+        """
+        raise NotImplementedError
+
+    def get_all(self, filename):
+        """Gets all the rows of a list.
+
+        :param str filename: path to execute or scenario list.
+        :return: (*dict*) -- rows keyed by scenario id, see :meth:`get`.
+        """
+        raise NotImplementedError
+
+    def version(self, filename):
+        """Gets the version of a list, which changes whenever the list is updated.
+
+        :param str filename: path to execute or scenario list.
+        :return: (*tuple*) -- inode, modification time and size of each file in
+            which the list is stored, None for missing files.
+        """
+        raise NotImplementedError
+
+    def update(self, filename, scenario_id, column_name, column_value):
+        """Sets a value of the row of a scenario, adding the row or the column if
+        need be.
+
+        :param str filename: path to execute or scenario list.
+        :param int/str scenario_id: scenario index.
+        :param str column_name: name of column to modify.
+        :param str column_value: value to insert.
+        """
+        raise NotImplementedError
+
+    def export(self, filename):
+        """Writes a list to its CSV file, as read by PowerSimData, if updates are
+        not already written to it.
+
+        :param str filename: path to execute or scenario list.
+        """
+        raise NotImplementedError
+
+
+class CsvStore(StatusStore):
+    """Lists stored in their CSV files, each update rewriting the whole file under
+    a lock."""
+
+    def get(self, filename, scenario_id):
+        table = pd.read_csv(filename, dtype=str).fillna("")
+        rows = table[table.id == str(scenario_id)].to_dict("records")
+        return rows[0] if rows else None
+
+    def get_all(self, filename):
+        table = pd.read_csv(filename, dtype=str).fillna("")
+        return {row["id"]: row for row in table.to_dict("records")}
+
+    def version(self, filename):
+        # Updates replace the file, so that its inode changes as well
+        return (_file_version(filename),)
+
+    def update(self, filename, scenario_id, column_name, column_value):
+        with file_lock(filename):
+            _ = shutil.copyfile(filename, filename + ".bak")
+
+            table = pd.read_csv(filename, dtype=str)
+            table.set_index("id", inplace=True)
+            table.loc[str(scenario_id), column_name] = column_value
+            table.to_csv(filename + ".tmp")
+            os.replace(filename + ".tmp", filename)
+
+    def export(self, filename):
+        pass
+
+
+class SqliteStore(StatusStore):
+    """Lists stored in the tables of a local SQLite database, indexed by scenario
+    id, so that an update only writes the row of the scenario. SQLite locks the
+    database during each update, which makes concurrent updates safe.
+
+    The CSV files stay the lists read and edited by PowerSimData. They are written
+    by :meth:`export`, which runs when a scenario reaches one of the statuses of
+    *export_statuses*, and can be run at any time with
+    :bash:`pyreisejl/utility/status.py`. Whenever a CSV file has changed since it
+    was last read or written, e.g. by PowerSimData, the values of its cells which
+    changed are imported into the table, along with its new rows, so that edits of
+    the file are kept while the updates of other cells are not overwritten.
+
+    :param str path: path to the database file.
+    :param float timeout: time in seconds to wait for the lock of the database.
+    :param iterable export_statuses: statuses whose update exports the list.
+    """
+
+    def __init__(
+        self, path, timeout=30, export_statuses=("finished", "failed", "extracted")
+    ):
+        """Constructor."""
+        self.path = path
+        self.timeout = timeout
+        self.export_statuses = set(export_statuses)
+
+    @contextmanager
+    def _transaction(self, write=True):
+        """Opens a connection and runs the block in a transaction.
+
+        :param bool write: whether to take the write lock of the database at the
+            start of the transaction, so that it cannot fail in the middle.
+        :return: (*sqlite3.Connection*) -- the connection.
+        """
+        connection = sqlite3.connect(
+            self.path, timeout=self.timeout, isolation_level=None
+        )
+        try:
+            # Readers do not block the writer, nor the other way round
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _table(filename):
+        """Gets the name of the table of a list.
+
+        :param str filename: path to execute or scenario list.
+        :return: (*str*) -- quoted table name, e.g. *'"ExecuteList"'*.
+        """
+        return _quote(os.path.splitext(os.path.basename(filename))[0])
+
+    def _columns(self, connection, filename):
+        """Gets the columns of the table of a list.
+
+        :param sqlite3.Connection connection: connection to the database.
+        :param str filename: path to execute or scenario list.
+        :return: (*list*) -- column names, empty if the table does not exist.
+        """
+        cursor = connection.execute(f"PRAGMA table_info({self._table(filename)})")
+        return [row[1] for row in cursor]
+
+    def _add_columns(self, connection, filename, columns):
+        """Creates the table of a list or adds columns to it.
+
+        :param sqlite3.Connection connection: connection to the database.
+        :param str filename: path to execute or scenario list.
+        :param iterable columns: column names, other than id.
+        """
+        table = self._table(filename)
+        existing = self._columns(connection, filename)
+        if not existing:
+            connection.execute(f"CREATE TABLE {table} (id TEXT PRIMARY KEY)")
+            existing = ["id"]
+        for column in columns:
+            if column not in existing:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(column)}")
+                existing.append(column)
+
+    @staticmethod
+    def _synced_version(connection, filename):
+        """Gets the version of the CSV file of a list when its table was last
+        synchronized with it.
+
+        :param sqlite3.Connection connection: connection to the database.
+        :param str filename: path to execute or scenario list.
+        :return: (*str*) -- the version, see :func:`_file_version`, None if the
+            table was never synchronized.
+        """
+        cursor = connection.execute("PRAGMA table_info(_csv_versions)")
+        if not cursor.fetchall():
+            return None
+        row = connection.execute(
+            "SELECT version FROM _csv_versions WHERE name = ?", (filename,)
+        ).fetchone()
+        return None if row is None else row[0]
+
+    @staticmethod
+    def _synced_rows(connection, filename):
+        """Gets the rows of the CSV file of a list when its table was last
+        synchronized with it.
+
+        :param sqlite3.Connection connection: connection to the database.
+        :param str filename: path to execute or scenario list.
+        :return: (*dict*) -- rows keyed by scenario id, empty if the table was
+            never synchronized.
+        """
+        cursor = connection.execute("PRAGMA table_info(_csv_rows)")
+        if not cursor.fetchall():
+            return {}
+        cursor = connection.execute(
+            "SELECT id, row FROM _csv_rows WHERE name = ?", (filename,)
+        )
+        return {i: json.loads(row) for i, row in cursor}
+
+    @staticmethod
+    def _set_synced(connection, filename, version, rows):
+        """Records the version and the rows of the CSV file of a list, once its
+        table has been synchronized with it.
+
+        :param sqlite3.Connection connection: connection to the database.
+        :param str filename: path to execute or scenario list.
+        :param str version: version of the file, see :func:`_file_version`.
+        :param list rows: rows of the file, dictionaries keyed by column name.
+        """
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS _csv_versions "
+            "(name TEXT PRIMARY KEY, version TEXT)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS _csv_rows "
+            "(name TEXT, id TEXT, row TEXT, PRIMARY KEY (name, id))"
+        )
+        connection.execute(
+            "INSERT INTO _csv_versions (name, version) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET version = excluded.version",
+            (filename, version),
+        )
+        connection.execute("DELETE FROM _csv_rows WHERE name = ?", (filename,))
+        connection.executemany(
+            "INSERT INTO _csv_rows (name, id, row) VALUES (?, ?, ?)",
+            ((filename, row["id"], json.dumps(row)) for row in rows),
+        )
+
+    def _sync(self, connection, filename):
+        """Imports the cells of the CSV file of a list which changed since it was
+        last synchronized, if the file has changed, the values of the file
+        replacing the ones of the table.
+
+        :param sqlite3.Connection connection: connection to the database, in a
+            write transaction.
+        :param str filename: path to execute or scenario list.
+        """
+        version = repr(_file_version(filename))
+        if self._synced_version(connection, filename) == version:
+            return
+        if not os.path.exists(filename):
+            self._add_columns(connection, filename, [])
+            self._set_synced(connection, filename, version, [])
+            return
+        table = self._table(filename)
+        rows = pd.read_csv(filename, dtype=str).fillna("")
+        columns = [c for c in rows.columns if c != "id"]
+        rows = rows.to_dict("records")
+        self._add_columns(connection, filename, columns)
+        previous = self._synced_rows(connection, filename)
+        for row in rows:
+            if row["id"] in previous:
+                old = previous[row["id"]]
+                changed = [c for c in columns if old.get(c) != row[c]]
+            else:
+                changed = columns
+                connection.execute(
+                    f"INSERT OR IGNORE INTO {table} (id) VALUES (?)", (row["id"],)
+                )
+            if changed:
+                updates = ", ".join(f"{_quote(c)} = ?" for c in changed)
+                connection.execute(
+                    f"UPDATE {table} SET {updates} WHERE id = ?",
+                    (*(row[c] for c in changed), row["id"]),
+                )
+        self._set_synced(connection, filename, version, rows)
+
+    def _refresh(self, filename):
+        """Synchronizes the table of a list with its CSV file if the file has
+        changed since.
+
+        :param str filename: path to execute or scenario list.
+        """
+        with self._transaction(write=False) as connection:
+            version = self._synced_version(connection, filename)
+        if version != repr(_file_version(filename)):
+            with self._transaction() as connection:
+                self._sync(connection, filename)
+
+    def _write_csv(self, connection, filename):
+        """Writes the table of a list to its CSV file, whose lock must be held.
+
+        :param sqlite3.Connection connection: connection to the database, in a
+            write transaction.
+        :param str filename: path to execute or scenario list.
+        """
+        columns = self._columns(connection, filename)
+        rows = connection.execute(
+            f"SELECT * FROM {self._table(filename)} ORDER BY rowid"
+        ).fetchall()
+        table = pd.DataFrame(rows, columns=columns, dtype=str).fillna("")
+        table.to_csv(filename + ".tmp", index=False)
+        os.replace(filename + ".tmp", filename)
+        version = repr(_file_version(filename))
+        self._set_synced(connection, filename, version, table.to_dict("records"))
+
+    def _select(self, connection, filename, scenario_id):
+        """Selects the row of a scenario.
+
+        :param sqlite3.Connection connection: connection to the database.
+        :param str filename: path to execute or scenario list.
+        :param int/str scenario_id: scenario index.
+        :return: (*dict*) -- the row, None if it is not in the table.
+        """
+        columns = self._columns(connection, filename)
+        if not columns:
+            return None
+        row = connection.execute(
+            f"SELECT * FROM {self._table(filename)} WHERE id = ?", (str(scenario_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        return {c: "" if v is None else v for c, v in zip(columns, row)}
+
+    def get(self, filename, scenario_id):
+        self._refresh(filename)
+        with self._transaction(write=False) as connection:
+            return self._select(connection, filename, scenario_id)
+
+    def get_all(self, filename):
+        self._refresh(filename)
+        with self._transaction(write=False) as connection:
+            columns = self._columns(connection, filename)
+            rows = connection.execute(f"SELECT * FROM {self._table(filename)}")
+            rows = [
+                {c: "" if v is None else v for c, v in zip(columns, row)}
+                for row in rows
+            ]
+        return {row["id"]: row for row in rows}
+
+    def version(self, filename):
+        # Committed transactions are appended to the write-ahead log
+        files = [self.path, self.path + "-wal", filename]
+        return tuple(_file_version(f) for f in files)
+
+    def update(self, filename, scenario_id, column_name, column_value):
+        table = self._table(filename)
+        with self._transaction() as connection:
+            # Edits of the CSV file made since are kept
+            self._sync(connection, filename)
+            self._add_columns(connection, filename, [column_name])
+            connection.execute(
+                f"INSERT OR IGNORE INTO {table} (id) VALUES (?)", (str(scenario_id),)
+            )
+            connection.execute(
+                f"UPDATE {table} SET {_quote(column_name)} = ? WHERE id = ?",
+                (str(column_value), str(scenario_id)),
+            )
+        if column_name == "status" and column_value in self.export_statuses:
+            self.export(filename)
+
+    def export(self, filename):
+        with self._transaction() as connection, file_lock(filename):
+            self._sync(connection, filename)
+            self._write_csv(connection, filename)
+
+
+class StatusCache:
+    """In-memory index of the rows of a list, read again from the store only when
+    the list has changed, as given by :meth:`StatusStore.version`, so that many
+    lookups, e.g. the statuses of all the tracked scenarios, cost a single check of
+    the files of the list.
+
+    :param str filename: path to execute or scenario list.
+    :param StatusStore store: store of the list. None uses the store selected by
+        the STATUS_BACKEND environment variable.
+    """
+
+    def __init__(self, filename, store=None):
+        """Constructor."""
+        self.filename = filename
+        self.store = get_status_store() if store is None else store
+        self.rows = {}
+        self._version = None
+
+    def refresh(self):
+        """Reads the list again if it has changed since it was last read. A list
+        which cannot be read is empty."""
+        version = self.store.version(self.filename)
+        if version == self._version:
+            return
+        try:
+            self.rows = self.store.get_all(self.filename)
+        except Exception as ex:
+            print(f"Failed to read {self.filename}: {ex}")
+            self.rows = {}
+        self._version = version
+
+    def get(self, scenario_id, column_name="status", refresh=True):
+        """Gets a value of the row of a scenario.
+
+        :param int/str scenario_id: scenario index.
+        :param str column_name: name of the column.
+        :param bool refresh: whether to check that the list has not changed first.
+        :return: (*str*) -- the value, None if the scenario is not in the list.
+        """
+        if refresh:
+            self.refresh()
+        row = self.rows.get(str(scenario_id))
+        return None if row is None else row.get(column_name)
+
+
+def _file_version(filename):
+    """Gets the inode, modification time and size of a file.
+
+    :param str filename: path to the file.
+    :return: (*tuple*) -- the version of the file, None if it does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _quote(name):
+    """Quotes an SQL identifier.
+
+    :param str name: identifier, e.g. a column name.
+    :return: (*str*) -- the quoted identifier.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+status_stores = {
+    "csv": lambda: CsvStore(),
+    "sqlite": lambda: SqliteStore(const.STATUS_DB),
+}
+
+
+def get_status_store():
+    """Gets the store of the scenario and execute lists selected by the
+    STATUS_BACKEND environment variable, see :mod:`pyreisejl.utility.const`.
+
+    :return: (*StatusStore*) -- the store.
+    :raises ValueError: if the backend is not one of the keys of status_stores.
+    """
+    if const.STATUS_BACKEND not in status_stores:
+        raise ValueError(
+            f"Status backend must be one of {', '.join(status_stores)}, "
+            f"got {const.STATUS_BACKEND}"
+        )
+    return status_stores[const.STATUS_BACKEND]()
+
+
+if __name__ == "__main__":
+    # Export the lists for PowerSimData, e.g. to create missing CSV files
+    store = get_status_store()
+    for filename in [const.SCENARIO_LIST, const.EXECUTE_LIST]:
+        store.export(filename)
@@ -0,0 +1,325 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+output_formats = {"pickle": ".pkl", "parquet": ".parquet", "feather": ".feather"}
+_dataset_formats = {"parquet": "parquet", "feather": "ipc"}
+_metadata_key = b"pyreisejl"
+_partitions_file = "_partitions.json"
+# Approximate size in bytes of the chunks of rows in which sparse data frames are
+# densified when written to columnar files
+sparse_chunk_bytes = 2**26
+
+
+def get_output_format(path):
+    """Infers the format of an output file from its extension.
+
+    :param str path: path to the output file.
+    :return: (*str*) -- one of the keys of output_formats.
+    :raises ValueError: if the extension does not match any format.
+    """
+    extension = os.path.splitext(path)[1]
+    for output_format, ext in output_formats.items():
+        if ext == extension:
+            return output_format
+    raise ValueError(f"Unknown output format for {path}")
+
+
+def _check_output_format(output_format):
+    """Checks that an output format is supported.
+
+    :param str output_format: output format.
+    :raises ValueError: if the format is not one of the keys of output_formats.
+    """
+    if output_format not in output_formats:
+        raise ValueError(
+            f"output_format must be one of {', '.join(output_formats)}, "
+            f"got {output_format}"
+        )
+
+
+def _to_table(df):
+    """Converts a data frame to an arrow table, keeping track of what is lost in the
+    conversion: columnar formats require string column names and dense columns.
+    The attributes of the data frame, e.g. the precision of the variable, are kept
+    as well.
+
+    :param pandas.DataFrame df: data frame to convert.
+    :return: (*pyarrow.Table*) -- table with the index stored as a column.
+    """
+    sparse = [isinstance(d, pd.SparseDtype) for d in df.dtypes]
+    metadata = {
+        "int_columns": bool(pd.api.types.is_integer_dtype(df.columns)),
+        "sparse": bool(len(sparse) > 0 and all(sparse)),
+        "attrs": df.attrs,
+    }
+    if any(sparse):
+        df = pd.DataFrame(
+            {
+                c: df[c].sparse.to_dense() if s else df[c]
+                for c, s in zip(df.columns, sparse)
+            },
+            index=df.index,
+        )
+    df = df.set_axis(df.columns.astype(str), axis=1)
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    return table.replace_schema_metadata(
+        {**table.schema.metadata, _metadata_key: json.dumps(metadata)}
+    )
+
+
+def _from_table(table):
+    """Converts an arrow table written by :func:`_to_table` back to a data frame.
+
+    :param pyarrow.Table table: table to convert.
+    :return: (*pandas.DataFrame*) -- data frame with the original column labels,
+        dtypes and attributes.
+    """
+    metadata = json.loads(table.schema.metadata.get(_metadata_key, b"{}"))
+    df = table.to_pandas()
+    if metadata.get("int_columns"):
+        df.columns = df.columns.astype(np.int64)
+    if metadata.get("sparse"):
+        df = df.astype({c: pd.SparseDtype(d, 0) for c, d in df.dtypes.items()})
+    df.attrs.update(metadata.get("attrs", {}))
+    return df
+
+
+def _write_table_chunks(df, path, output_format, compression, chunk_rows):
+    """Writes a data frame to a columnar file, converting chunks of rows one at a
+    time so that the whole table never has to be held in memory.
+
+    :param pandas.DataFrame df: data frame to write.
+    :param str path: path to the file.
+    :param str output_format: *'parquet'* or *'feather'*.
+    :param str compression: compression codec.
+    :param int chunk_rows: number of rows per chunk.
+    """
+    writer = None
+    try:
+        for start in range(0, max(1, len(df)), chunk_rows):
+            end = start + chunk_rows
+            table = _to_table(df.iloc[start:end])
+            if writer is None:
+                if output_format == "parquet":
+                    writer = pq.ParquetWriter(
+                        path, table.schema, compression=compression or "snappy"
+                    )
+                else:
+                    # Same default as pyarrow.feather.write_feather
+                    codec = {None: "lz4", "uncompressed": None}.get(
+                        compression, compression
+                    )
+                    options = pa.ipc.IpcWriteOptions(compression=codec)
+                    writer = pa.ipc.new_file(path, table.schema, options=options)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_output(df, path, output_format="pickle", compression=None, chunk_bytes=None):
+    """Writes an extracted output to a file.
+
+    :param pandas.DataFrame df: data frame to write.
+    :param str path: path to the file.
+    :param str output_format: one of *'pickle'*, *'parquet'* or *'feather'*.
+    :param str compression: compression codec, e.g. *'gzip'* for pickle, *'snappy'*
+        or *'zstd'* for parquet, *'lz4'*, *'zstd'* or *'uncompressed'* for feather.
+        None uses the default of the format.
+    :param int chunk_bytes: approximate size in bytes of the chunks of rows in which
+        columnar files are written, e.g. to write data frames backed by
+        memory-mapped arrays without loading them in memory. None writes the data
+        frame at once, unless it is sparse, in which case chunks of
+        *sparse_chunk_bytes* are written.
+    :raises ValueError: if the format is not supported.
+    """
+    _check_output_format(output_format)
+    if output_format == "pickle":
+        df.to_pickle(path, compression=compression or "infer")
+        return
+    if chunk_bytes is None and any(isinstance(d, pd.SparseDtype) for d in df.dtypes):
+        # Columnar formats require dense columns: only one chunk is densified at once
+        chunk_bytes = sparse_chunk_bytes
+    if chunk_bytes is not None:
+        row_bytes = max(1, df.shape[1] * 8)
+        chunk_rows = max(1, chunk_bytes // row_bytes)
+        _write_table_chunks(df, path, output_format, compression, chunk_rows)
+    elif output_format == "parquet":
+        pq.write_table(_to_table(df), path, compression=compression or "snappy")
+    else:
+        feather.write_feather(_to_table(df), path, compression=compression)
+
+
+def read_output(path, columns=None, start=None, end=None):
+    """Reads an extracted output, or part of it, from a file.
+
+    Only the requested columns are read from parquet and feather files, and rows
+    outside of the time range are filtered out while reading, using the row group
+    statistics of parquet files and memory mapping of uncompressed feather files.
+    Pickle files are read entirely.
+
+    :param str path: path to the file. The format is inferred from the extension.
+    :param list columns: ids of the columns to read, e.g. plant ids. None reads
+        all of them.
+    :param str/pandas.Timestamp start: first timestamp to read. None reads from
+        the beginning.
+    :param str/pandas.Timestamp end: last timestamp to read. None reads until the
+        end.
+    :return: (*pandas.DataFrame*) -- the requested part of the output.
+    """
+    output_format = get_output_format(path)
+    if output_format == "pickle":
+        df = pd.read_pickle(path)
+        if columns is not None:
+            df = df.loc[:, columns]
+        return df.loc[start:end]
+
+    dataset = ds.dataset(path, format=_dataset_formats[output_format])
+    index_columns = dataset.schema.pandas_metadata["index_columns"]
+    if columns is not None:
+        columns = [str(c) for c in columns] + index_columns
+
+    index = ds.field(index_columns[0])
+    index_type = dataset.schema.field(index_columns[0]).type
+    expression = None
+    if start is not None:
+        expression = index >= pa.scalar(pd.Timestamp(start), type=index_type)
+    if end is not None:
+        condition = index <= pa.scalar(pd.Timestamp(end), type=index_type)
+        expression = condition if expression is None else expression & condition
+
+    return _from_table(dataset.to_table(columns=columns, filter=expression))
+
+
+def _split_partitions(df, partition, interval_length=None):
+    """Splits a time indexed data frame in consecutive partitions.
+
+    :param pandas.DataFrame df: data frame to split, sorted by time.
+    :param str partition: *'interval'* or a pandas period alias, e.g. *'M'*
+        for calendar months.
+    :param int interval_length: number of rows per partition if partition is
+        *'interval'*.
+    :return: (*generator*) -- tuples of partition label and data frame.
+    :raises ValueError: if partition is *'interval'* and interval_length is None.
+    """
+    if partition == "interval":
+        if interval_length is None:
+            raise ValueError("interval_length is required to partition by interval")
+        for i, start in enumerate(range(0, len(df), interval_length)):
+            end = start + interval_length
+            yield str(i), df.iloc[start:end]
+        return
+
+    periods = df.index.to_period(partition)
+    # The index is sorted, so each period is a contiguous range of rows
+    bounds = [0, *(np.flatnonzero(periods[1:] != periods[:-1]) + 1), len(df)]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        yield str(periods[start]), df.iloc[start:end]
+
+
+def write_partitioned_output(
+    df,
+    path,
+    partition,
+    output_format="pickle",
+    compression=None,
+    chunk_bytes=None,
+    interval_length=None,
+):
+    """Writes an extracted output to a directory, one file per time partition, along
+    with an index of the time range of each file.
+
+    :param pandas.DataFrame df: data frame to write.
+    :param str path: path to the directory.
+    :param str partition: *'interval'*, i.e. one partition per result file, or a
+        pandas period alias, e.g. *'M'* for calendar months or *'Q'* for quarters.
+    :param str output_format: see :func:`write_output`.
+    :param str compression: see :func:`write_output`.
+    :param int chunk_bytes: see :func:`write_output`.
+    :param int interval_length: number of rows per result file, required if
+        partition is *'interval'*.
+    :raises ValueError: if the format is not supported.
+    """
+    _check_output_format(output_format)
+    os.makedirs(path, exist_ok=True)
+    partitions = []
+    for label, part in _split_partitions(df, partition, interval_length):
+        filename = f"part-{label}{output_formats[output_format]}"
+        write_output(
+            part, os.path.join(path, filename), output_format, compression, chunk_bytes
+        )
+        partitions.append(
+            {"file": filename, "start": str(part.index[0]), "end": str(part.index[-1])}
+        )
+
+    # The index is written last, so that it only ever lists complete files
+    index_path = os.path.join(path, _partitions_file)
+    with open(index_path + ".tmp", "w") as f:
+        json.dump({"partition": partition, "partitions": partitions}, f, indent=1)
+    os.replace(index_path + ".tmp", index_path)
+
+
+def read_partitioned_output(path, columns=None, start=None, end=None):
+    """Reads an extracted output, or part of it, from a partitioned directory. Only
+    the files of the partitions overlapping the time range are opened.
+
+    :param str path: path to the directory written by
+        :func:`write_partitioned_output`.
+    :param list columns: see :func:`read_output`.
+    :param str/pandas.Timestamp start: see :func:`read_output`.
+    :param str/pandas.Timestamp end: see :func:`read_output`.
+    :return: (*pandas.DataFrame*) -- the requested part of the output.
+    :raises ValueError: if no partition overlaps the time range.
+    """
+    with open(os.path.join(path, _partitions_file)) as f:
+        partitions = json.load(f)["partitions"]
+
+    first = pd.Timestamp.min if start is None else pd.Timestamp(start)
+    last = pd.Timestamp.max if end is None else pd.Timestamp(end)
+    selected = [
+        p
+        for p in partitions
+        if pd.Timestamp(p["end"]) >= first and pd.Timestamp(p["start"]) <= last
+    ]
+    if not selected:
+        raise ValueError(f"No data between {start} and {end} in {path}")
+
+    pieces = [
+        read_output(os.path.join(path, p["file"]), columns, start, end)
+        for p in selected
+    ]
+    df = pd.concat(pieces)
+    df.attrs = pieces[0].attrs
+    return df
+
+
+def load_output(output_dir, name, start=None, end=None, columns=None, scenario_id=None):
+    """Reads an extracted variable, or part of it, whatever the layout and format in
+    which it was saved.
+
+    :param str output_dir: directory in which the outputs were saved.
+    :param str name: variable name, e.g. *'pg'*.
+    :param str/pandas.Timestamp start: first timestamp to read. None reads from
+        the beginning.
+    :param str/pandas.Timestamp end: last timestamp to read. None reads until the
+        end.
+    :param list columns: ids of the columns to read. None reads all of them.
+    :param str scenario_id: scenario id prepended to the output files, if any.
+    :return: (*pandas.DataFrame*) -- the requested part of the output.
+    :raises FileNotFoundError: if the variable has not been saved in output_dir.
+    """
+    prepend = f"{scenario_id}_" if scenario_id else ""
+    path = os.path.join(output_dir, prepend + name.upper())
+    if os.path.isfile(os.path.join(path, _partitions_file)):
+        return read_partitioned_output(path, columns, start, end)
+    for extension in output_formats.values():
+        if os.path.isfile(path + extension):
+            return read_output(path + extension, columns, start, end)
+    raise FileNotFoundError(f"No output {name} in {output_dir}")
@@ -0,0 +1,387 @@
+import json
+import math
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+from pyreisejl.utility import const, parser
+from pyreisejl.utility.batch import estimate_peak_memory
+from pyreisejl.utility.call import main
+from pyreisejl.utility.converters import pkl_to_input_files
+from pyreisejl.utility.extract_data import extract_scenario
+from pyreisejl.utility.helpers import get_scenario, insert_in_file
+from pyreisejl.utility.launchers import get_launcher
+from pyreisejl.utility.reducers import get_summaries
+
+# Rough memory used by a simulation: Julia with REISE.jl and the solver loaded, and
+# the memory used per variable of the model of an interval by JuMP and the solver
+julia_memory = 2 * 2**30
+bytes_per_variable = 4096
+# Number of variables of the model of an interval solved by each solver thread
+variables_per_thread = 200_000
+# Number of variables per hour of each element of the grid
+element_variables = {"bus": 1, "branch": 1, "dcline": 1, "plant": 2, "storage_gen": 3}
+
+
+def _count_rows(filename):
+    """Counts the rows of a CSV file, without its header.
+
+    :param str filename: path to the file.
+    :return: (*int*) -- number of rows, 0 if the file does not exist.
+    """
+    if not os.path.exists(filename):
+        return 0
+    with open(filename, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+def estimate_case_size(input_dir, interval):
+    """Estimates the size of the model of each interval of a scenario from the
+    dimensions of its grid, as converted from grid.pkl, and the memory used to solve
+    it.
+
+    The model has, for each hour, the power of each plant and of its cost segment,
+    the flow of each AC branch and DC line, the voltage angle of each bus, and the
+    charge, discharge and state of charge of each storage unit. The memory is the
+    memory of a Julia session, of the profiles, read in full, and of the model.
+
+    :param str input_dir: directory of the scenario, with its converted input files.
+    :param int interval: length of each interval in hours.
+    :return: (*dict*) -- number of buses, AC branches, DC lines, plants and storage
+        units, and estimated number of variables and memory in bytes.
+    """
+    size = {
+        name: _count_rows(os.path.join(input_dir, f"{name}.csv"))
+        for name in element_variables
+    }
+    size["variables"] = interval * sum(
+        n * size[name] for name, n in element_variables.items()
+    )
+    profiles = sum(
+        os.path.getsize(os.path.join(input_dir, f"{name}.csv"))
+        for name in ["demand", "hydro", "solar", "wind"]
+        if os.path.exists(os.path.join(input_dir, f"{name}.csv"))
+    )
+    size["memory"] = julia_memory + profiles + size["variables"] * bytes_per_variable
+    return size
+
+
+def choose_threads(variables, solver=None, max_threads=None):
+    """Chooses the number of solver threads of a simulation from the size of its
+    model, larger models benefiting from more threads.
+
+    :param int variables: number of variables of the model of an interval.
+    :param str solver: solver, see :func:`pyreisejl.utility.launchers.get_launcher`.
+        Solvers other than Gurobi always use a single thread.
+    :param int max_threads: maximum number of threads. None uses the number of
+        CPUs.
+    :return: (*int*) -- number of threads.
+    """
+    if get_launcher(solver).package != "Gurobi":
+        return 1
+    max_threads = max_threads or os.cpu_count()
+    return max(1, min(math.ceil(variables / variables_per_thread), max_threads))
+
+
+def _solve(argv):
+    """Runs a simulation of the sweep with call.py, in a child process.
+
+    :param list argv: command line arguments of call.py.
+    """
+    args = parser.parse_call_args(argv)
+    try:
+        main(args)
+    except Exception:
+        if args.scenario_id:
+            insert_in_file(const.EXECUTE_LIST, args.scenario_id, "status", "failed")
+        raise
+
+
+def _extract(record, kwargs):
+    """Extracts the results of a simulation of the sweep, in a child process.
+
+    :param dict record: the job, see :func:`run_sweep`.
+    :param dict kwargs: optional arguments passed to
+        :func:`pyreisejl.utility.extract_data.extract_scenario`.
+    """
+    extract_scenario(
+        record["input_dir"],
+        record["start_date"],
+        record["end_date"],
+        scenario_id=record["scenario_id"],
+        **kwargs,
+    )
+
+
+def _prepare(job, start_date, end_date, interval, input_format, conversion_cache):
+    """Converts the input files of a job and gets its dates.
+
+    :param str job: scenario id or input directory.
+    :param str start_date: start date of the simulations of input directories.
+    :param str end_date: end date of the simulations of input directories.
+    :param int interval: length of each interval of input directories, in hours.
+    :param str input_format: format of the input files.
+    :param str conversion_cache: directory of the conversion cache.
+    :return: (*dict*) -- the job, see :func:`run_sweep`.
+    """
+    record = {"job": job, "scenario_id": None}
+    if os.path.isdir(job):
+        record.update(input_dir=job, start_date=start_date, end_date=end_date)
+        record["interval"] = interval
+    else:
+        record["scenario_id"] = job
+        start, end, record["interval"], record["input_dir"] = get_scenario(job)
+        record.update(start_date=start, end_date=end)
+        conversion_cache = conversion_cache or const.CONVERSION_CACHE_DIR
+    if not (record["start_date"] and record["end_date"] and record["interval"]):
+        raise ValueError("Start date, end date and interval are required")
+    # Converted once here, the conversion being skipped by call.py
+    pkl_to_input_files(record["input_dir"], input_format, conversion_cache)
+    return record
+
+
+def run_sweep(
+    jobs,
+    cores=None,
+    memory_budget=None,
+    solver=None,
+    max_threads=None,
+    start_date=None,
+    end_date=None,
+    interval=None,
+    input_format="csv",
+    conversion_cache=None,
+    extract=False,
+    workers=1,
+    call_args=(),
+    **kwargs,
+):
+    """Runs the simulations of a sweep, each one in its own process, running as many
+    of them at the same time as the core and memory budgets allow.
+
+    The number of solver threads and the memory of each simulation are estimated
+    from the size of its model, see :func:`estimate_case_size` and
+    :func:`choose_threads`, and simulations are started in order as soon as their
+    threads and memory fit in what the running ones leave. A simulation which does
+    not fit in the whole budget waits for the running ones to finish, then runs
+    alone. With extraction, the results of each simulation are extracted as soon as
+    it finishes, in its own process using as many cores as workers, while the
+    following simulations are solved. Extractions are started before simulations.
+
+    :param list jobs: ids of scenarios of the scenario list, or input directories,
+        each one with a grid.pkl file.
+    :param int cores: number of cores used by the sweep. None uses all the CPUs.
+    :param int memory_budget: maximum memory in bytes used by the sweep. None only
+        limits the number of cores.
+    :param str solver: solver, see :func:`pyreisejl.utility.launchers.get_launcher`.
+    :param int max_threads: maximum number of threads of a simulation. None allows
+        all the cores.
+    :param str start_date: start date of the simulations of input directories.
+    :param str end_date: end date of the simulations of input directories.
+    :param int interval: length of each interval of input directories, in hours.
+    :param str input_format: format of the input files, see
+        :func:`pyreisejl.utility.converters.pkl_to_input_files`.
+    :param str conversion_cache: directory of the conversion cache. None uses the
+        default cache for scenario ids and no cache for input directories.
+    :param bool extract: whether to extract the results of each simulation.
+    :param int workers: number of worker processes of each extraction.
+    :param iterable call_args: other command line arguments of call.py, e.g. the
+        julia environment.
+    :param \\*\\*kwargs: optional arguments passed to
+        :func:`pyreisejl.utility.extract_data.extract_scenario`.
+    :return: (*list*) -- for each job, a dictionary with its scenario id, input
+        directory, estimated size, threads, start and end times and process exit
+        code of its simulation and extraction, or error if it could not be run.
+    """
+    cores = cores or os.cpu_count()
+    max_threads = min(max_threads or cores, cores)
+    workers = max(1, min(workers, cores))
+
+    records, pending = [], []
+    for job in jobs:
+        try:
+            record = _prepare(
+                job, start_date, end_date, interval, input_format, conversion_cache
+            )
+            record.update(estimate_case_size(record["input_dir"], record["interval"]))
+            record["threads"] = choose_threads(record["variables"], solver, max_threads)
+        except Exception as ex:
+            print(f"Cannot run {job}: {ex}")
+            record = {"job": job, "error": str(ex)}
+            if not os.path.isdir(job):
+                insert_in_file(const.EXECUTE_LIST, job, "status", "failed")
+        records.append(record)
+        if "error" not in record:
+            pending.append(("solve", record))
+
+    def start(task, record, alone):
+        if task == "solve":
+            argv = [*call_args, "--threads", str(record["threads"])]
+            argv += ["--input-format", input_format]
+            if solver is not None:
+                argv += ["--solver", solver]
+            if conversion_cache is not None:
+                argv += ["--conversion-cache", conversion_cache]
+            if record["scenario_id"] is None:
+                argv += ["-s", record["start_date"], "-e", record["end_date"]]
+                argv += ["-int", str(record["interval"]), "-i", record["input_dir"]]
+            else:
+                argv.append(record["scenario_id"])
+            process = multiprocessing.Process(target=_solve, args=(argv,))
+        else:
+            extract_kwargs = {**kwargs, "workers": workers}
+            if record["scenario_id"] is not None:
+                extract_kwargs["output_dir"] = const.OUTPUT_DIR
+            if alone:
+                # As in batch.py, the largest variables are memory-mapped
+                extract_kwargs["memory_budget"] = memory_budget // 2
+            process = multiprocessing.Process(
+                target=_extract, args=(record, extract_kwargs)
+            )
+        process.start()
+        record[f"{task}_start"] = time.time()
+        return process
+
+    running = {}
+    used_memory = used_cores = 0
+    while pending or running:
+        # Extractions come first in the queue, so that their results are ready early
+        pending.sort(key=lambda item: item[0] != "extract")
+        for item in list(pending):
+            task, record = item
+            memory = record["memory"] if task == "solve" else record["extract_memory"]
+            task_cores = record["threads"] if task == "solve" else workers
+            if used_cores + task_cores > cores:
+                break
+            alone = memory_budget is not None and memory > memory_budget
+            if alone:
+                if running:
+                    break
+            elif memory_budget is not None:
+                if used_memory + memory > memory_budget:
+                    continue
+            process = start(task, record, alone)
+            running[process.sentinel] = (process, task, record, memory, task_cores)
+            pending.remove(item)
+            used_memory += memory
+            used_cores += task_cores
+
+        for sentinel in wait(list(running)):
+            process, task, record, memory, task_cores = running.pop(sentinel)
+            process.join()
+            record[f"{task}_end"] = time.time()
+            record[f"{task}_exitcode"] = process.exitcode
+            used_memory -= memory
+            used_cores -= task_cores
+            if process.exitcode != 0:
+                print(f"{task.capitalize()} of {record['job']} failed")
+                if task == "extract" and record["scenario_id"] is not None:
+                    insert_in_file(
+                        const.EXECUTE_LIST, record["scenario_id"], "status", "failed"
+                    )
+                continue
+            print(f"{task.capitalize()} of {record['job']} finished")
+            if task == "solve" and extract:
+                try:
+                    record["extract_memory"] = estimate_peak_memory(
+                        record["input_dir"],
+                        workers,
+                        kwargs.get("precision"),
+                        not kwargs.get("summary_only", False),
+                    )
+                except Exception as ex:
+                    print(f"Cannot extract {record['job']}: {ex}")
+                    record["error"] = str(ex)
+                    if record["scenario_id"] is not None:
+                        insert_in_file(
+                            const.EXECUTE_LIST,
+                            record["scenario_id"],
+                            "status",
+                            "failed",
+                        )
+                    continue
+                pending.append(("extract", record))
+
+    return records
+
+
+def summarize(records):
+    """Summarizes the throughput of a sweep.
+
+    :param list records: the jobs, see :func:`run_sweep`.
+    :return: (*dict*) -- number of jobs and of simulations which succeeded, wall
+        time in seconds from the first start to the last end, throughput in
+        simulations per hour, and runtime in seconds of the simulation and
+        extraction of each job.
+    """
+    starts = [r["solve_start"] for r in records if "solve_start" in r]
+    ends = [r.get("extract_end", r.get("solve_end")) for r in records]
+    ends = [e for e in ends if e is not None]
+    succeeded = [r for r in records if r.get("solve_exitcode") == 0]
+    wall_time = max(ends) - min(starts) if starts and ends else 0
+    runtimes = {}
+    for record in records:
+        runtimes[record["job"]] = {
+            task: record[f"{task}_end"] - record[f"{task}_start"]
+            for task in ["solve", "extract"]
+            if f"{task}_end" in record
+        }
+    return {
+        "jobs": len(records),
+        "succeeded": len(succeeded),
+        "wall_time": wall_time,
+        "throughput": len(succeeded) / wall_time * 3600 if wall_time else 0,
+        "runtimes": runtimes,
+    }
+
+
+if __name__ == "__main__":
+    args = parser.parse_sweep_args()
+
+    call_args = []
+    if args.julia_env is not None:
+        call_args += ["--julia-env", args.julia_env]
+    if args.sysimage is not None:
+        call_args += ["--sysimage", args.sysimage]
+    records = run_sweep(
+        args.jobs,
+        cores=args.cores,
+        memory_budget=args.memory_budget,
+        solver=args.solver,
+        max_threads=args.max_threads,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        interval=args.interval,
+        input_format=args.input_format,
+        conversion_cache=args.conversion_cache,
+        extract=args.extract_data,
+        workers=args.workers,
+        call_args=call_args,
+        keep_mat=args.keep_matlab,
+        output_format=args.output_format,
+        compression=args.compression,
+        partition=args.partition,
+        summaries=get_summaries(args.summaries),
+        summary_only=args.summary_only,
+        precision=args.precision,
+    )
+    summary = summarize(records)
+    for record in records:
+        if "error" in record and "solve_start" not in record:
+            print(f"{record['job']}: not run, {record['error']}")
+            continue
+        runtimes = summary["runtimes"][record["job"]]
+        runtimes = ", ".join(f"{task} {t:.1f}s" for task, t in runtimes.items())
+        print(
+            f"{record['job']}: exit code {record.get('solve_exitcode')}, "
+            f"{record['threads']} threads, "
+            f"{record['variables']} variables per interval, {runtimes}"
+        )
+    print(
+        f"{summary['succeeded']}/{summary['jobs']} simulations in "
+        f"{summary['wall_time']:.1f}s, {summary['throughput']:.2f} scenarios per hour"
+    )
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "jobs": records}, f, indent=4)
@@ -0,0 +1,280 @@
+import json
+import os
+import re
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyreisejl.utility import parser
+from pyreisejl.utility.helpers import get_project_dir, manifest_hash, sysimage_metadata
+from pyreisejl.utility.launchers import get_launcher
+
+# Standard libraries, which are already in the default system image
+stdlibs = {"Dates", "LinearAlgebra", "Pkg", "Printf", "Random", "SparseArrays", "Test"}
+
+# Solvers able to run the precompile workload without a license, by preference
+workload_solvers = ["GLPK", "Clp"]
+
+
+def _project_packages(project_dir):
+    """Lists the packages of a Julia project to compile in a system image: the
+    project itself if it is a package, and its dependencies which are not standard
+    libraries.
+
+    :param str project_dir: directory of the project.
+    :return: (*list*) -- package names.
+    """
+    packages = []
+    section = None
+    with open(os.path.join(project_dir, "Project.toml")) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("["):
+                section = line
+                continue
+            match = re.match(r'^(\w+)\s*=\s*"', line)
+            if match is None:
+                continue
+            if section is None and match.group(1) == "name":
+                packages.insert(0, line.split("=", 1)[1].strip().strip('"'))
+            elif section == "[deps]" and match.group(1) not in stdlibs:
+                packages.append(match.group(1))
+    return packages
+
+
+def write_workload_scenario(input_dir, n_hours=48, start_date="2016-01-01"):
+    """Writes the input files of a small scenario exercising the code paths of a
+    simulation: a few buses, branches and a DC line, thermal plants with piecewise
+    linear costs, and hydro, solar and wind plants following profiles.
+
+    :param str input_dir: directory in which the files are written.
+    :param int n_hours: number of hours of the profiles.
+    :param str start_date: first timestamp of the profiles.
+    """
+    os.makedirs(input_dir, exist_ok=True)
+
+    def save(name, df):
+        df.to_csv(os.path.join(input_dir, f"{name}.csv"), index=False)
+
+    save(
+        "bus",
+        pd.DataFrame({"bus_id": [1, 2, 3], "Pd": [100.0, 50.0, 80.0], "zone_id": 1}),
+    )
+    save(
+        "branch",
+        pd.DataFrame(
+            {
+                "branch_id": [1, 2, 3],
+                "from_bus_id": [1, 2, 1],
+                "to_bus_id": [2, 3, 3],
+                "x": [0.01, 0.02, 0.015],
+                "rateA": [150.0, 100.0, 0.0],
+            }
+        ),
+    )
+    save(
+        "dcline",
+        pd.DataFrame(
+            {
+                "dcline_id": [1],
+                "from_bus_id": [3],
+                "to_bus_id": [1],
+                "Pmin": [-20.0],
+                "Pmax": [20.0],
+            }
+        ),
+    )
+    types = ["coal", "ng", "hydro", "solar", "wind"]
+    pmax = np.array([200.0, 150.0, 40.0, 60.0, 80.0])
+    save(
+        "plant",
+        pd.DataFrame(
+            {
+                "plant_id": [1, 2, 3, 4, 5],
+                "bus_id": [1, 2, 3, 2, 3],
+                "status": 1,
+                "Pmin": [50.0, 0.0, 0.0, 0.0, 0.0],
+                "Pmax": pmax,
+                "type": types,
+                "ramp_30": [50.0, 75.0, 40.0, 60.0, 80.0],
+                "GenFuelCost": [2.0, 3.0, 0.0, 0.0, 0.0],
+                "GenIOB": [10.0, 8.0, 0.0, 0.0, 0.0],
+                "GenIOC": [0.0, 0.0, 0.0, 0.0, 0.0],
+                "GenIOD": [0.0, 0.0, 0.0, 0.0, 0.0],
+            }
+        ),
+    )
+    c1 = np.array([20.0, 30.0, 0.0, 0.0, 0.0])
+    c2 = np.array([0.01, 0.02, 0.0, 0.0, 0.0])
+    save(
+        "gencost_before",
+        pd.DataFrame(
+            {
+                "type": 2,
+                "startup": 0.0,
+                "shutdown": 0.0,
+                "n": 3,
+                "c2": c2,
+                "c1": c1,
+                "c0": [100.0, 50.0, 0.0, 0.0, 0.0],
+            }
+        ),
+    )
+    save(
+        "gencost_after",
+        pd.DataFrame(
+            {
+                "type": 1,
+                "startup": 0.0,
+                "shutdown": 0.0,
+                "n": 3,
+                "p1": 0.0,
+                "f1": 0.0,
+                "p2": pmax / 2,
+                "f2": c1 * pmax / 2,
+                "p3": pmax,
+                "f3": c1 * pmax,
+            }
+        ),
+    )
+    immutables = {
+        "pmin_as_share_of_pmax": {t: 0.0 for t in types},
+        "group_profile_resources": {t: [t] for t in types[2:]},
+        "profile_resources": types[2:],
+    }
+    with open(os.path.join(input_dir, "plant_immutables.json"), "w") as f:
+        json.dump(immutables, f)
+
+    hours = np.arange(n_hours)
+    timestamps = pd.date_range(start_date, periods=n_hours, freq="H")
+    daily = (1 - np.cos(2 * np.pi * hours / 24)) / 2
+    profiles = {
+        "demand": ("1", 230 * (0.8 + 0.2 * daily)),
+        "hydro": ("3", 40 * np.full(n_hours, 0.5)),
+        "solar": ("4", 60 * daily),
+        "wind": ("5", 80 * (0.5 + 0.4 * np.sin(hours / 7))),
+    }
+    for name, (column, values) in profiles.items():
+        save(name, pd.DataFrame({"UTC": timestamps, column: values}))
+
+
+_workload = """import REISE
+{imports}
+{run}(;
+    interval=24,
+    n_interval=2,
+    start_index=1,
+    inputfolder=raw"{input_dir}",
+    outputfolder=raw"{output_dir}",{optimizer}
+)
+"""
+
+_build = """using PackageCompiler: PackageCompiler
+PackageCompiler.create_sysimage(
+    [{packages}];
+    sysimage_path=raw"{sysimage}",
+    precompile_execution_file=raw"{workload}",
+)
+"""
+
+
+def build_sysimage(sysimage, julia_env=None, solver=None, julia="julia"):
+    """Builds a Julia system image with REISE.jl, its dependencies and the solvers
+    of the project compiled in, using PackageCompiler.jl, so that Julia starts with
+    them already loaded and compiled.
+
+    The code compiled in the image is recorded by running a small scenario, see
+    :func:`write_workload_scenario`. The hash of the manifest of the project is
+    recorded next to the image, see
+    :func:`pyreisejl.utility.helpers.check_sysimage`.
+
+    :param str sysimage: path to the system image to build.
+    :param str julia_env: path to the julia environment, see
+        :func:`pyreisejl.utility.helpers.get_project_dir`. PackageCompiler.jl must
+        be installed in it or in the default environment.
+    :param str solver: solver running the scenario, e.g. glpk. None uses the first
+        of *workload_solvers* in the project, or only reads the scenario if there is
+        none.
+    :param str julia: julia executable.
+    :return: (*dict*) -- how the system image was built: the manifest hash, the
+        project directory, the packages, the solver of the workload, the julia
+        version and the build time in seconds.
+    :raises ValueError: if the solver is not a package of the project.
+    :raises subprocess.CalledProcessError: if the build failed.
+    """
+    project_dir = get_project_dir(julia_env)
+    packages = _project_packages(project_dir)
+    if solver is None:
+        solver = next((s for s in workload_solvers if s in packages), None)
+    else:
+        solver = get_launcher(solver).package
+    if solver is not None and solver not in packages:
+        raise ValueError(f"{solver} is not a package of the project {project_dir}")
+    sysimage = os.path.abspath(sysimage)
+
+    # An image which fails to build is never used with the record of an older one
+    if os.path.exists(sysimage_metadata(sysimage)):
+        os.remove(sysimage_metadata(sysimage))
+
+    start = time.time()
+    digest = manifest_hash(project_dir)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_dir = os.path.join(tmp_dir, "input")
+        write_workload_scenario(input_dir)
+        imports = "\n".join(f"import {p}" for p in packages if p != "REISE")
+        if solver == "Gurobi":
+            run, optimizer = "REISE.run_scenario_gurobi", ""
+        elif solver is not None:
+            run = "REISE.run_scenario"
+            optimizer = f"\n    optimizer_factory={solver}.Optimizer,"
+        workload = os.path.join(tmp_dir, "workload.jl")
+        with open(workload, "w") as f:
+            if solver is None:
+                f.write(f'import REISE\n{imports}\nREISE.read_case(raw"{input_dir}")\n')
+            else:
+                f.write(
+                    _workload.format(
+                        imports=imports,
+                        run=run,
+                        input_dir=input_dir,
+                        output_dir=os.path.join(tmp_dir, "output"),
+                        optimizer=optimizer,
+                    )
+                )
+        script = os.path.join(tmp_dir, "build.jl")
+        with open(script, "w") as f:
+            f.write(
+                _build.format(
+                    packages=", ".join(f":{p}" for p in packages),
+                    sysimage=sysimage,
+                    workload=workload,
+                )
+            )
+        subprocess.run([julia, f"--project={project_dir}", script], check=True)
+
+    version = subprocess.run(
+        [julia, "--version"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    metadata = {
+        "manifest_hash": digest,
+        "project": os.path.abspath(project_dir),
+        "packages": packages,
+        "solver": solver,
+        "julia": version,
+        "build_time": round(time.time() - start),
+    }
+    with open(sysimage_metadata(sysimage), "w") as f:
+        json.dump(metadata, f, indent=4)
+    return metadata
+
+
+if __name__ == "__main__":
+    args = parser.parse_sysimage_args()
+    metadata = build_sysimage(args.sysimage, args.julia_env, args.solver, args.julia)
+    print(
+        f"Built {args.sysimage} with {', '.join(metadata['packages'])} "
+        f"in {metadata['build_time']}s"
+    )
@@ -0,0 +1,70 @@
+import os
+
+import pandas as pd
+import pytest
+
+from pyreisejl.utility import const
+from pyreisejl.utility.batch import estimate_peak_memory, extract_batch
+from pyreisejl.utility.benchmark import write_scenario
+
+
+@pytest.fixture
+def scenario_lists(tmp_path, monkeypatch):
+    for name in ["SCENARIO_LIST", "EXECUTE_LIST"]:
+        monkeypatch.setattr(const, name, os.path.join(tmp_path, f"{name}.csv"))
+    for name in ["EXECUTE_DIR", "INPUT_DIR", "OUTPUT_DIR"]:
+        monkeypatch.setattr(const, name, os.path.join(tmp_path, name))
+        os.makedirs(os.path.join(tmp_path, name))
+
+    scenarios = []
+    for scenario_id in ["1", "2", "3"]:
+        input_dir = os.path.join(const.EXECUTE_DIR, f"scenario_{scenario_id}")
+        start_date, end_date = write_scenario(
+            input_dir, 3, n_bus=5, n_branch=7, n_plant=3, interval=4
+        )
+        scenarios.append([scenario_id, start_date, end_date, "4H", "", "execute"])
+    # A scenario without result files
+    scenarios.append(["4", start_date, end_date, "4H", "", "execute"])
+    columns = ["id", "start_date", "end_date", "interval", "infeasibilities", "state"]
+    pd.DataFrame(scenarios, columns=columns).to_csv(const.SCENARIO_LIST, index=False)
+    pd.DataFrame({"id": ["1", "2", "3", "4"], "status": "finished"}).to_csv(
+        const.EXECUTE_LIST, index=False
+    )
+
+
+def test_estimate_peak_memory(tmp_path):
+    small, large = [os.path.join(tmp_path, name) for name in ["small", "large"]]
+    write_scenario(small, 2, n_bus=5, n_branch=7, n_plant=3, interval=4)
+    write_scenario(large, 4, n_bus=5, n_branch=7, n_plant=3, interval=4)
+    file_bytes = 4 * (3 + 5 + 3 * 7) * 8
+    assert estimate_peak_memory(small, keep_outputs=False) == file_bytes
+    assert estimate_peak_memory(large, workers=2, keep_outputs=False) == 2 * file_bytes
+    outputs = estimate_peak_memory(small) - file_bytes
+    assert estimate_peak_memory(large) == 2 * outputs + file_bytes
+    with pytest.raises(FileNotFoundError):
+        estimate_peak_memory(os.path.join(tmp_path, "missing"))
+
+
+def test_extract_batch(scenario_lists):
+    memory = estimate_peak_memory(os.path.join(const.EXECUTE_DIR, "scenario_1"))
+    # Only one scenario fits in the budget at a time
+    records = extract_batch(["1", "2", "3", "4"], memory_budget=memory * 3 // 2)
+    assert [r["scenario_id"] for r in records] == ["1", "2", "3", "4"]
+    assert [r.get("exitcode") for r in records] == [0, 0, 0, None]
+    assert "error" in records[3]
+    for previous, following in zip(records[:2], records[1:3]):
+        assert following["start"] >= previous["end"]
+
+    statuses = pd.read_csv(const.EXECUTE_LIST, index_col="id")["status"]
+    assert statuses.tolist() == ["extracted", "extracted", "extracted", "failed"]
+    states = pd.read_csv(const.SCENARIO_LIST, index_col="id")["state"]
+    assert states.tolist() == ["analyze", "analyze", "analyze", "execute"]
+    for scenario_id in ["1", "2", "3"]:
+        assert os.path.exists(os.path.join(const.OUTPUT_DIR, f"{scenario_id}_PG.pkl"))
+
+
+def test_extract_batch_parallel(scenario_lists):
+    records = extract_batch(["1", "2", "3"], cpus=3)
+    assert [r["exitcode"] for r in records] == [0, 0, 0]
+    # All scenarios are started before the first one finishes
+    assert max(r["start"] for r in records) < min(r["end"] for r in records)
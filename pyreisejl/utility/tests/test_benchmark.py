@@ -0,0 +1,64 @@
+import os
+
+import h5py
+import pandas as pd
+
+from pyreisejl.utility.benchmark import (
+    profile,
+    write_result_file,
+    write_result_files,
+    write_scenario,
+)
+from pyreisejl.utility.extract_data import extract_data, extract_scenario
+from pyreisejl.utility.helpers import load_mat73
+
+
+def test_write_result_file_layout(tmp_path):
+    filename = os.path.join(tmp_path, "result_0.mat")
+    write_result_file(filename, 5, 7, 3, interval=4, n_dcline=2, trans_viol=True)
+    with open(filename, "rb") as f:
+        assert f.read(10) == b"MATLAB 7.3"
+    with h5py.File(filename, "r") as f:
+        assert f["mdo_save/flow/mpc/gen/PG"].shape == (4, 3)
+        assert f["mdo_save/flow/mpc/trans_viol/trans_viol"].shape == (4, 9)
+        assert f["mdo_save/flow/mpc"].attrs["MATLAB_class"] == b"struct"
+        assert "storage" not in f["mdo_save/flow/mpc"]
+    output = load_mat73(filename)
+    assert output["mdo_save"]["flow"]["mpc"]["branch"]["PF"].shape == (7, 4)
+    assert output["mdo_save"]["demand_scaling"].shape == (1, 1)
+
+
+def test_write_result_files_optional_variables(tmp_path):
+    results = write_result_files(
+        tmp_path, 3, n_bus=5, n_branch=7, n_plant=3, interval=4, n_storage=2
+    )
+    outputs, _, cost = extract_data(results)
+    assert set(outputs) == {
+        "pg",
+        "pf",
+        "lmp",
+        "congu",
+        "congl",
+        "storage_pg",
+        "storage_e",
+    }
+    assert outputs["storage_e"].shape == (12, 2)
+    assert len(cost) == 3
+
+
+def test_write_scenario(tmp_path):
+    start_date, end_date = write_scenario(
+        tmp_path, 2, n_bus=5, n_branch=7, n_plant=3, interval=6, load_shed=True
+    )
+    assert end_date == "2016-01-01 11:00:00"
+    output_dir = os.path.join(tmp_path, "extracted")
+    extract_scenario(tmp_path, start_date, end_date, output_dir=output_dir)
+    load_shed = pd.read_pickle(os.path.join(output_dir, "LOAD_SHED.pkl"))
+    assert load_shed.shape == (12, 5)
+    assert load_shed.columns.tolist() == [1, 2, 3, 4, 5]
+
+
+def test_profile():
+    record = profile(sum, [1, 2, 3])
+    assert record["wall_time"] >= 0
+    assert record["peak_rss"] > 0
@@ -0,0 +1,135 @@
+import os
+import pickle
+import shutil
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from pyarrow import feather
+
+from pyreisejl.utility.converters import pkl_to_input_files
+
+
+def _table(index, **columns):
+    return pd.DataFrame(columns, index=pd.Index(index, name=index.name))
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    bus_id = pd.Index([1, 2], name="bus_id")
+    plant_id = pd.Index([10, 11], name="plant_id")
+    gencost = _table(plant_id, type=[2, 2], c1=[1.5, 2.0], interconnect="Western")
+    grid = SimpleNamespace(
+        branch=_table(
+            pd.Index([5], name="branch_id"),
+            from_bus_id=[1],
+            to_bus_id=[2],
+            x=[0.1],
+            rateA=[100.0],
+            r=[0.01],
+        ),
+        dcline=_table(
+            pd.Index([], name="dcline_id"),
+            from_bus_id=[],
+            to_bus_id=[],
+            Pmin=[],
+            Pmax=[],
+        ),
+        bus=_table(bus_id, Pd=[10.0, 20.0], zone_id=[1, 1]),
+        plant=_table(
+            plant_id,
+            bus_id=[1, 2],
+            status=[1, 1],
+            Pmin=[0.0, 0.0],
+            Pmax=[50.0, 60.0],
+            type=["coal", "wind"],
+            ramp_30=[10.0, 0.0],
+            GenFuelCost=[1.0, 0.0],
+            GenIOB=[1.0, 0.0],
+            GenIOC=[0.0, 0.0],
+            GenIOD=[0.0, 0.0],
+        ),
+        gencost={"before": gencost, "after": gencost},
+        storage={"gen": pd.DataFrame(), "StorageData": pd.DataFrame()},
+        model_immutables=SimpleNamespace(plants={"profile_resources": {"wind"}}),
+    )
+    with open(os.path.join(tmp_path, "grid.pkl"), "wb") as f:
+        pickle.dump(grid, f)
+    demand = pd.DataFrame(
+        {"1": [100.0, 110.0]}, index=pd.date_range("2016-01-01", periods=2, freq="H")
+    )
+    demand.to_csv(os.path.join(tmp_path, "demand.csv"), index_label="UTC")
+    return str(tmp_path)
+
+
+def test_pkl_to_input_files_arrow(input_dir):
+    pkl_to_input_files(input_dir, "arrow")
+    for name in ["branch", "dcline", "bus", "plant", "gencost_before", "demand"]:
+        expected = pd.read_csv(os.path.join(input_dir, f"{name}.csv"))
+        table = feather.read_table(os.path.join(input_dir, f"{name}.arrow"))
+        assert table.column_names == list(expected.columns)
+        # Columns without missing values are not nullable
+        assert not any(field.nullable for field in table.schema)
+        if name != "demand":
+            pd.testing.assert_frame_equal(
+                table.to_pandas(), expected, check_dtype=False, check_index_type=False
+            )
+    assert not os.path.exists(os.path.join(input_dir, "hydro.arrow"))
+
+    # Profiles are only converted again when their CSV file changed
+    demand_arrow = os.path.join(input_dir, "demand.arrow")
+    mtime = os.path.getmtime(demand_arrow)
+    pkl_to_input_files(input_dir, "arrow")
+    assert os.path.getmtime(demand_arrow) == mtime
+    time.sleep(0.01)
+    pd.DataFrame({"UTC": ["2016-01-01 00:00:00"], "1": [1.0]}).to_csv(
+        os.path.join(input_dir, "demand.csv"), index=False
+    )
+    pkl_to_input_files(input_dir, "arrow")
+    assert feather.read_table(demand_arrow).column("1").to_pylist() == [1.0]
+
+
+def test_pkl_to_input_files_csv_removes_arrow_files(input_dir):
+    pkl_to_input_files(input_dir, "arrow")
+    pkl_to_input_files(input_dir)
+    assert not [f for f in os.listdir(input_dir) if f.endswith(".arrow")]
+    assert os.path.exists(os.path.join(input_dir, "plant.csv"))
+    with pytest.raises(ValueError):
+        pkl_to_input_files(input_dir, "parquet")
+
+
+def test_pkl_to_input_files_cache(input_dir, tmp_path_factory):
+    cache_dir = str(tmp_path_factory.mktemp("cache"))
+    other_dir = str(tmp_path_factory.mktemp("other"))
+    for name in ["grid.pkl", "demand.csv"]:
+        shutil.copy(os.path.join(input_dir, name), other_dir)
+
+    pkl_to_input_files(input_dir, cache_dir=cache_dir)
+    plant = os.path.join(input_dir, "plant.csv")
+    mtime = os.path.getmtime(plant)
+    # Launched again
+    pkl_to_input_files(input_dir, cache_dir=cache_dir)
+    assert os.path.getmtime(plant) == mtime
+
+    # Same grid in another scenario
+    pkl_to_input_files(other_dir, cache_dir=cache_dir)
+    for name in ["plant.csv", "gencost_after.csv", "plant_immutables.json"]:
+        assert os.path.samefile(
+            os.path.join(input_dir, name), os.path.join(other_dir, name)
+        )
+    (entry,) = os.listdir(cache_dir)
+    assert os.path.samefile(plant, os.path.join(cache_dir, entry, "plant.csv"))
+
+    # Converting again replaces the links rather than writing through them
+    with open(os.path.join(other_dir, "grid.pkl"), "rb") as f:
+        grid = pickle.load(f)
+    grid.bus.loc[1, "Pd"] = 15.0
+    with open(os.path.join(other_dir, "grid.pkl"), "wb") as f:
+        pickle.dump(grid, f)
+    pkl_to_input_files(other_dir, cache_dir=cache_dir)
+    bus = pd.read_csv(os.path.join(other_dir, "bus.csv"))
+    assert bus.Pd.tolist() == [15.0, 20.0]
+    bus = pd.read_csv(os.path.join(input_dir, "bus.csv"))
+    assert bus.Pd.tolist() == [10.0, 20.0]
+    assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,136 @@
+import json
+import os
+import time
+
+import pytest
+
+from pyreisejl.utility.benchmark import write_result_file
+from pyreisejl.utility.decomposition import (
+    compare_to_reference,
+    result_deviation,
+    split_intervals,
+    stitch_chunk,
+)
+from pyreisejl.utility.launchers import Launcher
+from pyreisejl.utility.sysimage import write_workload_scenario
+
+
+def _write_result(directory, n, seed):
+    write_result_file(
+        os.path.join(directory, f"result_{n}.mat"), 3, 4, 5, interval=4, seed=seed
+    )
+
+
+class FakeLauncher(Launcher):
+    def launch_scenario(self):
+        """Writes the result files of the intervals of a chunk, the first interval
+        of a chunk differing from the same interval solved in sequence.
+        """
+        os.makedirs(self.execute_dir, exist_ok=True)
+        first = (self.start_index - 1) // self.interval
+        for j in range(self.n_interval):
+            seed = first + j if j > 0 or first == 0 else 1000 + first
+            _write_result(self.execute_dir, j, seed)
+        return 0
+
+
+class FailingLauncher(Launcher):
+    def launch_scenario(self):
+        if self.start_index == 1:
+            raise ValueError("infeasible")
+        time.sleep(60)
+
+
+def test_split_intervals():
+    assert split_intervals(10, 1) == [(0, 0, 10)]
+    assert split_intervals(10, 3, warmup=2) == [(0, 0, 3), (1, 3, 6), (4, 6, 10)]
+    assert split_intervals(4, 4, warmup=0) == [
+        (0, 0, 1),
+        (1, 1, 2),
+        (2, 2, 3),
+        (3, 3, 4),
+    ]
+    with pytest.raises(ValueError):
+        split_intervals(3, 4)
+    with pytest.raises(ValueError):
+        split_intervals(3, 2, warmup=-1)
+
+
+def test_stitch_chunk(tmp_path):
+    chunk_dir = os.path.join(tmp_path, "chunk_1")
+    os.makedirs(chunk_dir)
+    for j in range(4):
+        open(os.path.join(chunk_dir, f"result_{j}.mat"), "w").close()
+    stitch_chunk(chunk_dir, str(tmp_path), 5, 7, 9)
+    assert sorted(os.listdir(tmp_path)) == ["chunk_1", "result_7.mat", "result_8.mat"]
+    assert sorted(os.listdir(chunk_dir)) == ["result_0.mat", "result_1.mat"]
+
+
+def test_result_deviation(tmp_path):
+    _write_result(tmp_path, 0, 0)
+    _write_result(tmp_path, 1, 0)
+    _write_result(tmp_path, 2, 1)
+    same = result_deviation(
+        os.path.join(tmp_path, "result_0.mat"), os.path.join(tmp_path, "result_1.mat")
+    )
+    assert same == {"cost": 0, "pg": 0, "pf": 0, "lmp": 0}
+    other = result_deviation(
+        os.path.join(tmp_path, "result_0.mat"), os.path.join(tmp_path, "result_2.mat")
+    )
+    assert all(d > 0 for d in other.values())
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    input_dir = os.path.join(tmp_path, "input")
+    write_workload_scenario(input_dir, n_hours=48)
+    return input_dir
+
+
+@pytest.mark.parametrize("warmup", [1, 2])
+def test_launch_chunks(tmp_path, input_dir, warmup):
+    reference_dir = os.path.join(tmp_path, "reference")
+    os.makedirs(reference_dir)
+    for i in range(12):
+        _write_result(reference_dir, i, i)
+
+    launcher = FakeLauncher(
+        "2016-01-01",
+        "2016-01-02 23:00",
+        4,
+        input_dir,
+        chunks=3,
+        warmup=warmup,
+        reference_dir=reference_dir,
+    )
+    launcher.launch()
+
+    execute_dir = launcher.execute_dir
+    assert sorted(os.listdir(execute_dir)) == sorted(
+        ["decomposition.json"] + [f"result_{i}.mat" for i in range(12)]
+    )
+    for i in range(12):
+        deviation = result_deviation(
+            os.path.join(execute_dir, f"result_{i}.mat"),
+            os.path.join(reference_dir, f"result_{i}.mat"),
+        )
+        assert deviation["cost"] == 0
+
+    with open(os.path.join(execute_dir, "decomposition.json")) as f:
+        report = json.load(f)
+    assert [b["interval"] for b in report["boundaries"]] == [4, 8]
+    for boundary in report["boundaries"]:
+        assert boundary["reference"]["pg"] == 0
+        # With a single warm-up interval, it is the first interval of the chunk
+        assert (boundary["overlap"]["pg"] > 0) == (warmup == 1)
+
+    assert compare_to_reference(execute_dir, reference_dir) == report
+
+
+def test_launch_chunks_failure(input_dir):
+    launcher = FailingLauncher("2016-01-01", "2016-01-02 23:00", 4, input_dir, chunks=2)
+    start = time.time()
+    with pytest.raises(RuntimeError):
+        launcher.launch()
+    # The other chunks are stopped
+    assert time.time() - start < 30
@@ -1,15 +1,52 @@
+import json
+import os
+import threading
+import time
+
+import h5py
 import numpy as np
 import pandas as pd
 import pytest
 
+from pyreisejl.utility import extract_data as extract_data_module
 from pyreisejl.utility.extract_data import (
     _cast_keys_as_lists,
     _get_pkl_path,
+    _OutputBuffers,
+    _read_result,
     calculate_averaged_congestion,
+    extract_data,
     result_num,
+    stream_data,
 )
 
 
+def _write_result(filename, interval, n_bus, n_branch, n_plant, seed):
+    # Datasets are stored with reversed dimensions, as written by MAT.jl
+    rng = np.random.default_rng(seed)
+    with h5py.File(filename, "w") as f:
+        f["mdo_save/results/f"] = rng.random((1, 1))
+        f["mdo_save/demand_scaling"] = np.ones((1, 1))
+        mpc = f.create_group("mdo_save/flow/mpc")
+        mpc["gen/PG"] = rng.random((interval, n_plant))
+        mpc["branch/PF"] = rng.random((interval, n_branch))
+        mpc["bus/LAM_P"] = rng.random((interval, n_bus))
+        congestion = rng.random((interval, n_branch))
+        congestion[congestion < 0.8] = 0
+        mpc["branch/MU_SF"] = congestion
+        mpc["branch/MU_ST"] = congestion[::-1] * 1e-7
+
+
+@pytest.fixture
+def result_files(tmp_path):
+    results = []
+    for i in range(6):
+        filename = os.path.join(tmp_path, f"result_{i}.mat")
+        _write_result(filename, 4, 5, 7, 3, seed=i)
+        results.append(filename)
+    return results
+
+
 def test_calculate_averaged_congestion_first_arg_type():
     congl = 1
     congu = None
@@ -87,3 +124,140 @@ def test_cast_keys_as_lists():
 def test_result_num():
     result365 = "/path/to/test/result_365.mat"
     assert result_num(result365) == 365
+
+
+def test_extract_data_shape(result_files):
+    outputs, infeasibilities, cost = extract_data(result_files)
+    assert outputs["pg"].shape == (24, 3)
+    assert outputs["pf"].shape == (24, 7)
+    assert outputs["lmp"].shape == (24, 5)
+    assert outputs["pg"].dtypes.unique() == [np.float32]
+    assert outputs["congu"].dtypes.unique() == [pd.SparseDtype("float", 0)]
+    assert infeasibilities == []
+    assert len(cost) == 6
+
+
+def test_extract_data_parallel_is_identical(result_files):
+    serial, _, serial_cost = extract_data(result_files)
+    parallel, _, parallel_cost = extract_data(result_files, workers=3)
+    assert serial.keys() == parallel.keys()
+    for v in serial:
+        pd.testing.assert_frame_equal(serial[v], parallel[v])
+    assert serial_cost == parallel_cost
+
+
+def test_output_buffers_fill_in_place():
+    buffers = _OutputBuffers(3)
+    buffers.add(2, {"pg": np.ones((4, 2)), "load_shed": np.full((4, 5), 0.5)})
+    buffers.add(0, {"pg": np.full((4, 2), 2.0)})
+    outputs = buffers.to_frames()
+    assert np.shares_memory(outputs["pg"].values, buffers.buffers["pg"])
+    assert outputs["pg"].dtypes.unique() == [np.float32]
+    assert outputs["pg"].values[:, 0].tolist() == [2] * 4 + [0] * 4 + [1] * 4
+    assert outputs["load_shed"].sparse.density == 1 / 3
+
+
+def test_read_result_sparse_triplets(result_files):
+    _, _, _, temps, _ = _read_result(result_files[0])
+    with h5py.File(result_files[0], "r") as f:
+        congestion = f["mdo_save/flow/mpc/branch/MU_SF"][()]
+    assert temps["congu"].shape == (4, 7)
+    assert temps["congu"].nnz == np.count_nonzero(congestion)
+    np.testing.assert_array_equal(temps["congu"].toarray(), congestion.round(6))
+    # Values below the 1e-6 threshold are dropped
+    assert temps["congl"].nnz == 0
+
+
+def test_output_buffers_sparse_triplets():
+    buffers = _OutputBuffers(1000)
+    buffers.add(999, {"congu": np.diag([1.0, 2.0])})
+    assert buffers.buffers == {}
+    outputs = buffers.to_frames()
+    assert outputs["congu"].shape == (2000, 2)
+    assert outputs["congu"].sparse.to_coo().nnz == 2
+    assert outputs["congu"].iloc[1999, 1] == 2
+
+
+def _run_simulation(results_dir, n_results, stop):
+    time.sleep(0.1)
+    for i in range(n_results):
+        filename = os.path.join(results_dir, f"result_{i}.mat")
+        _write_result(filename, 4, 5, 7, 3, seed=i)
+        time.sleep(0.02)
+    stop.set()
+
+
+def test_stream_data(tmp_path):
+    stop = threading.Event()
+    simulation = threading.Thread(target=_run_simulation, args=(tmp_path, 6, stop))
+    simulation.start()
+    mat_results, outputs, _, cost = stream_data(tmp_path, 6, stop, poll_interval=0.01)
+    simulation.join()
+    assert [result_num(f) for f in mat_results] == list(range(6))
+    expected, _, expected_cost = extract_data(mat_results)
+    for v in expected:
+        pd.testing.assert_frame_equal(outputs[v], expected[v])
+    assert cost == expected_cost
+
+
+def test_stream_data_ignores_stale_files(tmp_path):
+    stop = threading.Event()
+    _run_simulation(tmp_path, 2, stop)
+    mat_results, outputs, _, cost = stream_data(tmp_path, 6, stop, poll_interval=0.01)
+    assert mat_results == []
+
+
+def test_output_buffers_memory_budget(tmp_path):
+    buffers = _OutputBuffers(3, memory_budget=200, scratch_dir=tmp_path)
+    buffers.add(0, {"pg": np.ones((4, 2)), "pf": np.ones((4, 5))})
+    assert not isinstance(buffers.buffers["pg"], np.memmap)
+    assert isinstance(buffers.buffers["pf"], np.memmap)
+
+
+def test_extract_data_memory_budget(result_files, tmp_path):
+    expected, _, _ = extract_data(result_files)
+    outputs, _, _ = extract_data(result_files, memory_budget=300, scratch_dir=tmp_path)
+    for v in expected:
+        pd.testing.assert_frame_equal(outputs[v], expected[v])
+
+
+def _count_reads(monkeypatch):
+    reads = []
+    read_result = extract_data_module._read_result
+
+    def counted(filename, precision=None):
+        reads.append(result_num(filename))
+        return read_result(filename, precision)
+
+    monkeypatch.setattr(extract_data_module, "_read_result", counted)
+    return reads
+
+
+def test_extract_data_resumes_from_checkpoint(result_files, tmp_path, monkeypatch):
+    checkpoint_dir = os.path.join(tmp_path, "checkpoint")
+    expected, _, expected_cost = extract_data(result_files)
+    # First run interrupted after 4 files
+    extract_data(result_files[:4], checkpoint_dir=checkpoint_dir)
+    with open(os.path.join(checkpoint_dir, "manifest.json")) as f:
+        assert sorted(json.load(f)["files"]) == [f"result_{i}.mat" for i in range(4)]
+
+    reads = _count_reads(monkeypatch)
+    os.utime(result_files[1])
+    outputs, _, cost = extract_data(result_files, checkpoint_dir=checkpoint_dir)
+    assert reads == [4, 5]
+    for v in expected:
+        pd.testing.assert_frame_equal(outputs[v], expected[v])
+    assert cost == expected_cost
+
+
+def test_extract_data_rereads_changed_files(result_files, tmp_path, monkeypatch):
+    checkpoint_dir = os.path.join(tmp_path, "checkpoint")
+    extract_data(result_files, checkpoint_dir=checkpoint_dir)
+    _write_result(result_files[2], 4, 5, 7, 3, seed=42)
+    expected, _, _ = extract_data(result_files)
+
+    reads = _count_reads(monkeypatch)
+    outputs, _, _ = extract_data(result_files, checkpoint_dir=checkpoint_dir)
+    assert reads == [2]
+    for v in expected:
+        pd.testing.assert_frame_equal(outputs[v], expected[v])
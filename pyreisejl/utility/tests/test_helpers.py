@@ -1,9 +1,11 @@
 import glob
+import multiprocessing
 import os
 import pathlib
 import string
 from io import StringIO
 
+import h5py
 import numpy as np
 import pandas as pd
 import pytest
@@ -12,6 +14,7 @@ from pyreisejl.utility.helpers import (
     InvalidDateArgument,
     extract_date_limits,
     insert_in_file,
+    load_mat73,
     sec2hms,
     validate_time_format,
     validate_time_range,
@@ -109,6 +112,22 @@ def test_extract_date_limits():
     )
 
 
+def test_extract_date_limits_irregular():
+    example_csv = StringIO(
+        """UTC,301,302
+2016-01-01 02:00,1,2
+2016-01-01 00:00,3,4
+2016-01-01 01:00,5,6
+2016-01-01 05:00,7,8
+"""
+    )
+    assert extract_date_limits(example_csv) == (
+        pd.Timestamp("2016-01-01 00:00:00"),
+        pd.Timestamp("2016-01-01 05:00:00"),
+        None,
+    )
+
+
 def test_insert_in_file():
     shape = (10, 100)
     table = pd.DataFrame(
@@ -131,3 +150,38 @@ def test_insert_in_file():
     finally:
         for f in glob.glob(filename + "*"):
             os.remove(f)
+
+
+def test_insert_in_file_concurrent(tmp_path):
+    filename = os.path.join(tmp_path, "ExecuteList.csv")
+    pd.DataFrame({"id": range(20), "status": "running"}).to_csv(filename, index=False)
+    args = [(filename, i, "status", "extracted") for i in range(20)]
+    with multiprocessing.Pool(4) as pool:
+        pool.starmap(insert_in_file, args)
+    table = pd.read_csv(filename, index_col="id")
+    assert (table["status"] == "extracted").all()
+
+
+@pytest.fixture
+def mat_file(tmp_path):
+    filename = os.path.join(tmp_path, "result_0.mat")
+    with h5py.File(filename, "w") as f:
+        f["mdo_save/demand_scaling"] = np.ones((1, 1))
+        f["mdo_save/flow/mpc/gen/PG"] = np.arange(6.0).reshape(2, 3)
+        f["mdo_save/flow/mpc/bus/LAM_P"] = np.arange(4.0)
+    return filename
+
+
+def test_load_mat73(mat_file):
+    output = load_mat73(mat_file)
+    assert output["mdo_save"]["demand_scaling"].tolist() == [[1]]
+    assert output["mdo_save"]["flow"]["mpc"]["gen"]["PG"].shape == (3, 2)
+    assert output["mdo_save"]["flow"]["mpc"]["bus"]["LAM_P"].shape == (4, 1)
+
+
+def test_load_mat73_paths(mat_file):
+    paths = ["mdo_save/flow/mpc/gen/PG", "mdo_save/flow/mpc/storage/PG"]
+    output = load_mat73(mat_file, paths=paths)
+    assert list(output) == ["mdo_save/flow/mpc/gen/PG"]
+    expected = load_mat73(mat_file)["mdo_save"]["flow"]["mpc"]["gen"]["PG"]
+    assert np.array_equal(output["mdo_save/flow/mpc/gen/PG"], expected)
@@ -0,0 +1,225 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyreisejl.utility.helpers import load_mat73, save_mat73
+from pyreisejl.utility.interconnections import (
+    find_components,
+    group_components,
+    read_dcline_schedule,
+    split_case,
+)
+from pyreisejl.utility.launchers import Launcher
+
+n_hours = 24
+
+
+class FakeLauncher(Launcher):
+    def launch_scenario(self):
+        """Writes result files whose values are the ids of the elements of the
+        input data, the cost being the number of buses.
+        """
+
+        def read(name):
+            return pd.read_csv(os.path.join(self.input_dir, f"{name}.csv"))
+
+        def values(ids):
+            return np.repeat(np.atleast_2d(ids).T, self.interval, axis=1)
+
+        bus, branch, dcline = read("bus"), read("branch"), read("dcline")
+        mpc = {
+            "bus": {"LAM_P": values(bus["bus_id"])},
+            "gen": {"PG": values(read("plant")["plant_id"])},
+            "branch": {
+                "PF": values(branch["branch_id"]),
+                "MU_SF": values(branch["branch_id"]),
+                "MU_ST": values(branch["branch_id"]),
+            },
+            "trans_viol": {
+                "trans_viol": values(
+                    [*branch["branch_id"], *(dcline["dcline_id"] + 100)]
+                )
+            },
+        }
+        if len(dcline) > 0:
+            mpc["dcline"] = {"PF_dcline": values(dcline["dcline_id"])}
+        os.makedirs(self.execute_dir, exist_ok=True)
+        for i in range(self.n_interval):
+            mdo_save = {
+                "results": {"f": float(len(bus))},
+                "demand_scaling": 1.0,
+                "flow": {"mpc": mpc},
+            }
+            save_mat73(
+                os.path.join(self.execute_dir, f"result_{i}.mat"),
+                {"mdo_save": mdo_save},
+            )
+        return 0
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    """Writes a grid of two interconnections joined by DC line 1: buses 1 and 2, and
+    buses 3 to 5, zone 1 spanning both.
+    """
+    input_dir = str(tmp_path / "input")
+    os.makedirs(input_dir)
+
+    def save(name, df):
+        df.to_csv(os.path.join(input_dir, f"{name}.csv"), index=False)
+
+    save(
+        "bus",
+        pd.DataFrame(
+            {
+                "bus_id": [1, 2, 3, 4, 5],
+                "Pd": [10.0, 30.0, 50.0, 50.0, 60.0],
+                "zone_id": [1, 1, 2, 2, 1],
+            }
+        ),
+    )
+    save(
+        "branch",
+        pd.DataFrame(
+            {
+                "branch_id": [11, 12, 13],
+                "from_bus_id": [1, 3, 4],
+                "to_bus_id": [2, 4, 5],
+                "x": 0.01,
+                "rateA": 100.0,
+            }
+        ),
+    )
+    save(
+        "dcline",
+        pd.DataFrame(
+            {
+                "dcline_id": [1, 2],
+                "from_bus_id": [2, 1],
+                "to_bus_id": [3, 2],
+                "Pmin": [-50.0, 0.0],
+                "Pmax": [50.0, 10.0],
+            }
+        ),
+    )
+    plant = pd.DataFrame(
+        {
+            "plant_id": [1, 2, 3, 4],
+            "bus_id": [1, 3, 5, 2],
+            "status": 1,
+            "Pmin": 0.0,
+            "Pmax": 100.0,
+            "type": ["coal", "ng", "wind", "solar"],
+            "ramp_30": 50.0,
+        }
+    )
+    save("plant", plant)
+    for name in ["gencost_before", "gencost_after"]:
+        save(name, pd.DataFrame({"type": 2, "n": 3, "c1": [1.0, 2.0, 0.0, 0.0]}))
+    with open(os.path.join(input_dir, "plant_immutables.json"), "w") as f:
+        json.dump(
+            {"group_profile_resources": {"wind": ["wind"], "solar": ["solar"]}}, f
+        )
+
+    utc = pd.date_range("2016-01-01", periods=n_hours, freq="H")
+    save("demand", pd.DataFrame({"UTC": utc, "1": 100.0, "2": 80.0}))
+    save("wind", pd.DataFrame({"UTC": utc, "3": 40.0}))
+    save("solar", pd.DataFrame({"UTC": utc, "4": 20.0}))
+    save("dcline_schedule", pd.DataFrame({"UTC": utc, "1": np.arange(n_hours) - 12.0}))
+    return input_dir
+
+
+def test_find_components(input_dir):
+    bus = pd.read_csv(os.path.join(input_dir, "bus.csv"))
+    branch = pd.read_csv(os.path.join(input_dir, "branch.csv"))
+    dcline = pd.read_csv(os.path.join(input_dir, "dcline.csv"))
+    labels = find_components(bus, branch, dcline)
+    assert len(set(labels)) == 1
+    labels = find_components(bus, branch, dcline, fixed=[1])
+    assert labels.tolist() == [0, 0, 1, 1, 1]
+    assert group_components(labels, 4).tolist() == [1, 1, 0, 0, 0]
+    assert group_components(labels, 1).tolist() == [0, 0, 0, 0, 0]
+
+
+def test_read_dcline_schedule(input_dir):
+    dcline = pd.read_csv(os.path.join(input_dir, "dcline.csv"))
+    schedule = read_dcline_schedule(input_dir, dcline, n_hours)
+    assert list(schedule) == [1]
+    dcline.loc[1, "Pmin"] = 10.0
+    assert sorted(read_dcline_schedule(input_dir, dcline, n_hours)) == [1, 2]
+    dcline.loc[0, "Pmax"] = 5.0
+    with pytest.raises(ValueError):
+        read_dcline_schedule(input_dir, dcline, n_hours)
+
+
+def test_split_case(tmp_path, input_dir):
+    plan = split_case(input_dir, str(tmp_path / "split"), 2)
+    assert plan["sizes"]["bus"] == 5
+    first, second = plan["groups"]
+    assert first["bus"] == [2, 3, 4]
+    assert second["bus"] == [0, 1]
+    assert second["dcline"] == [0, 1]
+    assert first["fixed_dclines"] == second["fixed_dclines"] == [1]
+
+    def read(group, name):
+        return pd.read_csv(os.path.join(group["dir"], f"{name}.csv"))
+
+    schedule = np.arange(n_hours) - 12.0
+    bus = read(first, "bus")
+    assert bus["bus_id"].tolist() == [3, 4, 5, 6]
+    assert bus["Pd"].iloc[-1] < 0
+    dcline = read(first, "dcline")
+    assert dcline[["from_bus_id", "to_bus_id"]].values.tolist() == [[6, 3]]
+    demand = read(first, "demand")
+    assert demand.columns.tolist() == ["UTC", "1", "2", "3"]
+    np.testing.assert_allclose(demand["3"], -schedule)
+    assert read(first, "wind").columns.tolist() == ["UTC", "3"]
+    assert read(first, "solar").columns.tolist() == ["UTC"]
+
+    bus = read(second, "bus")
+    assert bus["bus_id"].tolist() == [1, 2, 7]
+    dcline = read(second, "dcline")
+    assert dcline[["from_bus_id", "to_bus_id"]].values.tolist() == [[2, 7], [1, 2]]
+    assert read(second, "plant")["plant_id"].tolist() == [1, 4]
+    assert len(read(second, "gencost_after")) == 2
+    other = read(second, "demand")
+    np.testing.assert_allclose(other["4"], schedule)
+    # Zone 1 is split in proportion to the load of its buses
+    np.testing.assert_allclose(demand["1"], 60)
+    np.testing.assert_allclose(other["1"], 40)
+
+
+def test_launch_interconnections(input_dir):
+    launcher = FakeLauncher(
+        "2016-01-01", "2016-01-01 23:00", 6, input_dir, interconnections=2
+    )
+    launcher.launch()
+
+    execute_dir = launcher.execute_dir
+    assert sorted(os.listdir(execute_dir)) == sorted(
+        ["interconnections.json"] + [f"result_{i}.mat" for i in range(4)]
+    )
+    output = load_mat73(os.path.join(execute_dir, "result_3.mat"))["mdo_save"]
+    mpc = output["flow"]["mpc"]
+    assert mpc["gen"]["PG"][:, 0].tolist() == [1, 2, 3, 4]
+    assert mpc["bus"]["LAM_P"][:, 0].tolist() == [1, 2, 3, 4, 5]
+    assert mpc["branch"]["MU_SF"][:, 0].tolist() == [11, 12, 13]
+    assert mpc["dcline"]["PF_dcline"][:, 0].tolist() == [1, 2]
+    assert mpc["trans_viol"]["trans_viol"][:, 0].tolist() == [11, 12, 13, 101, 102]
+    assert mpc["gen"]["PG"].shape == (4, 6)
+    assert output["results"]["f"][0][0] == 7
+
+    with open(os.path.join(execute_dir, "interconnections.json")) as f:
+        summary = json.load(f)
+    assert [group["bus"] for group in summary] == [3, 2]
+
+
+def test_launch_interconnections_not_combined(input_dir):
+    launcher = FakeLauncher(
+        "2016-01-01", "2016-01-01 23:00", 6, input_dir, chunks=2, interconnections=2
+    )
+    with pytest.raises(ValueError):
+        launcher.launch()
@@ -0,0 +1,126 @@
+import io
+import multiprocessing
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from pyreisejl.utility import const, worker
+from pyreisejl.utility.jobs import JobQueue
+from pyreisejl.utility.worker import Worker
+
+
+def test_job_queue(tmp_path):
+    queue = JobQueue(str(tmp_path))
+    first = queue.submit(["-s", "2016-01-01", "1"])
+    second = queue.submit(["2"])
+    assert queue.result(first) is None
+
+    job = queue.claim(os.getpid())
+    assert job["id"] == first
+    assert job["argv"] == ["-s", "2016-01-01", "1"]
+    assert job["worker"] == os.getpid()
+    with open(queue.log_file(first), "w") as f:
+        f.write("Solving\n")
+    queue.finish(job, status="finished")
+
+    stream = io.StringIO()
+    result = queue.wait(first, stream=stream, poll_interval=0.01)
+    assert result["status"] == "finished"
+    assert stream.getvalue() == "Solving\n"
+
+    assert queue.claim(os.getpid())["id"] == second
+    assert queue.claim(os.getpid()) is None
+    with pytest.raises(TimeoutError):
+        queue.wait(second, stream=stream, poll_interval=0.01, timeout=0.05)
+
+
+def _claim(path, results):
+    job = JobQueue(path).claim(os.getpid())
+    results.put(None if job is None else job["id"])
+
+
+def test_job_queue_claims_each_job_once(tmp_path):
+    queue = JobQueue(str(tmp_path))
+    job_ids = [queue.submit([str(i)]) for i in range(8)]
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_claim, args=(str(tmp_path), results))
+        for _ in range(12)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    claimed = [results.get() for _ in processes]
+    assert sorted(c for c in claimed if c is not None) == job_ids
+
+
+def _exit():
+    pass
+
+
+def test_job_queue_requeues_orphans(tmp_path):
+    dead = multiprocessing.Process(target=_exit)
+    dead.start()
+    dead.join()
+
+    queue = JobQueue(str(tmp_path))
+    orphan = queue.submit(["1"])
+    live = queue.submit(["2"])
+    queue.claim(dead.pid)
+    queue.claim(os.getpid())
+    assert queue.requeue_orphans() == [orphan]
+    assert queue.requeue_orphans() == []
+    job = queue.claim(os.getpid())
+    assert job["id"] == orphan
+    assert "start" in job
+    assert os.path.exists(os.path.join(tmp_path, "running", f"{live}.json"))
+
+
+@pytest.fixture
+def execute_list(tmp_path, monkeypatch):
+    filename = os.path.join(tmp_path, "ExecuteList.csv")
+    pd.DataFrame({"id": ["1", "2"], "status": "created"}).to_csv(filename, index=False)
+    monkeypatch.setattr(const, "EXECUTE_LIST", filename)
+    return filename
+
+
+def test_worker_run_job(tmp_path, monkeypatch, execute_list):
+    calls = []
+
+    def main(args):
+        calls.append(args)
+        print(f"Running scenario {args.scenario_id}")
+        if args.scenario_id == "2":
+            raise ValueError("infeasible")
+
+    monkeypatch.setattr(worker, "main", main)
+    queue_dir = os.path.join(tmp_path, "queue")
+    queue = JobQueue(queue_dir)
+    first = queue.submit(["--solver", "glpk", "1"])
+    second = queue.submit(["2"])
+    third = queue.submit(["--foo"])
+
+    serving = threading.Thread(
+        target=Worker(queue_dir, julia_env="env", poll_interval=0.01).serve,
+        args=(3,),
+    )
+    monkeypatch.setattr(Worker, "start", lambda self: None)
+    serving.start()
+    stream = io.StringIO()
+    assert queue.wait(first, stream=stream, poll_interval=0.01)["status"] == "finished"
+    assert "Running scenario 1" in stream.getvalue()
+    result = queue.wait(second, stream=io.StringIO(), poll_interval=0.01)
+    assert result["status"] == "failed"
+    assert result["error"] == "infeasible"
+    result = queue.wait(third, stream=io.StringIO(), poll_interval=0.01)
+    assert result["status"] == "failed"
+    serving.join()
+
+    assert [args.solver for args in calls] == ["glpk", None]
+    assert all(args.julia_env == "env" for args in calls)
+    assert all(args.worker_queue is None for args in calls)
+    statuses = pd.read_csv(execute_list)["status"].tolist()
+    assert statuses == ["created", "failed"]
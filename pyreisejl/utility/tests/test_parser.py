@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from pyreisejl.utility.parser import parse_call_args
+
+
+def test_lists_do_not_swallow_scenario_id():
+    args = parse_call_args(
+        ["--summaries", "lmp_stats,pg_total", "--precision", "pg=float16", "87"]
+    )
+    assert args.scenario_id == "87"
+    assert args.summaries == ["lmp_stats", "pg_total"]
+    assert list(args.precision) == ["pg"]
+
+
+def test_lists_can_be_repeated():
+    args = parse_call_args(
+        [
+            "--precision",
+            "pg=float16,lmp=int32:0.01",
+            "--precision",
+            "congu=float32:0.001",
+            "--summaries",
+            "lmp_stats",
+            "--summaries",
+            "pg_total",
+        ]
+    )
+    assert args.scenario_id is None
+    assert args.summaries == ["lmp_stats", "pg_total"]
+    assert args.precision["lmp"].dtype == np.int32
+    assert sorted(args.precision) == ["congu", "lmp", "pg"]
+
+
+def test_unknown_summary():
+    with pytest.raises(SystemExit):
+        parse_call_args(["--summaries", "lmp_stats,unknown", "87"])
@@ -0,0 +1,102 @@
+import os
+
+import h5py
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyreisejl.utility.benchmark import write_result_files, write_scenario
+from pyreisejl.utility.extract_data import extract_data, extract_scenario
+from pyreisejl.utility.precision import Precision, parse_precision, to_units
+from pyreisejl.utility.reducers import Totals
+from pyreisejl.utility.store import load_output
+
+
+@pytest.fixture
+def result_files(tmp_path):
+    return write_result_files(
+        tmp_path, 3, n_bus=5, n_branch=7, n_plant=3, interval=6, load_shed=True
+    )
+
+
+def _raw(result_files, path):
+    arrays = []
+    for filename in result_files:
+        with h5py.File(filename, "r") as f:
+            arrays.append(f[path][()])
+    return np.concatenate(arrays)
+
+
+def test_precision():
+    assert Precision("float64", 1e-3).apply(np.array([0.12345])) == [0.123]
+    cents = Precision("int32", 0.01)
+    stored = cents.apply(np.array([1.234, -0.005], dtype=np.float32))
+    assert stored.dtype == np.int32
+    assert stored.tolist() == [123, -0]
+    np.testing.assert_allclose(cents.to_units(stored), [1.23, 0])
+    assert parse_precision("int32:0.01") == cents
+    assert parse_precision("float16") == Precision("float16")
+    with pytest.raises(ValueError):
+        Precision("int16")
+    with pytest.raises(ValueError):
+        parse_precision("str")
+
+
+def test_precision_large_values():
+    cents = Precision("int32", 0.01)
+    # Exact in float64 but not in float32, which has 24 bits of mantissa
+    values = np.array([2**24 * 0.01 + 0.01, -1e6])
+    assert cents.read_dtype == np.float64
+    assert cents.apply(values.astype(cents.read_dtype)).tolist() == [2**24 + 1, -1e8]
+    assert Precision("int16", 0.1).read_dtype == np.float32
+
+
+def test_precision_out_of_range():
+    with pytest.raises(ValueError, match="lmp"):
+        Precision("int16", 0.01).apply(np.array([100.0, 400.0]), "lmp")
+    with pytest.raises(ValueError, match="pg"):
+        Precision("int32", 0.01).apply(np.array([-1e8]), "pg")
+    with pytest.raises(ValueError, match="not finite"):
+        Precision("int32", 0.01).apply(np.array([1.0, np.nan]), "lmp")
+    # Float types store any value
+    assert np.isnan(Precision("float32", 0.01).apply(np.array([np.nan]))).all()
+
+
+def test_extract_data_precision(result_files):
+    precision = {"pg": "float16", "lmp": "int32:0.01", "congu": "float32:0.001"}
+    totals = Totals("lmp")
+    outputs, _, _ = extract_data(result_files, reducers=[totals], precision=precision)
+    assert outputs["pg"].dtypes.unique() == [np.float16]
+    assert outputs["lmp"].dtypes.unique() == [np.int32]
+    assert outputs["congu"].dtypes.unique() == [pd.SparseDtype(np.float32, 0)]
+    assert outputs["lmp"].attrs["precision"] == {"dtype": "int32", "tolerance": 0.01}
+
+    lmp = _raw(result_files, "mdo_save/flow/mpc/bus/LAM_P")
+    np.testing.assert_array_equal(outputs["lmp"].values, np.rint(lmp * 100))
+    np.testing.assert_allclose(to_units(outputs["lmp"]).values, lmp, atol=0.005)
+    # Summaries are in the units of the variable
+    expected = np.rint(lmp * 100).sum(axis=0) * 0.01
+    np.testing.assert_allclose(totals.result()["total"], expected)
+
+
+def test_extract_data_precision_unknown_variable(result_files):
+    with pytest.raises(ValueError):
+        extract_data(result_files, precision={"foo": "float16"})
+
+
+def test_extract_scenario_records_precision(tmp_path):
+    start_date, end_date = write_scenario(
+        tmp_path, 2, n_bus=5, n_branch=7, n_plant=3, interval=4
+    )
+    extract_scenario(
+        tmp_path,
+        start_date,
+        end_date,
+        output_format="parquet",
+        precision={"lmp": Precision("int16", 0.1)},
+    )
+    lmp = load_output(os.path.join(tmp_path, "output"), "lmp")
+    assert lmp.dtypes.unique() == [np.int16]
+    assert lmp.attrs["precision"] == {"dtype": "int16", "tolerance": 0.1}
+    pg = load_output(os.path.join(tmp_path, "output"), "pg")
+    assert pg.attrs["precision"] == {"dtype": "float32", "tolerance": None}
@@ -0,0 +1,76 @@
+import json
+import os
+
+import numpy as np
+
+from pyreisejl.utility.benchmark import write_scenario
+from pyreisejl.utility.extract_data import extract_scenario
+from pyreisejl.utility.profiling import Profiler, max_rss
+
+
+def test_profiler_accumulates_phases():
+    events = []
+    profiler = Profiler(events.append)
+    for _ in range(2):
+        with profiler.phase("relabel"):
+            pass
+    profiler.add_file(
+        {
+            "file": "result_0.mat",
+            "read_time": 1.0,
+            "phases": {"sparsify": [2.0, 1.5, 100]},
+        }
+    )
+    assert profiler.phases["relabel"]["calls"] == 2
+    assert profiler.phases["sparsify"]["wall_time"] == 2.0
+    assert profiler.phases["sparsify"]["rss_growth"] == 100
+    assert profiler.files == [
+        {
+            "file": "result_0.mat",
+            "read_time": 1.0,
+            "decode_time": 0,
+            "copy_time": 0,
+            "bytes_read": 0,
+        }
+    ]
+    assert [e["event"] for e in events] == ["phase", "phase", "file", "phase"]
+
+
+def test_profiler_rss_growth_per_phase():
+    profiler = Profiler()
+    # Larger than the peak of the process so far, e.g. of previous tests
+    size = max_rss() + 2**26
+    with profiler.phase("allocate"):
+        data = np.ones(size // 8)
+        del data
+    # Peaks below the one of an earlier phase are not attributed to this phase
+    with profiler.phase("reuse"):
+        data = np.ones(size // 16)
+        del data
+    assert profiler.phases["allocate"]["rss_growth"] >= 2**26
+    assert profiler.phases["reuse"]["rss_growth"] == 0
+
+
+def test_extract_scenario_profile(tmp_path):
+    start_date, end_date = write_scenario(
+        tmp_path, 3, n_bus=5, n_branch=7, n_plant=3, interval=4
+    )
+    events = []
+    extract_scenario(tmp_path, start_date, end_date, profile_hook=events.append)
+    with open(os.path.join(tmp_path, "output", "profile.json")) as f:
+        profile = json.load(f)
+    assert [os.path.basename(r["file"]) for r in profile["files"]] == [
+        f"result_{i}.mat" for i in range(3)
+    ]
+    assert all(r["bytes_read"] > 0 for r in profile["files"])
+    assert set(profile["phases"]) == {
+        "read",
+        "dtype_conversion",
+        "sparsify",
+        "relabel",
+        "write",
+        "reduce",
+        "summaries",
+    }
+    assert profile["phases"]["dtype_conversion"]["calls"] == 3
+    assert len([e for e in events if e["event"] == "file"]) == 3
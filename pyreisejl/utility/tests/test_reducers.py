@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyreisejl.utility.benchmark import write_result_files, write_scenario
+from pyreisejl.utility.extract_data import (
+    calculate_averaged_congestion,
+    extract_data,
+    extract_scenario,
+)
+from pyreisejl.utility.reducers import (
+    AveragedCongestion,
+    HoursAbove,
+    Quantiles,
+    Statistics,
+    Totals,
+    get_summaries,
+)
+
+
+@pytest.fixture
+def result_files(tmp_path):
+    return write_result_files(
+        tmp_path, 5, n_bus=5, n_branch=7, n_plant=3, interval=6, load_shed=True
+    )
+
+
+def _reduce(result_files, reducers):
+    outputs, _, _ = extract_data(result_files, reducers=reducers)
+    return outputs
+
+
+def test_averaged_congestion(result_files):
+    reducer = AveragedCongestion()
+    outputs = _reduce(result_files, [reducer])
+    expected = calculate_averaged_congestion(outputs["congl"], outputs["congu"])
+    pd.testing.assert_frame_equal(reducer.result(), expected, check_index_type=False)
+
+
+def test_summaries(result_files):
+    reducers = [HoursAbove("congu"), Totals("pg"), Statistics("lmp")]
+    outputs = _reduce(result_files, reducers)
+    hours, totals, stats = [r.result() for r in reducers]
+    np.testing.assert_array_equal(hours["hours"], (outputs["congu"] > 0).sum())
+    np.testing.assert_allclose(totals["total"], outputs["pg"].sum(), rtol=1e-6)
+    np.testing.assert_array_equal(stats["min"], outputs["lmp"].min())
+    np.testing.assert_array_equal(stats["max"], outputs["lmp"].max())
+    np.testing.assert_allclose(stats["mean"], outputs["lmp"].mean(), rtol=1e-6)
+
+
+def test_quantiles(result_files):
+    exact = Quantiles("lmp", quantiles=[0.1, 0.5])
+    sampled = Quantiles("lmp", quantiles=[0.1, 0.5], sample_size=10)
+    outputs = _reduce(result_files, [exact, sampled])
+    expected = outputs["lmp"].quantile([0.1, 0.5]).T.values
+    np.testing.assert_allclose(exact.result().values, expected, rtol=1e-6)
+    assert sampled.result().shape == (5, 2)
+    assert sampled.filled == 10
+
+
+def test_missing_variable(result_files):
+    reducer = Totals("storage_pg")
+    _reduce(result_files, [reducer])
+    assert reducer.result() is None
+
+
+def test_get_summaries_unknown():
+    with pytest.raises(ValueError):
+        get_summaries(["binding_hours", "foo"])
+
+
+def test_extract_scenario_summary_only(tmp_path):
+    start_date, end_date = write_scenario(
+        tmp_path, 2, n_bus=5, n_branch=7, n_plant=3, interval=6, load_shed=True
+    )
+    summaries = get_summaries(["binding_hours", "load_shed_hours"])
+    extract_scenario(
+        tmp_path, start_date, end_date, summaries=summaries, summary_only=True
+    )
+    output_dir = os.path.join(tmp_path, "output")
+    pickles = sorted(f for f in os.listdir(output_dir) if f.endswith(".pkl"))
+    assert pickles == [
+        "AVERAGED_CONG.pkl",
+        "CONGL_HOURS.pkl",
+        "CONGU_HOURS.pkl",
+        "LOAD_SHED_HOURS.pkl",
+        "LOAD_SHED_TOTAL.pkl",
+    ]
+    hours = pd.read_pickle(os.path.join(output_dir, "LOAD_SHED_HOURS.pkl"))
+    assert hours.index.tolist() == [1, 2, 3, 4, 5]
@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pyreisejl.utility import results as results_module
+from pyreisejl.utility.benchmark import write_scenario
+from pyreisejl.utility.extract_data import extract_scenario
+from pyreisejl.utility.results import ScenarioResults, _ByteLRUCache
+
+
+@pytest.fixture
+def scenario(tmp_path):
+    input_dir = os.path.join(tmp_path, "scenario")
+    write_scenario(input_dir, 4, n_bus=5, n_branch=7, n_plant=3, interval=6)
+    return input_dir
+
+
+@pytest.fixture
+def extracted(scenario, tmp_path):
+    output_dir = os.path.join(tmp_path, "extracted")
+    extract_scenario(scenario, "2016-01-01", "2016-01-01 23:00", output_dir=output_dir)
+    return lambda name: pd.read_pickle(os.path.join(output_dir, f"{name.upper()}.pkl"))
+
+
+def _count_reads(monkeypatch):
+    reads = []
+    load_mat73 = results_module.load_mat73
+
+    def counted(filename, paths=None, **kwargs):
+        reads.append((os.path.basename(filename), *paths))
+        return load_mat73(filename, paths=paths, **kwargs)
+
+    monkeypatch.setattr(results_module, "load_mat73", counted)
+    return reads
+
+
+def test_scenario_results_reads_needed_files(scenario, extracted, monkeypatch):
+    results = ScenarioResults(scenario, start_date="2016-01-01")
+    assert set(results.keys()) == {"pg", "pf", "lmp", "congu", "congl"}
+    assert results["pg"].shape == (24, 3)
+
+    reads = _count_reads(monkeypatch)
+    pg = results["pg"][[3, 1], 8:14]
+    assert reads == [
+        ("result_1.mat", "mdo_save/flow/mpc/gen/PG"),
+        ("result_2.mat", "mdo_save/flow/mpc/gen/PG"),
+    ]
+    expected = extracted("pg").iloc[8:14][[3, 1]]
+    pd.testing.assert_frame_equal(pg, expected, check_freq=False)
+
+    # Cached
+    results["pg"][2, 6:12]
+    assert len(reads) == 2
+
+
+def test_scenario_results_timestamps(scenario, extracted):
+    results = ScenarioResults(scenario, start_date="2016-01-01")
+    congu = results["congu"][:, "2016-01-01 05:00":"2016-01-01 19:00"]
+    expected = extracted("congu").loc["2016-01-01 05:00":"2016-01-01 19:00"]
+    np.testing.assert_array_equal(congu.values, expected.sparse.to_dense().values)
+    assert results["lmp"][4, -1].index[0] == pd.Timestamp("2016-01-01 23:00")
+
+
+def test_scenario_results_unknown(scenario):
+    results = ScenarioResults(scenario)
+    with pytest.raises(KeyError):
+        results["storage_pg"]
+    with pytest.raises(KeyError):
+        results["pg"][[42]]
+
+
+def test_byte_lru_cache():
+    cache = _ByteLRUCache(200)
+    cache.put("a", np.zeros(10))
+    cache.put("b", np.zeros(10))
+    cache.get("a")
+    cache.put("c", np.zeros(10))
+    assert list(cache.items) == ["a", "c"]
+    cache.put("d", np.zeros(100))
+    assert "d" not in cache.items
+    assert cache.nbytes == 160
@@ -1,9 +1,12 @@
+import os
 import time
 from subprocess import PIPE, Popen
 
+import pandas as pd
 import pytest
 
 from pyreisejl.utility.state import ApplicationState, SimulationState
+from pyreisejl.utility.status import CsvStore, StatusCache
 
 
 @pytest.fixture
@@ -36,3 +39,31 @@ def test_app_state_get(test_proc):
     state.add(entry)
     assert len(state.ongoing) == 1
     assert state.get(123) is not None
+
+
+class CountingStore(CsvStore):
+    def __init__(self):
+        self.reads = 0
+
+    def get_all(self, filename):
+        self.reads += 1
+        return super().get_all(filename)
+
+
+def test_app_state_reads_execute_list_on_change(tmp_path):
+    filename = os.path.join(tmp_path, "ExecuteList.csv")
+    pd.DataFrame({"id": [123, 456], "status": "running"}).to_csv(filename, index=False)
+    store = CountingStore()
+    state = ApplicationState(statuses=StatusCache(filename, store))
+    for scenario_id in [123, 456]:
+        proc = Popen(["echo", "foo"], stdout=PIPE, stderr=PIPE)
+        state.add(SimulationState(scenario_id, proc))
+
+    for _ in range(3):
+        assert [e["status"] for e in state.as_dict().values()] == ["running"] * 2
+    assert state.get(456)["status"] == "running"
+    assert store.reads == 1
+
+    store.update(filename, 456, "status", "finished")
+    assert state.as_dict()[456]["status"] == "finished"
+    assert store.reads == 2
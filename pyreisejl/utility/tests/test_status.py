@@ -0,0 +1,156 @@
+import multiprocessing
+import os
+
+import pandas as pd
+import pytest
+
+from pyreisejl.utility import const
+from pyreisejl.utility.helpers import get_scenario, get_scenario_status, insert_in_file
+from pyreisejl.utility.status import CsvStore, SqliteStore, get_status_store
+
+
+@pytest.fixture
+def execute_list(tmp_path):
+    filename = os.path.join(tmp_path, "ExecuteList.csv")
+    pd.DataFrame({"id": ["1", "2", "3"], "status": "created"}).to_csv(
+        filename, index=False
+    )
+    return filename
+
+
+@pytest.fixture(params=["csv", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "csv":
+        return CsvStore()
+    return SqliteStore(os.path.join(tmp_path, "status.db"))
+
+
+def test_store_update(store, execute_list):
+    assert store.get(execute_list, 2) == {"id": "2", "status": "created"}
+    store.update(execute_list, 2, "status", "running")
+    store.update(execute_list, "4", "runtime", "1:00")
+    assert store.get(execute_list, 2) == {"id": "2", "status": "running", "runtime": ""}
+    assert store.get(execute_list, 4) == {"id": "4", "status": "", "runtime": "1:00"}
+    assert store.get(execute_list, 5) is None
+    assert list(store.get_all(execute_list)) == ["1", "2", "3", "4"]
+
+    version = store.version(execute_list)
+    assert store.version(execute_list) == version
+    store.update(execute_list, 1, "status", "finished")
+    assert store.version(execute_list) != version
+
+    store.export(execute_list)
+    table = pd.read_csv(execute_list, dtype=str).fillna("")
+    assert table.to_dict("list") == {
+        "id": ["1", "2", "3", "4"],
+        "status": ["finished", "running", "created", ""],
+        "runtime": ["", "", "", "1:00"],
+    }
+
+
+def test_sqlite_store_imports_new_rows(tmp_path, execute_list):
+    store = SqliteStore(os.path.join(tmp_path, "status.db"))
+    store.update(execute_list, 1, "status", "running")
+    # Row added to the CSV file by PowerSimData
+    with open(execute_list, "a") as f:
+        f.write("5,created\n")
+    assert store.get(execute_list, 5) == {"id": "5", "status": "created"}
+    # Rows updated in the database are not overwritten by the CSV file
+    assert store.get(execute_list, 1)["status"] == "running"
+
+
+def test_sqlite_store_update_does_not_write_csv(tmp_path, execute_list):
+    store = SqliteStore(os.path.join(tmp_path, "status.db"))
+    store.get(execute_list, 1)
+    version = os.stat(execute_list)
+    store.update(execute_list, 1, "status", "running")
+    store.update(execute_list, 1, "runtime", "1:00")
+    after = os.stat(execute_list)
+    assert (after.st_ino, after.st_mtime_ns) == (version.st_ino, version.st_mtime_ns)
+    assert pd.read_csv(execute_list)["status"].tolist() == ["created"] * 3
+    # Terminal statuses are exported
+    store.update(execute_list, 1, "status", "finished")
+    table = pd.read_csv(execute_list, dtype=str).fillna("")
+    assert table["status"].tolist() == ["finished", "created", "created"]
+    assert table["runtime"].tolist() == ["1:00", "", ""]
+
+
+def test_sqlite_store_keeps_csv_edits(tmp_path, execute_list):
+    store = SqliteStore(os.path.join(tmp_path, "status.db"))
+    store.update(execute_list, 1, "status", "running")
+    # Row edited in the CSV file by PowerSimData between an update and an export
+    table = pd.read_csv(execute_list, dtype=str)
+    table.loc[table.id == "3", "status"] = "cancelled"
+    table.to_csv(execute_list, index=False)
+    assert store.get(execute_list, 3)["status"] == "cancelled"
+    # The update of a row which was not edited is kept
+    assert store.get(execute_list, 1)["status"] == "running"
+    store.update(execute_list, 2, "status", "running")
+    store.export(execute_list)
+    assert pd.read_csv(execute_list, dtype=str)["status"].tolist() == [
+        "running",
+        "running",
+        "cancelled",
+    ]
+
+    # Edits are kept by updates even if the store did not read the list since
+    table = pd.read_csv(execute_list, dtype=str)
+    table.loc[table.id == "1", "status"] = "failed"
+    table.to_csv(execute_list, index=False)
+    store.update(execute_list, 2, "status", "finished")
+    assert pd.read_csv(execute_list, dtype=str)["status"].tolist() == [
+        "failed",
+        "finished",
+        "cancelled",
+    ]
+
+
+def _update(path, filename, scenario_id):
+    SqliteStore(path).update(filename, scenario_id, "status", "extracted")
+
+
+def test_sqlite_store_concurrent_updates(tmp_path):
+    filename = os.path.join(tmp_path, "ExecuteList.csv")
+    pd.DataFrame({"id": range(20), "status": "running"}).to_csv(filename, index=False)
+    path = os.path.join(tmp_path, "status.db")
+    with multiprocessing.Pool(4) as pool:
+        pool.starmap(_update, [(path, filename, i) for i in range(20)])
+    store = SqliteStore(path)
+    assert all(store.get(filename, i)["status"] == "extracted" for i in range(20))
+
+
+def test_helpers_use_status_backend(tmp_path, monkeypatch, execute_list):
+    scenario_list = os.path.join(tmp_path, "ScenarioList.csv")
+    pd.DataFrame(
+        {
+            "id": ["1"],
+            "start_date": ["2016-01-01"],
+            "end_date": ["2016-01-07"],
+            "interval": ["24H"],
+        }
+    ).to_csv(scenario_list, index=False)
+    monkeypatch.setattr(const, "SCENARIO_LIST", scenario_list)
+    monkeypatch.setattr(const, "EXECUTE_LIST", execute_list)
+    monkeypatch.setattr(const, "EXECUTE_DIR", str(tmp_path))
+    monkeypatch.setattr(const, "STATUS_DB", os.path.join(tmp_path, "status.db"))
+    monkeypatch.setattr(const, "STATUS_BACKEND", "sqlite")
+    assert isinstance(get_status_store(), SqliteStore)
+
+    assert get_scenario(1)[:3] == ("2016-01-01", "2016-01-07", 24)
+    with pytest.raises(KeyError):
+        get_scenario(2)
+    insert_in_file(execute_list, 1, "status", "running")
+    assert get_scenario_status(1) == "running"
+    assert get_scenario_status(9) is None
+    # The CSV file read by PowerSimData is written once the scenario has finished
+    assert pd.read_csv(execute_list)["status"].tolist() == ["created"] * 3
+    insert_in_file(execute_list, 1, "status", "finished")
+    assert pd.read_csv(execute_list)["status"].tolist() == [
+        "finished",
+        "created",
+        "created",
+    ]
+
+    monkeypatch.setattr(const, "STATUS_BACKEND", "foo")
+    with pytest.raises(ValueError):
+        get_status_store()
@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from pyreisejl.utility import store
+from pyreisejl.utility.store import (
+    get_output_format,
+    load_output,
+    output_formats,
+    read_output,
+    write_output,
+    write_partitioned_output,
+)
+
+
+@pytest.fixture
+def output():
+    df = pd.DataFrame(
+        np.arange(48 * 4, dtype=np.float32).reshape(48, 4),
+        index=pd.date_range("2016-01-01", periods=48, freq="H"),
+        columns=[101, 102, 103, 104],
+    )
+    df.index.name = "UTC"
+    return df
+
+
+@pytest.mark.parametrize("output_format", ["pickle", "parquet", "feather"])
+def test_write_read_output(tmp_path, output, output_format):
+    path = os.path.join(tmp_path, "PG" + output_formats[output_format])
+    write_output(output, path, output_format)
+    pd.testing.assert_frame_equal(read_output(path), output, check_freq=False)
+
+
+@pytest.mark.parametrize("extension", [".pkl", ".parquet", ".feather"])
+def test_read_output_subset(tmp_path, output, extension):
+    path = os.path.join(tmp_path, "PG" + extension)
+    write_output(output, path, get_output_format(path))
+    subset = read_output(
+        path, columns=[104, 102], start="2016-01-01 05:00", end="2016-01-01 08:00"
+    )
+    expected = output.loc["2016-01-01 05:00":"2016-01-01 08:00", [104, 102]]
+    pd.testing.assert_frame_equal(subset, expected, check_freq=False)
+
+
+def test_write_read_sparse_output(tmp_path, output):
+    sparse = (output % 7 == 0).astype(np.float64).astype(pd.SparseDtype("float", 0))
+    path = os.path.join(tmp_path, "CONGU.parquet")
+    write_output(sparse, path, "parquet", compression="zstd")
+    pd.testing.assert_frame_equal(read_output(path), sparse, check_freq=False)
+
+
+@pytest.mark.parametrize("output_format", ["parquet", "feather"])
+def test_write_sparse_output_in_chunks(tmp_path, output, output_format, monkeypatch):
+    # Chunks of 10 rows of 4 columns
+    monkeypatch.setattr(store, "sparse_chunk_bytes", 10 * 4 * 8)
+    sparse = (output % 7 == 0).astype(np.float64).astype(pd.SparseDtype("float", 0))
+    path = os.path.join(tmp_path, "CONGU" + output_formats[output_format])
+    write_output(sparse, path, output_format)
+    if output_format == "parquet":
+        assert pq.ParquetFile(path).num_row_groups == 5
+    pd.testing.assert_frame_equal(read_output(path), sparse, check_freq=False)
+
+
+def test_write_output_unknown_format(tmp_path, output):
+    with pytest.raises(ValueError):
+        write_output(output, os.path.join(tmp_path, "PG.csv"), "csv")
+
+
+def test_get_output_format_unknown():
+    with pytest.raises(ValueError):
+        get_output_format("/path/to/PG.csv")
+
+
+@pytest.fixture
+def yearly_output():
+    df = pd.DataFrame(
+        np.arange(8784 * 2, dtype=np.float32).reshape(8784, 2),
+        index=pd.date_range("2016-01-01", periods=8784, freq="H"),
+        columns=[101, 102],
+    )
+    df.index.name = "UTC"
+    return df
+
+
+@pytest.mark.parametrize("output_format", ["pickle", "parquet"])
+def test_write_partitioned_output_by_month(tmp_path, yearly_output, output_format):
+    path = os.path.join(tmp_path, "PG")
+    write_partitioned_output(yearly_output, path, "M", output_format)
+    assert len(os.listdir(path)) == 13
+    pd.testing.assert_frame_equal(
+        load_output(tmp_path, "pg"), yearly_output, check_freq=False
+    )
+
+
+def test_load_output_reads_matching_partitions(tmp_path, yearly_output):
+    path = os.path.join(tmp_path, "PG")
+    write_partitioned_output(yearly_output, path, "M", "parquet")
+    os.remove(os.path.join(path, "part-2016-01.parquet"))
+    subset = load_output(tmp_path, "pg", start="2016-02-20", end="2016-03-10 05:00")
+    expected = yearly_output.loc["2016-02-20":"2016-03-10 05:00"]
+    pd.testing.assert_frame_equal(subset, expected, check_freq=False)
+
+
+def test_write_partitioned_output_by_interval(tmp_path, output):
+    path = os.path.join(tmp_path, "PG")
+    write_partitioned_output(output, path, "interval", interval_length=24)
+    assert sorted(os.listdir(path)) == ["_partitions.json", "part-0.pkl", "part-1.pkl"]
+    subset = load_output(tmp_path, "pg", start="2016-01-02 03:00", columns=[102])
+    expected = output.loc["2016-01-02 03:00":, [102]]
+    pd.testing.assert_frame_equal(subset, expected, check_freq=False)
+
+
+def test_load_output_single_file(tmp_path, output):
+    write_output(output, os.path.join(tmp_path, "87_PG.feather"), "feather")
+    df = load_output(tmp_path, "pg", scenario_id="87")
+    pd.testing.assert_frame_equal(df, output, check_freq=False)
+
+
+def test_load_output_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_output(tmp_path, "pg")
@@ -0,0 +1,129 @@
+import json
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from pyreisejl.utility import const, sweep
+from pyreisejl.utility.benchmark import write_scenario
+from pyreisejl.utility.sweep import (
+    choose_threads,
+    estimate_case_size,
+    run_sweep,
+    summarize,
+)
+from pyreisejl.utility.sysimage import write_workload_scenario
+
+
+def fake_main(args):
+    """Writes the result files of a simulation and the threads it was given."""
+    if args.input_dir.endswith("bad"):
+        raise ValueError("infeasible")
+    time.sleep(1)
+    write_scenario(
+        args.input_dir,
+        2,
+        start_date=args.start_date,
+        n_bus=3,
+        n_branch=3,
+        n_plant=5,
+        interval=args.interval,
+    )
+    with open(os.path.join(args.input_dir, "threads.json"), "w") as f:
+        json.dump(args.threads, f)
+
+
+@pytest.fixture
+def input_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep, "main", fake_main)
+    monkeypatch.setattr(sweep, "pkl_to_input_files", lambda *args: None)
+    input_dirs = [os.path.join(tmp_path, name) for name in ["a", "b", "bad"]]
+    for input_dir in input_dirs:
+        write_workload_scenario(input_dir, n_hours=48)
+    return input_dirs
+
+
+def test_estimate_case_size(input_dirs):
+    size = estimate_case_size(input_dirs[0], 24)
+    assert [size[name] for name in ["bus", "branch", "dcline", "plant"]] == [3, 3, 1, 5]
+    assert size["variables"] == 24 * (2 * 5 + 3 + 1 + 3)
+    assert size["memory"] > sweep.julia_memory + size["variables"] * 4096
+
+
+def test_choose_threads():
+    assert choose_threads(1) == 1
+    assert choose_threads(250_000, max_threads=8) == 2
+    assert choose_threads(10**8, max_threads=4) == 4
+    assert choose_threads(10**8, solver="glpk") == 1
+
+
+def test_run_sweep(input_dirs):
+    memory = estimate_case_size(input_dirs[0], 24)["memory"]
+    # Only one simulation fits in the budget at a time, next to an extraction
+    records = run_sweep(
+        input_dirs,
+        cores=2,
+        memory_budget=memory * 3 // 2,
+        start_date="2016-01-01",
+        end_date="2016-01-01 23:00",
+        interval=12,
+        extract=True,
+    )
+    assert [r["threads"] for r in records] == [1, 1, 1]
+    assert [r.get("solve_exitcode") for r in records[:2]] == [0, 0]
+    assert records[2]["solve_exitcode"] != 0
+    assert [r.get("extract_exitcode") for r in records] == [0, 0, None]
+    for previous, following in zip(records, records[1:]):
+        assert following["solve_start"] >= previous["solve_end"]
+    # The first scenario is extracted while the second one is solved
+    assert records[0]["extract_start"] < records[1]["solve_end"]
+    for input_dir in input_dirs[:2]:
+        with open(os.path.join(input_dir, "threads.json")) as f:
+            assert json.load(f) == 1
+        assert os.path.exists(os.path.join(input_dir, "output", "PG.pkl"))
+
+    summary = summarize(records)
+    assert summary["jobs"] == 3
+    assert summary["succeeded"] == 2
+    assert summary["throughput"] == pytest.approx(2 / summary["wall_time"] * 3600)
+    assert set(summary["runtimes"][input_dirs[0]]) == {"solve", "extract"}
+    assert set(summary["runtimes"][input_dirs[2]]) == {"solve"}
+
+
+def test_run_sweep_parallel(input_dirs):
+    records = run_sweep(
+        input_dirs[:2],
+        cores=2,
+        start_date="2016-01-01",
+        end_date="2016-01-01 23:00",
+        interval=12,
+    )
+    assert [r["solve_exitcode"] for r in records] == [0, 0]
+    assert max(r["solve_start"] for r in records) < min(r["solve_end"] for r in records)
+
+
+def test_run_sweep_extraction_not_estimated(tmp_path, monkeypatch):
+    monkeypatch.setattr(sweep, "main", lambda args: None)
+    monkeypatch.setattr(sweep, "pkl_to_input_files", lambda *args: None)
+    for name in ["SCENARIO_LIST", "EXECUTE_LIST"]:
+        monkeypatch.setattr(const, name, os.path.join(tmp_path, f"{name}.csv"))
+    monkeypatch.setattr(const, "EXECUTE_DIR", str(tmp_path))
+    write_workload_scenario(os.path.join(tmp_path, "scenario_1"), n_hours=24)
+    pd.DataFrame(
+        {
+            "id": ["1"],
+            "start_date": ["2016-01-01"],
+            "end_date": ["2016-01-01 23:00"],
+            "interval": ["24H"],
+        }
+    ).to_csv(const.SCENARIO_LIST, index=False)
+    pd.DataFrame({"id": ["1"], "status": "created"}).to_csv(
+        const.EXECUTE_LIST, index=False
+    )
+
+    # The simulation writes no result files to extract
+    (record,) = run_sweep(["1"], cores=1, extract=True)
+    assert record["solve_exitcode"] == 0
+    assert "error" in record
+    assert pd.read_csv(const.EXECUTE_LIST)["status"].tolist() == ["failed"]
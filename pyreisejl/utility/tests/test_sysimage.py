@@ -0,0 +1,88 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from pyreisejl.utility.helpers import (
+    StaleSysimage,
+    check_sysimage,
+    extract_date_limits,
+    get_project_dir,
+    manifest_hash,
+    sysimage_metadata,
+)
+from pyreisejl.utility.sysimage import _project_packages, write_workload_scenario
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    project_dir = tmp_path / "env"
+    project_dir.mkdir()
+    (project_dir / "Project.toml").write_text('[deps]\nJuMP = "4076af6c"\n')
+    (project_dir / "Manifest.toml").write_text('[[JuMP]]\nversion = "0.21.5"\n')
+    return str(project_dir)
+
+
+def test_manifest_hash(project_dir):
+    digest = manifest_hash(project_dir)
+    assert digest == manifest_hash(project_dir)
+    with open(os.path.join(project_dir, "Manifest.toml"), "a") as f:
+        f.write('\n[[GLPK]]\nversion = "0.14.4"\n')
+    assert manifest_hash(project_dir) != digest
+
+
+def test_check_sysimage(tmp_path, project_dir):
+    sysimage = str(tmp_path / "reise.so")
+    with pytest.raises(FileNotFoundError):
+        check_sysimage(sysimage, project_dir)
+
+    open(sysimage, "wb").close()
+    with pytest.raises(StaleSysimage):
+        check_sysimage(sysimage, project_dir)
+
+    with open(sysimage_metadata(sysimage), "w") as f:
+        json.dump({"manifest_hash": manifest_hash(project_dir)}, f)
+    assert check_sysimage(sysimage, project_dir)["manifest_hash"]
+
+    with open(os.path.join(project_dir, "Project.toml"), "a") as f:
+        f.write('GLPK = "60bf3e95"\n')
+    with pytest.raises(StaleSysimage):
+        check_sysimage(sysimage, project_dir)
+
+
+def test_get_project_dir(monkeypatch):
+    monkeypatch.setenv("JULIA_PROJECT", "/app")
+    assert get_project_dir("env") == "env"
+    assert get_project_dir() == "/app"
+    monkeypatch.delenv("JULIA_PROJECT")
+    assert os.path.exists(os.path.join(get_project_dir(), "Project.toml"))
+
+
+def test_project_packages():
+    packages = _project_packages(get_project_dir(None))
+    assert packages[0] == "REISE"
+    assert "JuMP" in packages
+    assert "Dates" not in packages
+
+
+def test_write_workload_scenario(tmp_path):
+    input_dir = str(tmp_path)
+    write_workload_scenario(input_dir, n_hours=48)
+
+    plant = pd.read_csv(os.path.join(input_dir, "plant.csv"))
+    bus = pd.read_csv(os.path.join(input_dir, "bus.csv"))
+    assert plant["bus_id"].isin(bus["bus_id"]).all()
+    for name in ["gencost_before", "gencost_after"]:
+        gencost = pd.read_csv(os.path.join(input_dir, f"{name}.csv"))
+        assert len(gencost) == len(plant)
+    for name in ["demand", "hydro", "solar", "wind"]:
+        profile = pd.read_csv(os.path.join(input_dir, f"{name}.csv"), index_col=0)
+        assert len(profile) == 48
+        assert (profile >= 0).all().all()
+
+    with open(os.path.join(input_dir, "demand.csv")) as f:
+        start, end, freq = extract_date_limits(f)
+    assert freq == "H"
+    assert start == pd.Timestamp("2016-01-01 00:00:00")
+    assert end == pd.Timestamp("2016-01-02 23:00:00")
@@ -0,0 +1,199 @@
+import importlib
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import sys
+import time
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+from pyreisejl.utility import const, parser
+from pyreisejl.utility.call import main
+from pyreisejl.utility.helpers import insert_in_file
+from pyreisejl.utility.jobs import JobQueue
+from pyreisejl.utility.launchers import get_launcher, init_julia_session
+
+
+@contextmanager
+def _redirect_output(filename):
+    """Redirects the standard output and error of the process, including the output
+    of Julia, to a file while the block runs.
+
+    :param str filename: path to the file, to which the output is appended.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = [os.dup(1), os.dup(2)]
+    try:
+        with open(filename, "a", buffering=1) as f:
+            # The file descriptors receive the output of Julia, the Python streams
+            # the output of Python, whichever object sys.stdout is
+            os.dup2(f.fileno(), 1)
+            os.dup2(f.fileno(), 2)
+            with redirect_stdout(f), redirect_stderr(f):
+                yield
+    finally:
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in saved:
+            os.close(fd)
+
+
+class Worker:
+    """Long-lived process running the simulations submitted to a
+    :class:`pyreisejl.utility.jobs.JobQueue` by call.py. Julia, REISE.jl and the
+    package of the solver are loaded once when the worker starts, and the code
+    compiled by the first simulation is reused by the following ones, so that a
+    simulation only pays for its own model building and solving.
+
+    Each job is run as call.py would run it, from its command line arguments, with
+    its output written to the log file of the job. A job which fails is marked as
+    failed in the execute list and the worker carries on with the next one.
+
+    :param str queue_dir: directory of the queue.
+    :param str solver: solver whose package is loaded when the worker starts. None
+        loads Gurobi.
+    :param str julia_env: path to the julia environment. None uses the default
+        environment.
+    :param float poll_interval: time in seconds between checks of the queue.
+    :param str sysimage: path to a system image with which to start Julia. None
+        uses the default image.
+    """
+
+    def __init__(
+        self, queue_dir, solver=None, julia_env=None, poll_interval=1, sysimage=None
+    ):
+        """Constructor."""
+        self.queue = JobQueue(queue_dir)
+        self.solver = solver
+        self.julia_env = julia_env
+        self.sysimage = sysimage
+        self.poll_interval = poll_interval
+
+    def start(self):
+        """Loads Julia, REISE.jl and the package of the solver."""
+        # Extraction processes are forked from a server started before Julia is
+        # initialized, rather than from this process once Julia is running
+        multiprocessing.set_start_method("forkserver", force=True)
+        multiprocessing.forkserver.ensure_running()
+
+        start = time.time()
+        init_julia_session(self.julia_env, self.sysimage)
+        for package in [get_launcher(self.solver).package, "REISE"]:
+            importlib.import_module(f"julia.{package}")
+        try:
+            importlib.import_module("julia.Arrow")
+        except ImportError:
+            pass
+        print(f"Worker {os.getpid()} ready in {time.time() - start:.1f}s")
+
+    def run_job(self, job):
+        """Runs a job claimed from the queue and records its result.
+
+        :param dict job: the job, see :meth:`pyreisejl.utility.jobs.JobQueue.claim`.
+        :return: (*bool*) -- whether the job succeeded.
+        """
+        print(f"Worker {os.getpid()} running job {job['id']}: {' '.join(job['argv'])}")
+        args = None
+        with _redirect_output(self.queue.log_file(job["id"])):
+            try:
+                args = parser.parse_call_args(job["argv"])
+                args.worker_queue = None
+                if args.julia_env is None:
+                    args.julia_env = self.julia_env
+                if args.sysimage is None:
+                    args.sysimage = self.sysimage
+                main(args)
+            except (Exception, SystemExit) as ex:
+                print(f"{type(ex).__name__}: {ex}")
+                if args is not None and args.scenario_id:
+                    insert_in_file(
+                        const.EXECUTE_LIST, args.scenario_id, "status", "failed"
+                    )
+                error = str(ex) or type(ex).__name__
+            else:
+                error = None
+        if error is None:
+            self.queue.finish(job, status="finished")
+        else:
+            self.queue.finish(job, status="failed", error=error)
+        print(f"Worker {os.getpid()} finished job {job['id']}")
+        return error is None
+
+    def serve(self, max_jobs=None):
+        """Starts the worker and runs jobs as they are submitted. Jobs left running
+        by workers which died are put back in the queue.
+
+        :param int max_jobs: number of jobs after which the worker returns. None
+            runs jobs until the process is stopped.
+        """
+        self.start()
+        n_jobs = 0
+        while max_jobs is None or n_jobs < max_jobs:
+            self.queue.requeue_orphans()
+            job = self.queue.claim(os.getpid())
+            if job is None:
+                time.sleep(self.poll_interval)
+                continue
+            self.run_job(job)
+            n_jobs += 1
+
+
+def _serve(queue_dir, solver, julia_env, poll_interval, max_jobs, sysimage):
+    """Runs a worker in a child process.
+
+    :param str queue_dir: directory of the queue.
+    :param str solver: solver loaded when the worker starts.
+    :param str julia_env: path to the julia environment.
+    :param float poll_interval: time in seconds between checks of the queue.
+    :param int max_jobs: number of jobs after which the worker exits.
+    :param str sysimage: path to the system image with which to start Julia.
+    """
+    Worker(queue_dir, solver, julia_env, poll_interval, sysimage).serve(max_jobs)
+
+
+def run_workers(
+    processes,
+    queue_dir,
+    solver=None,
+    julia_env=None,
+    poll_interval=1,
+    max_jobs=None,
+    sysimage=None,
+):
+    """Runs several workers, each one in its own process with its own Julia
+    session, until they all exit.
+
+    :param int processes: number of workers.
+    :param str queue_dir: directory of the queue.
+    :param str solver: see :class:`Worker`.
+    :param str julia_env: see :class:`Worker`.
+    :param float poll_interval: see :class:`Worker`.
+    :param int max_jobs: see :meth:`Worker.serve`.
+    :param str sysimage: see :class:`Worker`.
+    """
+    worker_args = (queue_dir, solver, julia_env, poll_interval, max_jobs, sysimage)
+    if processes == 1:
+        _serve(*worker_args)
+        return
+    # Workers are forked before Julia is initialized
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_serve, args=worker_args) for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    args = parser.parse_worker_args()
+    run_workers(
+        args.processes,
+        args.queue,
+        args.solver,
+        args.julia_env,
+        poll_interval=args.poll_interval,
+        max_jobs=args.max_jobs,
+        sysimage=args.sysimage,
+    )
@@ -22,6 +22,9 @@ function __init__()
     Requires.@require Gurobi = "2e9cd046-0924-5485-92f1-d5272153d98b" begin
         include(joinpath("solver_specific", "gurobi.jl"))
     end
+    Requires.@require Arrow = "69666777-d1a9-59fb-9406-91d4454c9d45" begin
+        include("arrow.jl")
+    end
 end
 
 """
@@ -35,7 +38,8 @@ Run a scenario consisting of several intervals.
 'start_index' specifies the starting hour of the first interval, to determine
     which time-series data should be loaded into each intervals.
 'inputfolder' specifies where to load the relevant data from. Required files
-    are 'case.mat', 'demand.csv', 'hydro.csv', 'solar.csv', and 'wind.csv'.
+    are 'case.mat', 'demand.csv', 'hydro.csv', 'solar.csv', and 'wind.csv'. When
+    Arrow.jl is loaded, '.arrow' files found in place of '.csv' files are read instead.
 'outputfolder' specifies where to store the results. Defaults to an `output`
     subdirectory of inputfolder. This folder will be created if it does not exist at
     runtime.
@@ -0,0 +1,12 @@
+# Importing Arrow in this way avoids a warning with Requires
+using .Arrow: Arrow
+
+"""
+    _read_arrow(filename; copycols=true)
+
+Read an Arrow IPC file into a DataFrame. The file is memory-mapped; its columns are
+copied unless `copycols` is false.
+"""
+function _read_arrow(filename; copycols=true)::DataFrames.DataFrame
+    return DataFrames.DataFrame(Arrow.Table(filename); copycols=copycols)
+end
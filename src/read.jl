@@ -1,6 +1,6 @@
-"""Read REISE input files, return parsed relevant data in a Case object."""
 IntOrString = Union{Int,AbstractString}
 
+"""Read REISE input files, return parsed relevant data in a Case object."""
 function read_case(filepath)
     println("Reading from folder: " * filepath)
 
@@ -8,7 +8,7 @@ function read_case(filepath)
     case = Dict()
 
     # AC branches
-    branch = CSV.File(joinpath(filepath, "branch.csv"))
+    branch = _read_table(filepath, "branch")
     case["branchid"] = convert(Array{IntOrString,1}, branch.branch_id)
     case["branch_from"] = convert(Array{IntOrString,1}, branch.from_bus_id)
     case["branch_to"] = convert(Array{IntOrString,1}, branch.to_bus_id)
@@ -16,7 +16,7 @@ function read_case(filepath)
     case["branch_rating"] = convert(Array{Float64,1}, branch.rateA)
 
     # DC branches
-    dcline = CSV.File(joinpath(filepath, "dcline.csv"))
+    dcline = _read_table(filepath, "dcline")
     case["dclineid"] = convert(Array{IntOrString,1}, dcline.dcline_id)
     case["dcline_from"] = convert(Array{IntOrString,1}, dcline.from_bus_id)
     case["dcline_to"] = convert(Array{IntOrString,1}, dcline.to_bus_id)
@@ -24,7 +24,7 @@ function read_case(filepath)
     case["dcline_pmax"] = convert(Array{Float64,1}, dcline.Pmax)
 
     # Buses
-    bus = CSV.File(joinpath(filepath, "bus.csv"))
+    bus = _read_table(filepath, "bus")
     case["busid"] = convert(Array{IntOrString,1}, bus.bus_id)
     case["bus_demand"] = convert(Array{Float64,1}, bus.Pd)
     case["bus_zone"] = convert(Array{Int,1}, bus.zone_id)
@@ -35,7 +35,7 @@ function read_case(filepath)
     end
 
     # Generators
-    plant = CSV.File(joinpath(filepath, "plant.csv"))
+    plant = _read_table(filepath, "plant")
     case["genid"] = convert(Array{IntOrString,1}, plant.plant_id)
     case["genfuel"] = convert(Array{String,1}, plant.type)
     case["gen_bus"] = convert(Array{IntOrString,1}, plant.bus_id)
@@ -51,12 +51,8 @@ function read_case(filepath)
     case["profile_resources"] = plant_immutables["profile_resources"]
 
     # Generator costs
-    case["gencost_before"] = DataFrames.DataFrame(
-        CSV.File(joinpath(filepath, "gencost_before.csv"))
-    )
-    case["gencost_after"] = DataFrames.DataFrame(
-        CSV.File(joinpath(filepath, "gencost_after.csv"))
-    )
+    case["gencost_before"] = _read_table(filepath, "gencost_before")
+    case["gencost_after"] = _read_table(filepath, "gencost_after")
 
     # Set the PMAX for all profile-based generators to Inf; the true PMAX for profile-
     # based generators will be determined by the provided profile
@@ -64,18 +60,18 @@ function read_case(filepath)
         case["gen_pmax"][case["genfuel"] .== g] .= Inf
     end
 
-    # Load all relevant profile data from CSV files
-    println("...loading demand.csv")
-    case["demand"] = DataFrames.DataFrame(CSV.File(joinpath(filepath, "demand.csv")))
+    # Load all relevant profile data, which is only read, without copying Arrow files
+    println("...loading demand")
+    case["demand"] = _read_table(filepath, "demand"; copycols=false)
 
-    println("...loading hydro.csv")
-    case["hydro"] = DataFrames.DataFrame(CSV.File(joinpath(filepath, "hydro.csv")))
+    println("...loading hydro")
+    case["hydro"] = _read_table(filepath, "hydro"; copycols=false)
 
-    println("...loading wind.csv")
-    case["wind"] = DataFrames.DataFrame(CSV.File(joinpath(filepath, "wind.csv")))
+    println("...loading wind")
+    case["wind"] = _read_table(filepath, "wind"; copycols=false)
 
-    println("...loading solar.csv")
-    case["solar"] = DataFrames.DataFrame(CSV.File(joinpath(filepath, "solar.csv")))
+    println("...loading solar")
+    case["solar"] = _read_table(filepath, "solar"; copycols=false)
 
     # Convert Dict to NamedTuple
     case = (; (Symbol(k) => v for (k, v) in case)...)
@@ -84,6 +80,22 @@ function read_case(filepath)
     return case
 end
 
+"""
+    _read_table(filepath, name; copycols=true)
+
+Read the table `name` from `filepath` into a DataFrame. If Arrow.jl is loaded and
+`name.arrow` exists, the Arrow IPC file is memory-mapped; its columns are copied unless
+`copycols` is false, for tables which are never modified. Otherwise `name.csv` is parsed.
+"""
+function _read_table(filepath, name; copycols=true)::DataFrames.DataFrame
+    arrow_file = joinpath(filepath, name * ".arrow")
+    # _read_arrow is defined in arrow.jl, which is included once Arrow.jl is loaded
+    if isfile(arrow_file) && isdefined(@__MODULE__, :_read_arrow)
+        return _read_arrow(arrow_file; copycols=copycols)
+    end
+    return DataFrames.DataFrame(CSV.File(joinpath(filepath, name * ".csv")))
+end
+
 """Read input file (if present), return parsed data in a Storage struct."""
 function read_storage(filepath)::Storage
     # Fallback dataframe, in case there's no input files
@@ -94,8 +106,8 @@ function read_storage(filepath)::Storage
     )
     try
         println("...loading storage")
-        gen = DataFrames.DataFrame(CSV.File(joinpath(filepath, "storage_gen.csv")))
-        data = DataFrames.DataFrame(CSV.File(joinpath(filepath, "StorageData.csv")))
+        gen = _read_table(filepath, "storage_gen")
+        data = _read_table(filepath, "StorageData")
         storage = Dict("enabled" => true, "gen" => gen, "sd_table" => data)
     catch
         println("Storage information not found in " * filepath)
@@ -112,7 +124,7 @@ end
 """
     read_demand_flexibility(filepath, interval)
 
-Load demand flexibility profiles and parameters from .csv files and return them in a 
+Load demand flexibility profiles and parameters from .arrow or .csv files and return them in a 
 DemandFlexibility struct.
 """
 function read_demand_flexibility(filepath, interval)::DemandFlexibility
@@ -129,8 +141,8 @@ function read_demand_flexibility(filepath, interval)::DemandFlexibility
     # Try loading the demand flexibility parameters
     demand_flexibility_parameters = DataFrames.DataFrame()
     try
-        demand_flexibility_parameters = DataFrames.DataFrame(
-            CSV.File(joinpath(filepath, "demand_flexibility_parameters.csv"))
+        demand_flexibility_parameters = _read_table(
+            filepath, "demand_flexibility_parameters"
         )
         println("...loading demand flexibility parameters")
 
@@ -198,8 +210,8 @@ function read_demand_flexibility(filepath, interval)::DemandFlexibility
         if demand_flexibility["enabled"] == "not_specified" ||
             (demand_flexibility["enabled"])
             try
-                demand_flexibility["flex_amt_" * s] = DataFrames.DataFrame(
-                    CSV.File(joinpath(filepath, "demand_flexibility_" * s * ".csv"))
+                demand_flexibility["flex_amt_" * s] = _read_table(
+                    filepath, "demand_flexibility_" * s
                 )
                 println("...loading demand flexibility " * s * " profiles")
                 println(
@@ -212,8 +224,8 @@ function read_demand_flexibility(filepath, interval)::DemandFlexibility
 
             # Try loading the demand flexibility cost profiles
             try
-                demand_flexibility["cost_" * s] = DataFrames.DataFrame(
-                    CSV.File(joinpath(filepath, "demand_flexibility_cost_" * s * ".csv"))
+                demand_flexibility["cost_" * s] = _read_table(
+                    filepath, "demand_flexibility_cost_" * s
                 )
                 println("...loading demand flexibility " * s * "-shift cost profiles")
             catch e